@@ -5,14 +5,18 @@ import time
 import logging
 from typing import Tuple, List, Dict, Any
 import numpy as np
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from preprocess import clean_for_model, extract_keywords
+from preprocess import clean_for_model, build_phrases, match_keywords
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when scoring or keyword logic changes (part of the /predict result cache key)
+MODEL_VERSION = "tfidf-cosine-1"
+
 
 class JobCVMatchingModel:
     """
@@ -68,9 +72,9 @@ class JobCVMatchingModel:
             Cosine similarity score between 0 and 1
         """
         try:
-            # Fit vectorizer on both texts
+            # Fit a fresh copy of the vectorizer on both texts (safe across worker threads)
             texts = [jd_text, cv_text]
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+            tfidf_matrix = clone(self.vectorizer).fit_transform(texts)
             
             # Calculate cosine similarity
             similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
@@ -85,6 +89,52 @@ class JobCVMatchingModel:
             logger.error(f"Error calculating similarity: {e}")
             return 0.0
     
+    @staticmethod
+    def _empty_result(latency_ms: int = 0, error: str = None) -> Dict[str, Any]:
+        result = {
+            'score': 0.0,
+            'percent': '0%',
+            'features': [],
+            'latency_ms': latency_ms
+        }
+        if error is not None:
+            # Marks a failed prediction so callers can tell it from a genuine zero score
+            result['error'] = error
+        return result
+    
+    def _predict_cleaned(self, jd_clean: str, cv_clean: str, topk: int, start_time: float,
+                         jd_phrases: List[str] = None, cv_phrases: List[str] = None) -> Dict[str, Any]:
+        """
+        Score and keywords for already cleaned texts (phrases may be passed in when cached)
+        """
+        if not jd_clean or not cv_clean:
+            return self._empty_result()
+        
+        # Calculate similarity score
+        score = self._calculate_similarity(jd_clean, cv_clean)
+        
+        # Extract matching features/keywords
+        features = match_keywords(
+            jd_phrases if jd_phrases is not None else build_phrases(jd_clean),
+            cv_phrases if cv_phrases is not None else build_phrases(cv_clean),
+            topk=topk
+        )
+        
+        # Calculate percentage
+        percent = f"{int(score * 100)}%"
+        
+        # Calculate latency
+        latency_ms = int((time.time() - start_time) * 1000)
+        
+        logger.info(f"Prediction completed - Score: {score:.3f}, Features: {len(features)}, Latency: {latency_ms}ms")
+        
+        return {
+            'score': score,
+            'percent': percent,
+            'features': features,
+            'latency_ms': latency_ms
+        }
+    
     def predict(self, jd_text: str, cv_text: str, topk: int = 6) -> Dict[str, Any]:
         """
         Predict matching score between job description and CV
@@ -96,60 +146,80 @@ class JobCVMatchingModel:
             
         Returns:
             Dictionary containing score, percent, features, and latency
+            (plus 'error' when the prediction failed)
         """
         start_time = time.time()
         
         try:
             # Validate inputs
             if not jd_text or not cv_text:
-                return {
-                    'score': 0.0,
-                    'percent': '0%',
-                    'features': [],
-                    'latency_ms': 0
-                }
+                return self._empty_result()
             
             # Preprocess texts
             jd_clean, cv_clean = self._preprocess_texts(jd_text, cv_text)
             
-            if not jd_clean or not cv_clean:
-                return {
-                    'score': 0.0,
-                    'percent': '0%',
-                    'features': [],
-                    'latency_ms': 0
-                }
-            
-            # Calculate similarity score
-            score = self._calculate_similarity(jd_clean, cv_clean)
-            
-            # Extract matching features/keywords
-            features = extract_keywords(jd_text, cv_text, topk=topk)
-            
-            # Calculate percentage
-            percent = f"{int(score * 100)}%"
-            
-            # Calculate latency
-            latency_ms = int((time.time() - start_time) * 1000)
-            
-            logger.info(f"Prediction completed - Score: {score:.3f}, Features: {len(features)}, Latency: {latency_ms}ms")
-            
-            return {
-                'score': score,
-                'percent': percent,
-                'features': features,
-                'latency_ms': latency_ms
-            }
+            return self._predict_cleaned(jd_clean, cv_clean, topk, start_time)
             
         except Exception as e:
             logger.error(f"Error in prediction: {e}")
-            latency_ms = int((time.time() - start_time) * 1000)
-            return {
-                'score': 0.0,
-                'percent': '0%',
-                'features': [],
-                'latency_ms': latency_ms
-            }
+            return self._empty_result(int((time.time() - start_time) * 1000), error=str(e) or type(e).__name__)
+    
+    def predict_batch(self, jd_cv_pairs: List[Tuple[str, str]], topk: int = 6) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Predict many JD-CV pairs, cleaning each distinct document and scoring
+        each distinct pair only once
+        
+        Args:
+            jd_cv_pairs: List of (jd_text, cv_text) tuples
+            topk: Number of top matching features to return
+            
+        Returns:
+            Tuple of (results in input order, dedupe stats)
+        """
+        documents = {}  # text -> (cleaned text, phrases)
+        unique_results = {}  # (jd_text, cv_text) -> result
+        
+        def prepare(text):
+            if text not in documents:
+                clean = clean_for_model(text)
+                documents[text] = (clean, build_phrases(clean) if clean else [])
+            return documents[text]
+        
+        for pair in jd_cv_pairs:
+            if pair in unique_results:
+                continue
+            jd_text, cv_text = pair
+            start_time = time.time()
+            try:
+                if not jd_text or not cv_text:
+                    result = self._empty_result()
+                else:
+                    jd_clean, jd_phrases = prepare(jd_text)
+                    cv_clean, cv_phrases = prepare(cv_text)
+                    result = self._predict_cleaned(jd_clean, cv_clean, topk, start_time, jd_phrases, cv_phrases)
+            except Exception as e:
+                logger.error(f"Error in prediction: {e}")
+                result = self._empty_result(int((time.time() - start_time) * 1000), error=str(e) or type(e).__name__)
+            unique_results[pair] = result
+        
+        # Fan out to the original order; duplicates get their own copy
+        results = []
+        for pair in jd_cv_pairs:
+            result = unique_results[pair]
+            results.append({**result, 'features': list(result['features'])})
+        
+        total_pairs = len(jd_cv_pairs)
+        stats = {
+            'total_pairs': total_pairs,
+            'unique_pairs': len(unique_results),
+            'total_documents': 2 * total_pairs,
+            'unique_documents': len({text for pair in jd_cv_pairs for text in pair}),
+            'dedupe_ratio': round(1 - len(unique_results) / total_pairs, 4) if total_pairs else 0.0,
+        }
+        if total_pairs:
+            logger.info(f"Batch dedupe - {stats['unique_pairs']}/{total_pairs} unique pairs, "
+                        f"{stats['unique_documents']}/{stats['total_documents']} unique documents")
+        return results, stats
 
 
 # Global model instance
@@ -193,16 +263,25 @@ def batch_predict(jd_cv_pairs: List[Tuple[str, str]], topk: int = 6) -> List[Dic
     Returns:
         List of prediction results
     """
-    model = get_model()
-    results = []
-    
-    for jd_text, cv_text in jd_cv_pairs:
-        result = model.predict(jd_text, cv_text, topk)
-        results.append(result)
-    
+    results, _ = batch_predict_with_stats(jd_cv_pairs, topk)
     return results
 
 
+def batch_predict_with_stats(jd_cv_pairs: List[Tuple[str, str]], topk: int = 6) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Like batch_predict, plus dedupe statistics (unique pairs/documents, dedupe_ratio)
+    
+    Args:
+        jd_cv_pairs: List of (jd_text, cv_text) tuples
+        topk: Number of top matching features to return
+        
+    Returns:
+        Tuple of (list of prediction results, dedupe stats)
+    """
+    model = get_model()
+    return model.predict_batch([tuple(pair) for pair in jd_cv_pairs], topk)
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Test the model
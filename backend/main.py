@@ -1,15 +1,19 @@
 """
 FastAPI application for job-CV matching service
 """
+import os
 import time
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
 
-from inference import predict, batch_predict
+from inference import predict, batch_predict_with_stats, MODEL_VERSION
+from result_cache import ResultCache, make_key, MISS
 from preprocess import preprocess_text_pipeline
 
 # Configure logging
@@ -32,6 +36,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# /predict results cached by (jd_text, cv_text, topk, MODEL_VERSION); size or TTL 0 disables
+predict_cache = ResultCache(
+    max_entries=int(os.getenv("PREDICT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PREDICT_CACHE_TTL_SEC", "600")),
+)
+# Predictions run off the event loop so identical concurrent requests can share one computation
+predict_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PREDICT_WORKERS", "1")),
+    thread_name_prefix="predict",
+)
+
 # Pydantic models for request/response
 class PredictionRequest(BaseModel):
     jd_text: str = Field(..., description="Job description text", min_length=1)
@@ -48,8 +63,16 @@ class BatchPredictionRequest(BaseModel):
     pairs: List[Dict[str, str]] = Field(..., description="List of JD-CV text pairs")
     topk: int = Field(default=6, description="Number of top features to return", ge=1, le=20)
 
+class BatchMetadata(BaseModel):
+    total_pairs: int = Field(..., description="Number of pairs in the request")
+    unique_pairs: int = Field(..., description="Distinct JD-CV pairs actually scored")
+    total_documents: int = Field(..., description="Number of JD + CV texts in the request")
+    unique_documents: int = Field(..., description="Distinct texts actually preprocessed")
+    dedupe_ratio: float = Field(..., description="Share of pairs served from a duplicate (0 = all unique)")
+
 class BatchPredictionResponse(BaseModel):
     results: List[PredictionResponse] = Field(..., description="List of prediction results")
+    metadata: Optional[BatchMetadata] = Field(default=None, description="Batch dedupe statistics")
 
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
@@ -68,10 +91,13 @@ async def health_check():
 
 
 @app.post("/predict", response_model=PredictionResponse)
-async def predict_matching(request: PredictionRequest):
+async def predict_matching(request: PredictionRequest, response: Response):
     """
     Predict matching score between job description and CV
     
+    Repeated requests are served from a TTL+LRU cache and concurrent identical
+    requests share one computation; the X-Cache header is HIT, MISS or COALESCED.
+    
     Args:
         request: PredictionRequest containing JD text, CV text, and topk
         
@@ -80,14 +106,28 @@ async def predict_matching(request: PredictionRequest):
     """
     try:
         logger.info(f"Received prediction request - JD length: {len(request.jd_text)}, CV length: {len(request.cv_text)}")
+        start_time = time.time()
         
-        # Make prediction
-        result = predict(request.jd_text, request.cv_text, request.topk)
+        async def compute():
+            # Make prediction
+            result = await asyncio.get_running_loop().run_in_executor(
+                predict_executor, predict, request.jd_text, request.cv_text, request.topk
+            )
+            
+            # Validate result (invalid results are not cached)
+            if not isinstance(result, dict) or 'score' not in result:
+                raise HTTPException(status_code=500, detail="Invalid prediction result")
+            return result
         
-        # Validate result
-        if not isinstance(result, dict) or 'score' not in result:
-            raise HTTPException(status_code=500, detail="Invalid prediction result")
+        key = make_key(request.jd_text, request.cv_text, request.topk, MODEL_VERSION)
+        # Failed predictions (flagged with 'error') still get the empty result but are not cached
+        result, cache_status = await predict_cache.get_or_compute(
+            key, compute, cacheable=lambda r: not r.get('error')
+        )
         
+        response.headers["X-Cache"] = cache_status
+        if cache_status != MISS:
+            result = {**result, 'latency_ms': int((time.time() - start_time) * 1000)}
         return PredictionResponse(**result)
         
     except Exception as e:
@@ -95,6 +135,12 @@ async def predict_matching(request: PredictionRequest):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@app.get("/predict/cache")
+async def predict_cache_stats():
+    """Hit/miss/coalesced counters of the /predict result cache"""
+    return predict_cache.stats()
+
+
 @app.post("/predict/batch_json", response_model=BatchPredictionResponse)
 async def predict_batch_matching(request: BatchPredictionRequest):
     """
@@ -123,13 +169,13 @@ async def predict_batch_matching(request: BatchPredictionRequest):
                 raise HTTPException(status_code=400, detail="Invalid pair format")
             jd_cv_pairs.append((pair['jd_text'], pair['cv_text']))
         
-        # Make batch predictions
-        results = batch_predict(jd_cv_pairs, request.topk)
+        # Make batch predictions (identical documents/pairs are computed once)
+        results, stats = batch_predict_with_stats(jd_cv_pairs, request.topk)
         
         # Convert to response format
         response_results = [PredictionResponse(**result) for result in results]
         
-        return BatchPredictionResponse(results=response_results)
+        return BatchPredictionResponse(results=response_results, metadata=BatchMetadata(**stats))
         
     except HTTPException:
         raise
@@ -24,45 +24,22 @@ def clean_for_model(text: str) -> str:
     return processed
 
 
-def extract_keywords(jd_text: str, cv_text: str, topk: int = 6) -> List[str]:
+def build_phrases(clean_text: str) -> List[str]:
     """
-    Extract matching keywords/skills between JD and CV
-    Uses rapidfuzz to find similar phrases and terms
+    Words, bigrams and trigrams of an already cleaned text
+    (computed once per document and reused across pairs in batch prediction)
+    """
+    words = clean_text.split()
+    phrases = list(words)
+    phrases.extend(f"{words[i]} {words[i+1]}" for i in range(len(words) - 1))
+    phrases.extend(f"{words[i]} {words[i+1]} {words[i+2]}" for i in range(len(words) - 2))
+    return phrases
+
+
+def match_keywords(jd_phrases: List[str], cv_phrases: List[str], topk: int = 6) -> List[str]:
+    """
+    Top JD phrases that have a close match (rapidfuzz ratio >= 70) among the CV phrases
     """
-    if not jd_text or not cv_text:
-        return []
-    
-    # Clean both texts
-    jd_clean = clean_for_model(jd_text)
-    cv_clean = clean_for_model(cv_text)
-    
-    if not jd_clean or not cv_clean:
-        return []
-    
-    # Split into words and phrases
-    jd_words = jd_clean.split()
-    cv_words = cv_clean.split()
-    
-    # Create n-grams for better phrase matching
-    jd_phrases = []
-    cv_phrases = []
-    
-    # Add individual words
-    jd_phrases.extend(jd_words)
-    cv_phrases.extend(cv_words)
-    
-    # Add bigrams
-    for i in range(len(jd_words) - 1):
-        jd_phrases.append(f"{jd_words[i]} {jd_words[i+1]}")
-    for i in range(len(cv_words) - 1):
-        cv_phrases.append(f"{cv_words[i]} {cv_words[i+1]}")
-    
-    # Add trigrams
-    for i in range(len(jd_words) - 2):
-        jd_phrases.append(f"{jd_words[i]} {jd_words[i+1]} {jd_words[i+2]}")
-    for i in range(len(cv_words) - 2):
-        cv_phrases.append(f"{cv_words[i]} {cv_words[i+1]} {cv_words[i+2]}")
-    
     # Find matches using rapidfuzz
     matches = []
     for jd_phrase in jd_phrases:
@@ -97,6 +74,24 @@ def extract_keywords(jd_text: str, cv_text: str, topk: int = 6) -> List[str]:
     return keywords
 
 
+def extract_keywords(jd_text: str, cv_text: str, topk: int = 6) -> List[str]:
+    """
+    Extract matching keywords/skills between JD and CV
+    Uses rapidfuzz to find similar phrases and terms
+    """
+    if not jd_text or not cv_text:
+        return []
+    
+    # Clean both texts
+    jd_clean = clean_for_model(jd_text)
+    cv_clean = clean_for_model(cv_text)
+    
+    if not jd_clean or not cv_clean:
+        return []
+    
+    return match_keywords(build_phrases(jd_clean), build_phrases(cv_clean), topk)
+
+
 def extract_skills_from_text(text: str) -> List[str]:
     """
     Extract potential skills from text using common patterns
@@ -0,0 +1,104 @@
+"""
+TTL + LRU cache for prediction results, with singleflight for identical in-flight requests
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+HIT = "HIT"
+MISS = "MISS"
+COALESCED = "COALESCED"
+
+
+def make_key(*parts) -> str:
+    """
+    Stable hash of the request fields that determine the result
+    """
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    LRU of at most `max_entries` results, each valid for `ttl` seconds.
+    Meant to be used from a single event loop (no locking).
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+    
+    def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+    
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             cacheable: Callable[[Any], bool] = None) -> Tuple[Any, str]:
+        """
+        Cached value, or the result of `compute()`. Concurrent calls with the same key
+        while it is running wait for that one computation instead of starting another.
+        Results for which `cacheable(value)` is false are shared with those waiters
+        but not stored.
+        
+        Returns:
+            Tuple of (value, HIT | MISS | COALESCED)
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value, HIT
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            status = COALESCED
+        else:
+            self.misses += 1
+            status = MISS
+            # The computation belongs to the cache, not to the request that started it
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._settle(key, t, cacheable))
+        # shield: a cancelled caller (leader or follower) must not cancel the shared computation
+        return await asyncio.shield(task), status
+    
+    def _settle(self, key: str, task: asyncio.Future, cacheable: Callable[[Any], bool] = None) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is None:  # also marks the exception retrieved if nobody awaited it
+            value = task.result()
+            if cacheable is None or cacheable(value):
+                self.put(key, value)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
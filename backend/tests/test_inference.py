@@ -3,7 +3,7 @@ Unit tests for inference module
 """
 import pytest
 import time
-from inference import JobCVMatchingModel, predict, batch_predict
+from inference import JobCVMatchingModel, predict, batch_predict, batch_predict_with_stats
 
 
 class TestJobCVMatchingModel:
@@ -89,6 +89,19 @@ class TestJobCVMatchingModel:
         assert isinstance(result['latency_ms'], int)
         assert result['latency_ms'] >= 0
     
+    def test_predict_flags_errors(self, monkeypatch):
+        """Test a failed prediction is marked, unlike a genuine empty result"""
+        model = JobCVMatchingModel()
+        
+        def boom(jd_text, cv_text):
+            raise RuntimeError("preprocess failed")
+        
+        monkeypatch.setattr(model, "_preprocess_texts", boom)
+        result = model.predict("Python developer", "Python developer")
+        assert result['score'] == 0.0
+        assert result['error'] == "preprocess failed"
+        assert 'error' not in model.predict("", "test")
+    
     def test_predict_empty_inputs(self):
         """Test prediction with empty inputs"""
         model = JobCVMatchingModel()
@@ -183,6 +196,38 @@ class TestBatchPredict:
         assert results[2]['score'] == 0.0  # Empty input should return 0
 
 
+    def test_batch_predict_dedupes_pairs(self):
+        """Test duplicate pairs are scored once and fanned out in order"""
+        jd = "Senior Python developer with Django"
+        cv_match = "Python developer, 5 years of Django"
+        cv_other = "Java engineer with Spring"
+        pairs = [(jd, cv_match), (jd, cv_other), (jd, cv_match), (jd, cv_match)]
+        
+        results, stats = batch_predict_with_stats(pairs, topk=3)
+        
+        assert len(results) == 4
+        assert results[0]['score'] == results[2]['score'] == results[3]['score']
+        assert results[0]['features'] == results[2]['features'] == results[3]['features']
+        assert results[0]['features'] is not results[2]['features']
+        assert stats['unique_pairs'] == 2
+        assert stats['unique_documents'] == 3
+        assert stats['dedupe_ratio'] == 0.5
+    
+    def test_batch_predict_matches_single_predict(self):
+        """Test batch results equal per-pair predictions"""
+        pairs = [
+            ("Looking for Python developer with Django", "Python Django developer, 5 years"),
+            ("Looking for Python developer with Django", "React frontend engineer"),
+        ]
+        
+        results = batch_predict(pairs, topk=3)
+        
+        for (jd_text, cv_text), result in zip(pairs, results):
+            single = predict(jd_text, cv_text, topk=3)
+            assert result['score'] == single['score']
+            assert result['features'] == single['features']
+
+
 class TestPerformance:
     """Test cases for performance aspects"""
     
@@ -0,0 +1,140 @@
+"""
+Unit tests for result_cache module
+"""
+import asyncio
+import pytest
+from result_cache import ResultCache, make_key, HIT, MISS, COALESCED
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestResultCache:
+    """Test cases for ResultCache"""
+    
+    def test_make_key_depends_on_every_part(self):
+        """Test keys differ when any field differs"""
+        base = make_key("jd", "cv", 6, "v1")
+        assert base == make_key("jd", "cv", 6, "v1")
+        assert base != make_key("jd", "cv", 5, "v1")
+        assert base != make_key("jd", "cv", 6, "v2")
+        assert make_key("a|b", "c") != make_key("a", "b|c")
+    
+    def test_hit_after_miss(self):
+        """Test second lookup is served from the cache"""
+        cache = ResultCache()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return {"score": 0.5}
+        
+        async def scenario():
+            first = await cache.get_or_compute("k", compute)
+            second = await cache.get_or_compute("k", compute)
+            return first, second
+        
+        first, second = run(scenario())
+        assert first[1] == MISS and second[1] == HIT
+        assert second[0] == {"score": 0.5}
+        assert len(calls) == 1
+    
+    def test_ttl_and_lru_eviction(self, monkeypatch):
+        """Test entries expire after ttl and the least recently used is evicted"""
+        now = [100.0]
+        monkeypatch.setattr("result_cache.time.monotonic", lambda: now[0])
+        cache = ResultCache(max_entries=2, ttl=10)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        now[0] += 11
+        assert cache.get("a") is None
+    
+    def test_singleflight_coalesces_concurrent_requests(self):
+        """Test concurrent identical requests share one computation"""
+        cache = ResultCache()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"score": 0.9}
+        
+        async def scenario():
+            return await asyncio.gather(*[cache.get_or_compute("k", compute) for _ in range(5)])
+        
+        results = run(scenario())
+        assert len(calls) == 1
+        assert sorted(status for _, status in results) == [COALESCED] * 4 + [MISS]
+        assert all(value == {"score": 0.9} for value, _ in results)
+    
+    def test_errors_are_shared_but_not_cached(self):
+        """Test a failed computation fails its waiters and is retried next time"""
+        cache = ResultCache()
+        calls = []
+        
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        async def scenario():
+            return await asyncio.gather(*[cache.get_or_compute("k", failing) for _ in range(3)],
+                                        return_exceptions=True)
+        
+        results = run(scenario())
+        assert len(calls) == 1
+        assert all(isinstance(r, ValueError) for r in results)
+        with pytest.raises(ValueError):
+            run(cache.get_or_compute("k", failing))
+        assert len(calls) == 2
+    
+    def test_cancelled_leader_does_not_fail_followers(self):
+        """Test cancelling the request that started a computation leaves it running"""
+        cache = ResultCache()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"score": 0.7}
+        
+        async def scenario():
+            leader = asyncio.ensure_future(cache.get_or_compute("k", compute))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(cache.get_or_compute("k", compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            value = await follower
+            return leader.cancelled(), value, await cache.get_or_compute("k", compute)
+        
+        leader_cancelled, follower, after = run(scenario())
+        assert leader_cancelled
+        assert follower == ({"score": 0.7}, COALESCED)
+        assert after == ({"score": 0.7}, HIT)
+        assert len(calls) == 1
+    
+    def test_uncacheable_results_are_shared_but_not_stored(self):
+        """Test results rejected by `cacheable` reach waiters but are recomputed next time"""
+        cache = ResultCache()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"score": 0.0, "error": "boom"}
+        
+        ok = lambda r: not r.get("error")
+        
+        async def scenario():
+            first = await asyncio.gather(*[cache.get_or_compute("k", compute, cacheable=ok) for _ in range(2)])
+            return first, await cache.get_or_compute("k", compute, cacheable=ok)
+        
+        first, again = run(scenario())
+        assert sorted(status for _, status in first) == [COALESCED, MISS]
+        assert again[1] == MISS
+        assert len(calls) == 2
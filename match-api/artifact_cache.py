@@ -0,0 +1,91 @@
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("match-api.artifacts")
+
+_CHUNK = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+  h = hashlib.sha256()
+  with open(path, "rb") as f:
+    for chunk in iter(lambda: f.read(_CHUNK), b""):
+      h.update(chunk)
+  return h.hexdigest()
+
+
+class ArtifactCache:
+  """Content-addressed store for model artifacts.
+
+  Layout under `root`:
+  - objects/<sha256>/<name>   immutable, read-only artifact files
+  - refs/<name>               digest of the most recently installed <name>
+  - staging/                  scratch space on the same filesystem for atomic renames
+
+  An object directory only appears once its content has been hashed (and
+  checked against the expected digest, if any), so a present object is
+  always a complete, verified file.
+  """
+
+  def __init__(self, root: str):
+    self.root = Path(root)
+    self.objects = self.root / "objects"
+    self.refs = self.root / "refs"
+    self.staging = self.root / "staging"
+    for d in (self.objects, self.refs, self.staging):
+      d.mkdir(parents=True, exist_ok=True)
+
+  def get(self, digest: str, name: str) -> Optional[str]:
+    path = self.objects / digest.lower() / name
+    return str(path) if path.is_file() else None
+
+  def current(self, name: str) -> Optional[str]:
+    ref = self.refs / name
+    if not ref.is_file():
+      return None
+    return self.get(ref.read_text().strip(), name)
+
+  def new_staging_dir(self) -> Path:
+    return Path(tempfile.mkdtemp(dir=self.staging))
+
+  def install(self, src: Path, name: str, expected_sha256: Optional[str] = None, move: bool = False) -> str:
+    """Verify `src` and install it as objects/<sha256>/<name>; return the installed path."""
+    src = Path(src)
+    stage = self.new_staging_dir()
+    try:
+      staged = stage / name
+      if move:
+        shutil.move(str(src), staged)
+      else:
+        shutil.copyfile(src, staged)
+      digest = sha256_file(staged)
+      if expected_sha256 and digest != expected_sha256.lower():
+        raise RuntimeError(f"Checksum mismatch for {name}: expected {expected_sha256}, got {digest}")
+      os.chmod(staged, 0o444)
+
+      target = self.objects / digest
+      if not target.exists():
+        try:
+          os.rename(stage, target)
+          stage = None
+        except OSError:
+          # Another worker installed the same digest first; keep theirs.
+          if not (target / name).is_file():
+            raise
+      self._set_ref(name, digest)
+      logger.info("Installed artifact %s sha256=%s", name, digest)
+      return str(target / name)
+    finally:
+      if stage is not None:
+        shutil.rmtree(stage, ignore_errors=True)
+
+  def _set_ref(self, name: str, digest: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=self.staging)
+    with os.fdopen(fd, "w") as f:
+      f.write(digest)
+    os.replace(tmp, self.refs / name)
@@ -13,6 +13,10 @@ from rapidfuzz import process, fuzz
 load_dotenv()
 logger = logging.getLogger("match-api.inference")
 
+# Memory-map numpy arrays from the read-only cached artifact so every worker
+# process shares the same page-cache pages instead of a private copy.
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE", "r") or None
+
 
 @dataclass
 class ModelHandle:
@@ -34,8 +38,8 @@ def load_model(local_path: str) -> ModelHandle:
         model = SentenceTransformer(st_name)
         return ModelHandle(kind="st", model=model, encoder=model)
 
-    logger.info("Loading pickle model at %s", local_path)
-    model = joblib_load(local_path)
+    logger.info("Loading pickle model at %s (mmap_mode=%s)", local_path, MODEL_MMAP_MODE)
+    model = joblib_load(local_path, mmap_mode=MODEL_MMAP_MODE)
     return ModelHandle(kind="pickle", model=model, encoder=None)
 
 
@@ -60,17 +64,37 @@ def _predict_pickle(handle: ModelHandle, jd_text: str, cv_text: str) -> float:
     return score
 
 
+FEATURE_WINDOW_WORDS = 5
+FEATURE_QUERY_WORDS = 120
+# Hard cap on CV windows scored per request; each window is one partial_ratio call.
+FEATURE_MAX_WINDOWS = int(os.getenv("FEATURE_MAX_WINDOWS", "400"))
+FEATURE_WORKERS = int(os.getenv("FEATURE_WORKERS", "-1"))
+
+
 def _extract_features(jd_text: str, cv_text: str, k: int = 6) -> List[str]:
-    jd_keys = [s.strip() for s in jd_text.split() if len(s) > 3]
-    cv = cv_text
-    matches = process.extract(
-        " ".join(jd_keys[:120]),
-        [" ".join(cv_text.split()[i:i+5]) for i in range(0, len(cv_text.split()), 5)],
-        scorer=fuzz.partial_ratio,
-        limit=k,
+    jd_keys = [s for s in jd_text.split() if len(s) > 3]
+    cv_words = cv_text.split()
+    if not cv_words or k <= 0:
+        return []
+
+    n_windows = min(
+        (len(cv_words) + FEATURE_WINDOW_WORDS - 1) // FEATURE_WINDOW_WORDS,
+        FEATURE_MAX_WINDOWS,
     )
-    features = [m[0][:42] for m in matches]
-    return features
+    windows = [
+        " ".join(cv_words[i * FEATURE_WINDOW_WORDS:(i + 1) * FEATURE_WINDOW_WORDS])
+        for i in range(n_windows)
+    ]
+    scores = process.cdist(
+        [" ".join(jd_keys[:FEATURE_QUERY_WORDS])],
+        windows,
+        scorer=fuzz.partial_ratio,
+        dtype=np.float32,
+        workers=FEATURE_WORKERS,
+    )[0]
+    # Stable sort keeps the earliest window on ties, same as process.extract.
+    top = np.argsort(-scores, kind="stable")[:k]
+    return [windows[i][:42] for i in top]
 
 
 def predict(handle: ModelHandle, jd_text: str, cv_text: str) -> Tuple[float, List[str]]:
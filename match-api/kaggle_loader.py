@@ -1,61 +1,95 @@
 import os
+import shutil
 import logging
+import zipfile
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
-from kaggle.api.kaggle_api_extended import KaggleApi
+
+from artifact_cache import ArtifactCache
 
 load_dotenv()
 logger = logging.getLogger("match-api.kaggle")
 
 
-def ensure_model() -> str:
-  """Ensure model file exists locally; download from Kaggle if missing.
-
-  Environment variables:
-  - KAGGLE_DATASET: e.g. "username/dataset_name"
-  - KAGGLE_FILE: file name inside dataset, e.g. "model.pkl"
-  - MODEL_LOCAL_PATH: local path to cache file, default ./artifacts/model.pkl
-  - KAGGLE_USERNAME/KAGGLE_KEY or ~/.kaggle/kaggle.json must exist
-  """
-  dataset = os.getenv("KAGGLE_DATASET")
-  remote_file = os.getenv("KAGGLE_FILE", "model.pkl")
-  local_path = os.getenv("MODEL_LOCAL_PATH", "./artifacts/model.pkl")
-
-  path = Path(local_path)
-  path.parent.mkdir(parents=True, exist_ok=True)
+def _fetch_from_dir(source_dir: str, remote_file: str) -> Path:
+  """Local stand-in for Kaggle: the dataset is a plain directory on disk."""
+  src = Path(source_dir) / remote_file
+  if not src.is_file() or src.stat().st_size == 0:
+    raise RuntimeError(f"Model file {remote_file} not found in {source_dir}")
+  return src
 
-  if path.exists() and path.stat().st_size > 0:
-    logger.info("Model already present at %s", path)
-    return str(path)
 
-  if not dataset:
-    logger.warning("KAGGLE_DATASET not set; assuming model will be created/placed at %s", path)
-    return str(path)
+def _fetch_from_kaggle(dataset: str, remote_file: str, dest: Path) -> Path:
+  from kaggle.api.kaggle_api_extended import KaggleApi
 
   logger.info("Downloading model %s from Kaggle dataset %s ...", remote_file, dataset)
   api = KaggleApi()
   api.authenticate()
-  api.dataset_download_file(dataset, remote_file, path=str(path.parent), force=False, quiet=False)
+  api.dataset_download_file(dataset, remote_file, path=str(dest), force=True, quiet=False)
 
   # The Kaggle lib stores as .zip if multiple files; try both plain and .zip
-  candidate = path
-  zip_path = path.parent / f"{remote_file}.zip"
+  candidate = dest / remote_file
+  zip_path = dest / f"{remote_file}.zip"
 
   if candidate.exists() and candidate.stat().st_size > 0:
-    logger.info("Downloaded model to %s", candidate)
-    return str(candidate)
+    return candidate
 
   if zip_path.exists() and zip_path.stat().st_size > 0:
-    import zipfile
-
     with zipfile.ZipFile(zip_path, 'r') as zf:
-      zf.extractall(path.parent)
+      zf.extractall(dest)
     if candidate.exists() and candidate.stat().st_size > 0:
-      logger.info("Extracted model to %s", candidate)
-      return str(candidate)
+      return candidate
 
   raise RuntimeError("Failed to download model from Kaggle")
 
 
+def ensure_model(expected_sha256: Optional[str] = None, refresh: bool = False) -> str:
+  """Ensure the model is in the local artifact cache; fetch it if missing.
+
+  Returns the path of the verified, read-only cached file. With `refresh`,
+  the source is fetched again unless `expected_sha256` is already cached.
+
+  Environment variables:
+  - KAGGLE_DATASET: e.g. "username/dataset_name"
+  - KAGGLE_FILE: file name inside dataset, e.g. "model.pkl"
+  - MODEL_SHA256: expected checksum; a cached copy with this digest skips the fetch
+  - MODEL_SOURCE_DIR: local directory used instead of Kaggle (offline/tests)
+  - MODEL_LOCAL_PATH: legacy local file, imported into the cache if present
+  - ARTIFACT_CACHE_DIR: cache root, default ./artifacts/cache
+  - KAGGLE_USERNAME/KAGGLE_KEY or ~/.kaggle/kaggle.json must exist
+  """
+  dataset = os.getenv("KAGGLE_DATASET")
+  remote_file = os.getenv("KAGGLE_FILE", "model.pkl")
+  source_dir = os.getenv("MODEL_SOURCE_DIR")
+  local_path = Path(os.getenv("MODEL_LOCAL_PATH", "./artifacts/model.pkl"))
+  expected_sha256 = expected_sha256 or os.getenv("MODEL_SHA256") or None
+
+  cache = ArtifactCache(os.getenv("ARTIFACT_CACHE_DIR", "./artifacts/cache"))
+  if expected_sha256:
+    hit = cache.get(expected_sha256, remote_file)
+  else:
+    hit = None if refresh else cache.current(remote_file)
+  if hit:
+    logger.info("Model already cached at %s", hit)
+    return hit
+
+  if source_dir:
+    logger.info("Installing model %s from local source %s", remote_file, source_dir)
+    return cache.install(_fetch_from_dir(source_dir, remote_file), remote_file, expected_sha256)
+
+  if local_path.exists() and local_path.stat().st_size > 0:
+    logger.info("Importing model from %s into cache", local_path)
+    return cache.install(local_path, remote_file, expected_sha256)
+
+  if not dataset:
+    logger.warning("KAGGLE_DATASET not set; assuming model will be created/placed at %s", local_path)
+    return str(local_path)
+
+  stage = cache.new_staging_dir()
+  try:
+    downloaded = _fetch_from_kaggle(dataset, remote_file, stage)
+    return cache.install(downloaded, remote_file, expected_sha256, move=True)
+  finally:
+    shutil.rmtree(stage, ignore_errors=True)
@@ -1,7 +1,11 @@
+import gc
 import os
+import hmac
 import time
 import logging
-from typing import List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,6 +17,7 @@ from dotenv import load_dotenv
 from kaggle_loader import ensure_model
 from inference import load_model, predict as model_predict, ModelHandle
 from preprocess import clean_text, extract_text_from_file
+from ratelimit import build_rate_limiter
 
 
 # ---------- Env & logging ----------
@@ -24,6 +29,11 @@ MODEL_LOCAL_PATH = os.getenv("MODEL_LOCAL_PATH", "./artifacts/model.pkl")
 ORIGINS = ["http://localhost:5173"]
 REQUEST_TIMEOUT_SEC = 15
 RATE_LIMIT_PER_MIN = int(os.getenv("RATE_LIMIT_PER_MIN", "60"))
+NOT_READY_RETRY_AFTER_SEC = int(os.getenv("NOT_READY_RETRY_AFTER_SEC", "5"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+SWAP_DRAIN_TIMEOUT_SEC = float(os.getenv("SWAP_DRAIN_TIMEOUT_SEC", "60"))
+WARMUP_JD = "python developer with docker and sql experience"
+WARMUP_CV = "software engineer skilled in python, docker, postgresql and rest apis"
 
 
 # ---------- Pydantic models ----------
@@ -32,6 +42,10 @@ class PredictIn(BaseModel):
     cv_text: str = Field(..., max_length=50000)
 
 
+class ReloadIn(BaseModel):
+    sha256: Optional[str] = Field(None, min_length=64, max_length=64)
+
+
 class PredictOut(BaseModel):
     score: float
     percent: str
@@ -50,61 +64,186 @@ app.add_middleware(
 )
 
 
-# ---------- Simple in-memory rate limiter ----------
-class TokenBucket:
-    def __init__(self, rate_per_min: int):
-        self.capacity = rate_per_min
-        self.tokens = rate_per_min
-        self.last = time.monotonic()
-
-    def allow(self) -> bool:
-        now = time.monotonic()
-        elapsed = now - self.last
-        refill = (elapsed / 60.0) * self.capacity
-        if refill > 0:
-            self.tokens = min(self.capacity, self.tokens + refill)
-            self.last = now
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return True
-        return False
-
-
-rate_buckets = {}
+# ---------- Rate limiting ----------
+rate_limiter = build_rate_limiter(RATE_LIMIT_PER_MIN)
 
 
 def rate_limit_dependency(request: Request):
     ip = request.client.host if request.client else "unknown"
-    bucket = rate_buckets.setdefault(ip, TokenBucket(RATE_LIMIT_PER_MIN))
-    if not bucket.allow():
+    if not rate_limiter.allow(ip):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
 
 # ---------- Model lifecycle ----------
 model_handle: Optional[ModelHandle] = None
+model_ready = threading.Event()
+model_load_error: Optional[str] = None
+
+# In-flight request counts per handle, so a swapped-out model is only
+# released once every request that leased it has finished.
+_inflight_cond = threading.Condition()
+_inflight: Dict[int, int] = {}
+
+_reload_lock = threading.Lock()
+reload_status: Dict[str, object] = {"status": "idle"}
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _load_handle(expected_sha256: Optional[str] = None, refresh: bool = False) -> ModelHandle:
+    handle = load_model(ensure_model(expected_sha256, refresh=refresh))
+    model_predict(handle, WARMUP_JD, WARMUP_CV)
+    return handle
+
+
+@contextmanager
+def _lease_model():
+    with _inflight_cond:
+        handle = model_handle
+        if handle is not None:
+            _inflight[id(handle)] = _inflight.get(id(handle), 0) + 1
+    try:
+        yield handle
+    finally:
+        if handle is not None:
+            with _inflight_cond:
+                left = _inflight[id(handle)] - 1
+                if left:
+                    _inflight[id(handle)] = left
+                else:
+                    del _inflight[id(handle)]
+                    _inflight_cond.notify_all()
+
+
+def _swap_model(new_handle: ModelHandle) -> bool:
+    """Atomically publish `new_handle`; wait for the old one to drain. Returns True if drained."""
+    global model_handle
+    with _inflight_cond:
+        old, model_handle = model_handle, new_handle
+        drained = _inflight_cond.wait_for(
+            lambda: old is None or id(old) not in _inflight,
+            timeout=SWAP_DRAIN_TIMEOUT_SEC,
+        )
+    if not drained:
+        logger.warning("Old model still in use after %.0fs; leaving it to the GC", SWAP_DRAIN_TIMEOUT_SEC)
+    del old
+    gc.collect()
+    return drained
+
+
+def _load_and_warm_up():
+    """Fetch, load and warm up the model off the event loop; flips readiness when done."""
+    global model_load_error
+    t0 = time.monotonic()
+    try:
+        handle = _load_handle()
+    except Exception as e:
+        model_load_error = str(e)
+        logger.exception("Model load failed")
+        return
+    _swap_model(handle)
+    model_ready.set()
+    logger.info("Model loaded and warmed up in %.0f ms", (time.monotonic() - t0) * 1000.0)
+
+
+def _reload_model(expected_sha256: Optional[str]):
+    global reload_status
+    status: Dict[str, object] = {"status": "loading", "rss_mb_before": _rss_mb()}
+    reload_status = status
+    try:
+        t0 = time.monotonic()
+        handle = _load_handle(expected_sha256, refresh=True)
+        status["load_ms"] = round((time.monotonic() - t0) * 1000.0, 1)
+        status["rss_mb_loaded"] = _rss_mb()
+        status["drained"] = _swap_model(handle)
+        model_ready.set()
+        status["rss_mb_after"] = _rss_mb()
+        status["status"] = "done"
+        logger.info("Model swapped: %s", status)
+    except Exception as e:
+        status.update(status="failed", error=str(e))
+        logger.exception("Model reload failed; keeping current model")
+    finally:
+        _reload_lock.release()
 
 
 @app.on_event("startup")
 def startup_event():
     os.makedirs(os.path.dirname(MODEL_LOCAL_PATH), exist_ok=True)
-    ensure_model()
-    global model_handle
-    model_handle = load_model(MODEL_LOCAL_PATH)
-    logger.info("Model loaded and ready")
+    threading.Thread(target=_load_and_warm_up, name="model-loader", daemon=True).start()
+
+
+def _not_ready() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Model not ready",
+        headers={"Retry-After": str(NOT_READY_RETRY_AFTER_SEC)},
+    )
+
+
+def require_ready():
+    if not model_ready.is_set():
+        raise _not_ready()
 
 
+@app.get("/healthz")
 @app.get("/health")
-def health():
+def healthz():
+    """Liveness: the process is up and serving, model or not."""
     return {"ok": True}
 
 
+@app.get("/readyz")
+def readyz():
+    """Readiness: model loaded and warm-up inference done."""
+    if model_ready.is_set():
+        return {"ready": True}
+    return JSONResponse(
+        status_code=503,
+        content={"ready": False, "error": model_load_error},
+        headers={"Retry-After": str(NOT_READY_RETRY_AFTER_SEC)},
+    )
+
+
+def require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("X-Admin-Token") or ""
+    if not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.post("/admin/reload", status_code=202)
+def admin_reload(payload: Optional[ReloadIn] = None, _: None = Depends(require_admin)):
+    """Load, warm up and hot-swap a new model in the background."""
+    if not _reload_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Reload already in progress")
+    sha256 = payload.sha256 if payload else None
+    threading.Thread(target=_reload_model, args=(sha256,), name="model-reload", daemon=True).start()
+    return {"status": "loading"}
+
+
+@app.get("/admin/reload")
+def admin_reload_status(_: None = Depends(require_admin)):
+    return reload_status
+
+
 def _predict_impl(jd_text: str, cv_text: str) -> PredictOut:
-    if model_handle is None:
-        raise HTTPException(status_code=503, detail="Model not ready")
     t0 = time.monotonic()
     jd = clean_text(jd_text)
     cv = clean_text(cv_text)
-    score, features = model_predict(model_handle, jd, cv)
+    with _lease_model() as handle:
+        if handle is None:
+            raise _not_ready()
+        score, features = model_predict(handle, jd, cv)
     latency_ms = (time.monotonic() - t0) * 1000.0
     return PredictOut(
         score=float(score),
@@ -115,7 +254,11 @@ def _predict_impl(jd_text: str, cv_text: str) -> PredictOut:
 
 
 @app.post("/predict", response_model=PredictOut)
-def predict(payload: PredictIn, _: None = Depends(rate_limit_dependency)):
+def predict(
+    payload: PredictIn,
+    _ready: None = Depends(require_ready),
+    _: None = Depends(rate_limit_dependency),
+):
     try:
         return _predict_impl(payload.jd_text, payload.cv_text)
     except HTTPException:
@@ -129,6 +272,7 @@ def predict(payload: PredictIn, _: None = Depends(rate_limit_dependency)):
 async def predict_files(
     jd_file: UploadFile = File(...),
     cv_file: UploadFile = File(...),
+    _ready: None = Depends(require_ready),
     _: None = Depends(rate_limit_dependency),
 ):
     try:
@@ -0,0 +1,176 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger("match-api.ratelimit")
+
+
+class TokenBucket:
+    def __init__(self, rate_per_min: int, tokens: Optional[float] = None, last: Optional[float] = None):
+        self.capacity = rate_per_min
+        self.tokens = rate_per_min if tokens is None else tokens
+        self.last = time.monotonic() if last is None else last
+        self.last_seen = self.last
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        self.last_seen = now
+        elapsed = now - self.last
+        refill = (elapsed / 60.0) * self.capacity
+        if refill > 0:
+            self.tokens = min(self.capacity, self.tokens + refill)
+            self.last = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _Shard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+
+class MemoryRateLimiter:
+    """Per-process limiter over a sharded, LRU/TTL-bounded bucket table.
+
+    Each shard keeps its buckets in access order behind its own lock, so
+    threaded endpoints only contend on keys that hash to the same shard.
+    Buckets idle for longer than `idle_ttl_sec` are dropped; a bucket idle for
+    a full minute has refilled anyway, so this loses no limiting state.
+    """
+
+    def __init__(self, rate_per_min: int, max_buckets: int = 10000, idle_ttl_sec: float = 120.0, shards: int = 16):
+        self.rate_per_min = rate_per_min
+        self.idle_ttl_sec = idle_ttl_sec
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._per_shard = max(1, max_buckets // len(self._shards))
+
+    def allow(self, key: str) -> bool:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_min, last=now)
+                shard.buckets[key] = bucket
+            else:
+                shard.buckets.move_to_end(key)
+            allowed = bucket.allow(now)
+            self._evict(shard, now)
+        return allowed
+
+    def _evict(self, shard: _Shard, now: float) -> None:
+        buckets = shard.buckets
+        while buckets:
+            key, oldest = next(iter(buckets.items()))
+            if len(buckets) > self._per_shard or now - oldest.last_seen > self.idle_ttl_sec:
+                del buckets[key]
+            else:
+                break
+
+    def __len__(self) -> int:
+        return sum(len(s.buckets) for s in self._shards)
+
+
+class SqliteRateLimiter:
+    """Limiter whose buckets live in a local SQLite file shared by all workers.
+
+    Uses wall-clock time because monotonic clocks are not comparable across
+    processes. Fails open if the database stays locked past `timeout_sec`.
+    """
+
+    def __init__(self, path: str, rate_per_min: int, idle_ttl_sec: float = 120.0,
+                 timeout_sec: float = 0.5, sweep_every: int = 1000):
+        self.path = path
+        self.rate_per_min = rate_per_min
+        self.idle_ttl_sec = idle_ttl_sec
+        self.timeout_sec = timeout_sec
+        self.sweep_every = sweep_every
+        self._local = threading.local()
+        self._calls = 0
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, last REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_buckets_last ON rate_buckets(last)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout_sec, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def allow(self, key: str) -> bool:
+        now = time.time()
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, last FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                bucket = TokenBucket(self.rate_per_min, tokens=row[0], last=row[1]) if row else \
+                    TokenBucket(self.rate_per_min, last=now)
+                allowed = bucket.allow(now)
+                conn.execute(
+                    "INSERT INTO rate_buckets(key, tokens, last) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, last = excluded.last",
+                    (key, bucket.tokens, bucket.last),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as e:
+            logger.warning("Rate limit store unavailable (%s); allowing request", e)
+            return True
+
+        self._calls += 1
+        if self._calls % self.sweep_every == 0:
+            self.sweep(now)
+        return allowed
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Delete buckets idle for longer than `idle_ttl_sec`."""
+        now = time.time() if now is None else now
+        try:
+            cur = self._conn().execute("DELETE FROM rate_buckets WHERE last < ?", (now - self.idle_ttl_sec,))
+            return cur.rowcount
+        except sqlite3.OperationalError as e:
+            logger.warning("Rate limit sweep skipped: %s", e)
+            return 0
+
+
+def build_rate_limiter(rate_per_min: int):
+    """Build the limiter selected by env.
+
+    - RATE_LIMIT_BACKEND: "memory" (default, per process) or "sqlite" (shared)
+    - RATE_LIMIT_DB: SQLite path for the shared backend, default ./artifacts/ratelimit.db
+    - RATE_LIMIT_MAX_BUCKETS / RATE_LIMIT_IDLE_SEC / RATE_LIMIT_SHARDS
+    """
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    idle = float(os.getenv("RATE_LIMIT_IDLE_SEC", "120"))
+    if backend == "sqlite":
+        path = os.getenv("RATE_LIMIT_DB", "./artifacts/ratelimit.db")
+        logger.info("Using shared SQLite rate limiter at %s", path)
+        return SqliteRateLimiter(path, rate_per_min, idle_ttl_sec=idle)
+    return MemoryRateLimiter(
+        rate_per_min,
+        max_buckets=int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000")),
+        idle_ttl_sec=idle,
+        shards=int(os.getenv("RATE_LIMIT_SHARDS", "16")),
+    )
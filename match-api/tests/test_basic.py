@@ -19,3 +19,128 @@ def test_predict_mock():
     assert isinstance(feats, list)
 
 
+
+
+def test_extract_features_caps_windows(monkeypatch):
+    import inference
+
+    monkeypatch.setattr(inference, "FEATURE_MAX_WINDOWS", 3)
+    cv = " ".join(f"w{i}" for i in range(50)) + " python java"
+    feats = inference._extract_features('python java', cv, k=6)
+    # Only the first 3 five-word windows are scored; the tail match is never seen.
+    assert len(feats) == 3
+    assert all('python' not in f for f in feats)
+
+
+def test_memory_rate_limiter_evicts_lru():
+    from ratelimit import MemoryRateLimiter
+
+    limiter = MemoryRateLimiter(rate_per_min=2, max_buckets=4, shards=1)
+    for i in range(10):
+        assert limiter.allow(f"10.0.0.{i}")
+    assert len(limiter) == 4
+    assert limiter.allow("10.0.0.9")
+    assert not limiter.allow("10.0.0.9")
+
+
+def test_sqlite_rate_limiter_shared(tmp_path):
+    from ratelimit import SqliteRateLimiter
+
+    db = str(tmp_path / "rl.db")
+    a = SqliteRateLimiter(db, rate_per_min=2)
+    b = SqliteRateLimiter(db, rate_per_min=2)
+    assert a.allow("1.2.3.4")
+    assert b.allow("1.2.3.4")
+    assert not a.allow("1.2.3.4")
+    assert b.sweep(now=10**12) == 1
+
+
+def test_ensure_model_from_local_source(tmp_path, monkeypatch):
+    import hashlib
+    import numpy as np
+    from joblib import dump
+    from kaggle_loader import ensure_model
+    from inference import load_model
+
+    src = tmp_path / "kaggle"
+    src.mkdir()
+    dump({"w": np.arange(1000, dtype=np.float64)}, src / "model.pkl")
+    digest = hashlib.sha256((src / "model.pkl").read_bytes()).hexdigest()
+
+    monkeypatch.setenv("MODEL_SOURCE_DIR", str(src))
+    monkeypatch.setenv("ARTIFACT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MODEL_LOCAL_PATH", str(tmp_path / "missing.pkl"))
+    monkeypatch.delenv("SENTENCE_TRANSFORMERS_MODEL", raising=False)
+
+    path = ensure_model(expected_sha256=digest)
+    assert digest in path
+    # Second call is a cache hit even without the source.
+    monkeypatch.delenv("MODEL_SOURCE_DIR")
+    assert ensure_model() == path
+
+    handle = load_model(path)
+    assert isinstance(handle.model["w"], np.memmap)
+
+
+def test_ensure_model_checksum_mismatch(tmp_path, monkeypatch):
+    import pytest
+    from kaggle_loader import ensure_model
+
+    src = tmp_path / "kaggle"
+    src.mkdir()
+    (src / "model.pkl").write_bytes(b"not the model")
+    monkeypatch.setenv("MODEL_SOURCE_DIR", str(src))
+    monkeypatch.setenv("ARTIFACT_CACHE_DIR", str(tmp_path / "cache"))
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        ensure_model(expected_sha256="0" * 64)
+    assert not any((tmp_path / "cache" / "objects").iterdir())
+
+
+def test_not_ready_returns_503_with_retry_after(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    # Keep the background loader from running during the test.
+    monkeypatch.setattr(main, "_load_and_warm_up", lambda: None)
+    monkeypatch.setattr(main, "model_ready", main.threading.Event())
+    with TestClient(main.app) as client:
+        assert client.get("/healthz").json() == {"ok": True}
+        ready = client.get("/readyz")
+        assert ready.status_code == 503
+        r = client.post("/predict", json={"jd_text": "a", "cv_text": "b"})
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == str(main.NOT_READY_RETRY_AFTER_SEC)
+
+
+def test_swap_waits_for_inflight_requests(monkeypatch):
+    import threading
+    import main
+
+    old = ModelHandle(kind="st", model=None, encoder=None)
+    new = ModelHandle(kind="st", model=None, encoder=None)
+    monkeypatch.setattr(main, "model_handle", old)
+
+    done = threading.Event()
+    with main._lease_model() as leased:
+        assert leased is old
+        t = threading.Thread(target=lambda: (main._swap_model(new), done.set()))
+        t.start()
+        assert not done.wait(0.2)
+        # New requests already see the new handle while the old one drains.
+        with main._lease_model() as fresh:
+            assert fresh is new
+    t.join(2)
+    assert done.is_set()
+    assert main.model_handle is new
+    assert not main._inflight
+
+
+def test_admin_reload_requires_token(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    monkeypatch.setattr(main, "ADMIN_TOKEN", None)
+    assert client.post("/admin/reload").status_code == 404
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "nope"}).status_code == 403
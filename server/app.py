@@ -1,40 +1,160 @@
 import os
-import uuid
-import json
-from flask import Flask, request, jsonify, send_from_directory
+from datetime import datetime
+from flask import Flask, Blueprint, current_app, request, jsonify, send_from_directory, Response, abort, stream_with_context
 from flask_cors import CORS
 from db import init_db, db
 from models import Candidate, JobPosting, SwipeDecision
 from utils.parse_resume import extract_profile
 from utils.parse_jd import parse_jd
-from utils.jobs_feed import load_jobs_df, job_row_to_dict
-
-app = Flask(__name__, static_url_path='', static_folder='.')
-CORS(app)
-
-# Initialize DB
-init_db(app)
+from utils.jobs_feed import load_jobs_df, JobFeed, page_body
+from utils.job_ranker import JobRanker, candidate_profile_text
+from utils.jobs_store import JobStore, DEFAULT_DB as DEFAULT_JOBS_DB
+from utils.decision_queue import DecisionWriter, QueueFull, insert_decisions
+from utils.avatar import placeholder_svg
+from utils.avatar_store import AvatarProcessor, InvalidImage, CACHE_MAX_AGE as AVATAR_MAX_AGE
+from utils.parse_jobs import ParseJobQueue, ParseJobStore, QueueFull as ParseQueueFull
+from utils.parse_cache import ParseCache, DEFAULT_DB as DEFAULT_PARSE_CACHE_DB
+from utils.bulk_import import collect_files, BulkImportError, MAX_REQUEST_BYTES as BULK_MAX_REQUEST_BYTES
+from utils.http_cache import ResponseCache, conditional_json, etag_for, FEED_CACHE_CONTROL
+from utils.json_provider import FastJSONProvider
+from utils.compression import Compressor
+
+api = Blueprint('api', __name__)
 
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), 'uploads', 'avatars')
 os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-# Cache nhẹ
-_JOBS_DF = None
-def get_df():
-    global _JOBS_DF
-    if _JOBS_DF is None:
-        _JOBS_DF = load_jobs_df()
-    return _JOBS_DF
-
-
-@app.route('/uploads/avatars/<path:filename>')
+# Avatar được resize/nén ở thread nền (utils/avatar_store.py)
+avatars = AvatarProcessor(UPLOAD_DIR, workers=int(os.getenv('AVATAR_WORKERS', '2')))
+AVATAR_ENSURE_TIMEOUT = float(os.getenv('AVATAR_ENSURE_TIMEOUT_SEC', '2'))
+AVATAR_URL_DIR = os.path.relpath(UPLOAD_DIR, os.path.dirname(__file__)).replace('\\', '/')
+
+# Swipe đơn lẻ đi qua write-behind queue (DECISION_WRITE_BEHIND=0 để ghi đồng bộ)
+DECISION_WRITE_BEHIND = os.getenv('DECISION_WRITE_BEHIND', '1') != '0'
+MAX_BULK_DECISIONS = 500
+decision_writer = DecisionWriter(
+    batch_size=int(os.getenv('DECISION_BATCH_SIZE', '200')),
+    flush_interval=int(os.getenv('DECISION_FLUSH_MS', '500')) / 1000.0,
+    max_queue=int(os.getenv('DECISION_QUEUE_MAX', '10000')),
+)
+
+# Kết quả parse theo hash file (PARSE_CACHE_DB='' để tắt)
+PARSE_CACHE_DB = os.getenv('PARSE_CACHE_DB', str(DEFAULT_PARSE_CACHE_DB))
+parse_cache = ParseCache(
+    PARSE_CACHE_DB,
+    max_bytes=int(float(os.getenv('PARSE_CACHE_MAX_MB', '200')) * 1024 * 1024),
+) if PARSE_CACHE_DB else None
+
+# Trạng thái/kết quả job parse trong SQLite để mọi worker gunicorn trả lời được GET
+# (PARSE_JOBS_DB='' -> giữ trong RAM của process, chỉ đúng khi chạy 1 worker)
+PARSE_JOBS_DB = os.getenv('PARSE_JOBS_DB', str(DEFAULT_PARSE_CACHE_DB))
+
+# Parse CV/JD ở process pool (POST /api/parse-jobs rồi poll GET /api/parse-jobs/<id>)
+parse_queue = ParseJobQueue(
+    cache=parse_cache,
+    store=ParseJobStore(PARSE_JOBS_DB) if PARSE_JOBS_DB else None,
+    max_workers=int(os.getenv('PARSE_WORKERS', '2')),
+    max_pending=int(os.getenv('PARSE_QUEUE_MAX', '32')),
+    timeout=float(os.getenv('PARSE_TIMEOUT_SEC', '30')),
+    ttl=float(os.getenv('PARSE_RESULT_TTL_SEC', '600')),
+)
+PARSE_EXTS = {'resume': {'.pdf', '.doc', '.docx'}, 'jd': {'.pdf', '.doc', '.docx', '.txt'}}
+MAX_PARSE_BYTES = 10 * 1024 * 1024
+
+# Feed dựng sẵn 1 lần / process (card dict + JSON fragment cho từng job)
+_JOB_FEED = None
+def get_feed():
+    global _JOB_FEED
+    if _JOB_FEED is None:
+        _JOB_FEED = JobFeed.from_df(load_jobs_df())
+    return _JOB_FEED
+
+# Kho SQLite + FTS5 (python -m utils.jobs_store); nếu chưa import thì dùng feed in-memory
+JOBS_DB = os.getenv('JOBS_DB', str(DEFAULT_JOBS_DB))
+_JOB_STORE = None
+def get_store():
+    global _JOB_STORE
+    if _JOB_STORE is None and os.path.exists(JOBS_DB):
+        _JOB_STORE = JobStore(JOBS_DB)
+    return _JOB_STORE
+
+def get_jobs_source():
+    return get_store() or get_feed()
+
+# TF-IDF của toàn bộ job cho feed cá nhân hoá (?candidate_id=)
+_JOB_RANKER = None
+def get_ranker():
+    global _JOB_RANKER
+    if _JOB_RANKER is None:
+        _JOB_RANKER = JobRanker.from_source(get_jobs_source())
+    return _JOB_RANKER
+
+
+# Body JSON của job/ứng viên theo ETag; entry cũ tự mất hiệu lực khi updated_at đổi
+response_cache = ResponseCache(int(os.getenv('RESPONSE_CACHE_SIZE', '1024')))
+
+# gzip/br theo Accept-Encoding (COMPRESS_MIN_BYTES=0 nén mọi body, để trống thì tắt)
+COMPRESS_MIN_BYTES = os.getenv('COMPRESS_MIN_BYTES', '1024')
+compressor = Compressor(
+    min_size=int(COMPRESS_MIN_BYTES),
+    cache=ResponseCache(int(os.getenv('COMPRESS_CACHE_SIZE', '256'))),
+) if COMPRESS_MIN_BYTES else None
+
+
+def _row_stamp(model, id):
+    """updated_at của 1 dòng (SELECT 1 cột, không load ORM object); None nếu không có."""
+    row = db.session.execute(
+        db.select(model.updated_at, model.created_at).where(model.id == id)
+    ).first()
+    if row is None:
+        return None
+    return row[0] or row[1] or datetime(1970, 1, 1)
+
+
+def _swipe_stamp(cand_id):
+    """Đổi mỗi khi ứng viên quẹt thêm job (feed cá nhân phụ thuộc vào đó)."""
+    return tuple(db.session.execute(
+        db.select(db.func.count(), db.func.max(SwipeDecision.id))
+        .where(SwipeDecision.candidate_id == cand_id)
+    ).first())
+
+
+def personalized_page(cand, offset, limit) -> str:
+    """Trang feed cho 1 ứng viên: bỏ job đã quẹt, xếp theo độ khớp hồ sơ."""
+    swiped = {
+        r[0] for r in db.session.query(SwipeDecision.job_id)
+        .filter(SwipeDecision.candidate_id == cand.id)
+    }
+    key = (cand.id, cand.updated_at)
+    positions, nxt = get_ranker().page(key, candidate_profile_text(cand.to_dict()), swiped, offset, limit)
+    return page_body(get_jobs_source().fragments_at(positions), nxt)
+
+
+@api.route('/uploads/avatars/<path:filename>')
 def uploaded_file(filename):
-    return send_from_directory(UPLOAD_DIR, filename)
-
-
-@app.post('/api/candidates')
+    # bản thumbnail có thể vẫn đang được tạo trong pool
+    if not avatars.ensure(filename, timeout=AVATAR_ENSURE_TIMEOUT) and avatars.is_pending(filename):
+        return jsonify({'error': 'Avatar đang được xử lý'}), 503, {'Retry-After': '1'}
+    resp = send_from_directory(UPLOAD_DIR, filename, max_age=AVATAR_MAX_AGE)
+    resp.cache_control.immutable = True
+    return resp
+
+
+@api.get('/api/avatars/placeholder/<initials>.svg')
+def placeholder_avatar_svg(initials):
+    """Avatar chữ cái đầu cho CV không có ảnh; nội dung cố định theo initials nên cache lâu dài."""
+    if not 1 <= len(initials) <= 2:
+        abort(404)
+    resp = Response(placeholder_svg(initials), mimetype='image/svg+xml')
+    resp.cache_control.public = True
+    resp.cache_control.max_age = AVATAR_MAX_AGE
+    resp.cache_control.immutable = True
+    return resp
+
+
+@api.post('/api/candidates')
 def create_candidate():
     try:
+        avatar_path = None
         name = request.form.get('name', '')
         degree = request.form.get('degree', '')
         languages_text = request.form.get('languages', '')
@@ -45,26 +165,17 @@ def create_candidate():
 
         # parse languages
         languages = [x.strip() for x in languages_text.split(',') if x.strip()]
-        avatar_path = None
         file = request.files.get('avatar')
         if file and file.filename:
-            ext = os.path.splitext(file.filename)[1].lower()
-            if ext not in {'.png', '.jpg', '.jpeg'}:
-                return jsonify({'error': 'Only .png, .jpg, .jpeg allowed'}), 400
-            file.seek(0, 2)
-            size = file.tell(); file.seek(0)
-            if size > 5 * 1024 * 1024:
-                return jsonify({'error': 'Avatar must be ≤ 5MB'}), 400
-            fname = f"{uuid.uuid4().hex}.png"
-            save_path = os.path.join(UPLOAD_DIR, fname)
-            # Save directly; Pillow conversion could be added if needed
-            file.save(save_path)
-            avatar_path = os.path.relpath(save_path, os.path.dirname(__file__)).replace('\\', '/')
+            try:
+                avatar_path = f"{AVATAR_URL_DIR}/{avatars.save_upload(file)}"
+            except InvalidImage as e:
+                return jsonify({'error': str(e)}), 400
 
         cand = Candidate(
             name=name,
             degree=degree,
-            languages=json.dumps(languages, ensure_ascii=False),
+            languages=languages,
             exp1=exp1,
             exp2=exp2,
             skill1=skill1,
@@ -76,20 +187,51 @@ def create_candidate():
         return jsonify(cand.to_dict()), 201
     except Exception as e:
         db.session.rollback()
+        avatars.remove(avatar_path)  # file đã lưu nhưng không có ứng viên nào trỏ tới
         return jsonify({'error': str(e)}), 500
 
 
-@app.get('/api/candidates/<int:cid>')
+@api.get('/api/candidates/<int:cid>')
 def get_candidate(cid):
-    cand = Candidate.query.get_or_404(cid)
-    return jsonify(cand.to_dict())
-
-
-@app.put('/api/candidates/<int:cid>')
+    stamp = _row_stamp(Candidate, cid)
+    if stamp is None:
+        abort(404)
+    return conditional_json(
+        etag_for('candidate', cid, stamp.isoformat()),
+        lambda: Candidate.row_json(db.session.execute(Candidate.select_json().where(Candidate.id == cid)).one()),
+        last_modified=stamp, cache=response_cache, key=('candidate', cid),
+    )
+
+
+def _tag_filtered(model, limit_max=50):
+    """Lọc theo ?skill=&language= qua bảng tag có index; ?offset=&limit= để phân trang."""
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', 20)), limit_max)
+    except ValueError:
+        return {'error': 'offset/limit không hợp lệ'}, 400
+    stmt = model.select_json()
+    for kind, arg in (('skill', 'skill'), ('language', 'language')):
+        value = (request.args.get(arg) or '').strip()
+        if value:
+            stmt = stmt.where(model.id.in_(model.tag_ids(kind, value)))
+    rows = db.session.execute(stmt.order_by(model.id).offset(max(0, offset)).limit(limit))
+    return Response('{"items":[' + ','.join(model.row_json(r) for r in rows) + ']}',
+                    mimetype='application/json')
+
+
+@api.get('/api/candidates')
+def list_candidates():
+    """Ứng viên theo skill/ngôn ngữ: ?skill=Docker&language=English"""
+    return _tag_filtered(Candidate)
+
+
+@api.put('/api/candidates/<int:cid>')
 def update_candidate(cid):
     cand = Candidate.query.get_or_404(cid)
+    new_avatar = None
     try:
-        data = request.form if request.form else request.json or {}
+        data = request.form if (request.form or request.files) else request.get_json(silent=True) or {}
         def g(k, default=''):
             return data.get(k, getattr(cand, k))
         cand.name = g('name')
@@ -97,33 +239,41 @@ def update_candidate(cid):
         languages_text = data.get('languages')
         if languages_text is not None:
             langs = [x.strip() for x in languages_text.split(',') if x.strip()]
-            cand.languages = json.dumps(langs, ensure_ascii=False)
+            cand.languages = langs
         cand.exp1 = g('exp1')
         cand.exp2 = g('exp2')
         cand.skill1 = g('skill1')
         cand.skill2 = g('skill2')
 
+        old_avatar = None
         file = request.files.get('avatar') if request.files else None
         if file and file.filename:
-            ext = os.path.splitext(file.filename)[1].lower()
-            if ext not in {'.png', '.jpg', '.jpeg'}:
-                return jsonify({'error': 'Only .png, .jpg, .jpeg allowed'}), 400
-            file.seek(0, 2); size = file.tell(); file.seek(0)
-            if size > 5 * 1024 * 1024:
-                return jsonify({'error': 'Avatar must be ≤ 5MB'}), 400
-            fname = f"{uuid.uuid4().hex}.png"
-            save_path = os.path.join(UPLOAD_DIR, fname)
-            file.save(save_path)
-            cand.avatar_path = os.path.relpath(save_path, os.path.dirname(__file__)).replace('\\', '/')
+            try:
+                fname = avatars.save_upload(file)
+            except InvalidImage as e:
+                db.session.rollback()
+                return jsonify({'error': str(e)}), 400
+            new_avatar = f"{AVATAR_URL_DIR}/{fname}"
+            old_avatar, cand.avatar_path = cand.avatar_path, new_avatar
 
         db.session.commit()
+        response_cache.invalidate(('candidate', cid))
+        if old_avatar:
+            avatars.remove(old_avatar)
         return jsonify(cand.to_dict())
     except Exception as e:
         db.session.rollback()
+        avatars.remove(new_avatar)  # rollback: giữ avatar cũ, bỏ file vừa upload
         return jsonify({'error': str(e)}), 500
 
 
-@app.post('/api/parse-resume')
+def _parse_cached(kind, data, filename, parse):
+    if parse_cache is None:
+        return parse(data, filename)
+    return parse_cache.get_or_parse(kind, data, filename, parse)
+
+
+@api.post('/api/parse-resume')
 def deprecated_parse():
     try:
         if 'file' not in request.files:
@@ -136,13 +286,13 @@ def deprecated_parse():
         f.seek(0, 2); size = f.tell(); f.seek(0)
         if size > 10 * 1024 * 1024:
             return jsonify({'error': 'File size must be ≤ 10MB'}), 400
-        data = extract_profile(f.stream, filename)
+        data = _parse_cached('resume', f.read(), filename, extract_profile)
         return jsonify(data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.post('/api/parse-jd')
+@api.post('/api/parse-jd')
 def parse_jd_api():
     try:
         f = request.files.get('file')
@@ -161,29 +311,55 @@ def parse_jd_api():
         if size > 10 * 1024 * 1024:
             return jsonify({'error': 'File size must be ≤ 10MB'}), 400
         
-        data = parse_jd(f.stream, f.filename)
+        data = _parse_cached('jd', f.read(), f.filename, parse_jd)
         return jsonify(data), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-@app.post('/api/jobs')
+@api.post('/api/parse-jobs')
+def submit_parse_job():
+    """Nhận file CV/JD để parse nền: form {file, kind: 'resume'|'jd'} -> 202 {id, status}"""
+    kind = request.form.get('kind', 'resume')
+    if kind not in PARSE_EXTS:
+        return jsonify({'error': "kind phải là 'resume' hoặc 'jd'"}), 400
+    f = request.files.get('file')
+    if not f or not f.filename:
+        return jsonify({'error': 'Thiếu file'}), 400
+    ext = os.path.splitext(f.filename)[1].lower()
+    if ext not in PARSE_EXTS[kind]:
+        return jsonify({'error': 'Chỉ nhận ' + '/'.join(sorted(e[1:].upper() for e in PARSE_EXTS[kind]))}), 400
+    data = f.read(MAX_PARSE_BYTES + 1)
+    if len(data) > MAX_PARSE_BYTES:
+        return jsonify({'error': 'File size must be ≤ 10MB'}), 400
+    try:
+        job_id = parse_queue.submit(kind, data, f.filename)
+    except ParseQueueFull:
+        return jsonify({'error': 'Hệ thống đang bận, thử lại sau'}), 503, {'Retry-After': '2'}
+    return jsonify({'id': job_id, 'status': 'queued'}), 202, {'Location': f'/api/parse-jobs/{job_id}'}
+
+
+@api.get('/api/parse-jobs/<job_id>')
+def get_parse_job(job_id):
+    """Trạng thái job parse: queued | running | done (kèm result) | failed (kèm error)"""
+    job = parse_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Not found'}), 404
+    return jsonify(job)
+
+
+@api.get('/api/parse-cache/stats')
+def parse_cache_stats():
+    """Hit rate của cache parse (đếm trong process này) + số entry/dung lượng trên đĩa"""
+    if parse_cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **parse_cache.stats()})
+
+
+@api.post('/api/jobs')
 def create_job():
     try:
-        j = request.get_json() or {}
-        job = JobPosting(
-            company=j.get('company', ''),
-            title=j.get('title', ''),
-            description=j.get('description', ''),
-            summary=j.get('summary', ''),
-            responsibilities=json.dumps(j.get('responsibilities', []), ensure_ascii=False),
-            requirements=json.dumps(j.get('requirements', []), ensure_ascii=False),
-            skills=json.dumps(j.get('skills', []), ensure_ascii=False),
-            location=j.get('location', ''),
-            employment_type=j.get('employment_type', ''),
-            salary=j.get('salary', ''),
-            languages=json.dumps(j.get('languages', []), ensure_ascii=False),
-        )
+        job = _job_from_dict(request.get_json() or {})
         db.session.add(job)
         db.session.commit()
         return jsonify({'id': job.id}), 201
@@ -192,15 +368,94 @@ def create_job():
         return jsonify({'error': str(e)}), 500
 
 
-@app.get('/api/jobs/<int:id>')
+def _job_from_dict(j):
+    return JobPosting(
+        company=j.get('company', ''),
+        title=j.get('title', ''),
+        description=j.get('description', ''),
+        summary=j.get('summary', ''),
+        responsibilities=j.get('responsibilities', []),
+        requirements=j.get('requirements', []),
+        skills=j.get('skills', []),
+        location=j.get('location', ''),
+        employment_type=j.get('employment_type', ''),
+        salary=j.get('salary', ''),
+        languages=j.get('languages', []),
+    )
+
+
+def _ndjson(obj):
+    return current_app.json.dumps(obj) + '\n'
+
+
+@api.post('/api/jobs/bulk-import')
+def bulk_import_jobs():
+    """Import nhiều JD: multipart `files` (PDF/DOC/DOCX/TXT và/hoặc .zip).
+    Trả NDJSON: 1 dòng / file ngay khi parse xong, dòng cuối {"done": true, ...}
+    sau khi insert tất cả job trong 1 transaction."""
+    if (request.content_length or 0) > BULK_MAX_REQUEST_BYTES:
+        return jsonify({'error': 'Tổng dung lượng vượt giới hạn'}), 413
+    storages = request.files.getlist('files') + request.files.getlist('file')
+    if not storages:
+        return jsonify({'error': 'Thiếu file'}), 400
+    try:
+        files, rejected = collect_files(storages)
+    except BulkImportError as e:
+        return jsonify({'error': str(e)}), 400
+    if not files and not rejected:
+        return jsonify({'error': 'Không có file JD nào'}), 400
+
+    def generate():
+        for name, reason in rejected:
+            yield _ndjson({'file': name, 'status': 'rejected', 'error': reason})
+        parsed = []
+        for name, result, error in parse_queue.parse_many('jd', files):
+            if error:
+                yield _ndjson({'file': name, 'status': 'failed', 'error': error})
+            else:
+                parsed.append((name, result))
+                yield _ndjson({'file': name, 'status': 'parsed', 'title': result.get('title', '')})
+
+        summary = {'done': True, 'inserted': 0, 'failed': len(rejected) + len(files) - len(parsed),
+                   'rolled_back': 0, 'jobs': []}
+        if parsed:
+            jobs = [_job_from_dict(result) for _, result in parsed]
+            try:
+                db.session.add_all(jobs)
+                db.session.flush()  # INSERT theo lô (executemany) cho job + job_tag
+                summary['jobs'] = [{'file': name, 'id': job.id} for (name, _), job in zip(parsed, jobs)]
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.exception('Bulk import insert failed')
+                # failed giữ nguyên = số file lỗi parse; file parse được nhưng không lưu -> rolled_back
+                summary.update(jobs=[], rolled_back=len(parsed), error=str(e))
+            else:
+                summary['inserted'] = len(jobs)
+        yield _ndjson(summary)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.get('/api/job-postings')
+def list_job_postings():
+    """Job HR đã đăng theo skill/ngôn ngữ: ?skill=Python&language=English"""
+    return _tag_filtered(JobPosting)
+
+
+@api.get('/api/jobs/<int:id>')
 def get_job(id):
-    job = db.session.get(JobPosting, id)
-    if not job:
+    stamp = _row_stamp(JobPosting, id)
+    if stamp is None:
         return jsonify({'error': 'Not found'}), 404
-    return jsonify(job.to_dict()), 200
+    return conditional_json(
+        etag_for('job', id, stamp.isoformat()),
+        lambda: JobPosting.row_json(db.session.execute(JobPosting.select_json().where(JobPosting.id == id)).one()),
+        last_modified=stamp, cache=response_cache, key=('job', id),
+    )
 
 
-@app.put('/api/jobs/<int:id>')
+@api.put('/api/jobs/<int:id>')
 def update_job(id):
     job = db.session.get(JobPosting, id)
     if not job:
@@ -218,11 +473,11 @@ def update_job(id):
         if 'summary' in j:
             job.summary = j['summary']
         if 'responsibilities' in j:
-            job.responsibilities = json.dumps(j['responsibilities'], ensure_ascii=False)
+            job.responsibilities = j['responsibilities']
         if 'requirements' in j:
-            job.requirements = json.dumps(j['requirements'], ensure_ascii=False)
+            job.requirements = j['requirements']
         if 'skills' in j:
-            job.skills = json.dumps(j['skills'], ensure_ascii=False)
+            job.skills = j['skills']
         if 'location' in j:
             job.location = j['location']
         if 'employment_type' in j:
@@ -230,45 +485,101 @@ def update_job(id):
         if 'salary' in j:
             job.salary = j['salary']
         if 'languages' in j:
-            job.languages = json.dumps(j['languages'], ensure_ascii=False)
+            job.languages = j['languages']
         
         db.session.commit()
+        response_cache.invalidate(('job', id))
         return jsonify(job.to_dict()), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
-@app.get('/api/jobs')
+@api.get('/api/jobs')
 def api_jobs():
-    """Trả danh sách job để quẹt: ?offset=0&limit=20"""
+    """Trả danh sách job để quẹt: ?offset=0&limit=20 (hoặc ?cursor=<nextCursor>).
+
+    Có ?candidate_id= thì bỏ các job ứng viên đã quẹt và xếp theo độ khớp hồ sơ."""
     try:
-        offset = int(request.args.get("offset", 0))
+        offset = int(request.args.get("cursor", request.args.get("offset", 0)))
         limit = min(int(request.args.get("limit", 20)), 50)
+        cand_id = request.args.get("candidate_id")
+        cand_id = int(cand_id) if cand_id else None
     except:
         return {"error": "offset/limit không hợp lệ"}, 400
     
     try:
-        df = get_df()
-        end = min(offset + limit, len(df))
-        rows = [job_row_to_dict(df.iloc[i].to_dict()) for i in range(offset, end)]
-        return {"items": rows, "nextOffset": end if end < len(df) else None}
+        source = get_jobs_source()
+        if cand_id is not None:
+            stamp = _row_stamp(Candidate, cand_id)
+            if stamp is None:
+                return {"error": "Not found"}, 404
+            etag = etag_for('feed', source.version, cand_id, stamp.isoformat(),
+                            *_swipe_stamp(cand_id), offset, limit)
+            return conditional_json(
+                etag, lambda: personalized_page(db.session.get(Candidate, cand_id), offset, limit))
+        return conditional_json(
+            etag_for('feed', source.version, offset, limit),
+            lambda: source.page_json(offset, limit),
+            cache_control=FEED_CACHE_CONTROL,
+        )
     except Exception as e:
         return {"error": f"Lỗi load jobs: {str(e)}"}, 500
 
 
-@app.post('/api/decisions')
+@api.get('/api/jobs/search')
+def api_jobs_search():
+    """Tìm job theo FTS5: ?q=python react&limit=20&offset=0"""
+    q = (request.args.get("q") or "").strip()
+    try:
+        offset = int(request.args.get("offset", 0))
+        limit = min(int(request.args.get("limit", 20)), 50)
+    except:
+        return {"error": "offset/limit không hợp lệ"}, 400
+    if not q:
+        return {"error": "Thiếu q"}, 400
+
+    store = get_store()
+    if store is None:
+        return {"error": "Chưa import jobs DB (python -m utils.jobs_store)"}, 503
+    try:
+        return Response(store.search_json(q, limit, offset), mimetype="application/json")
+    except Exception as e:
+        return {"error": f"Lỗi tìm kiếm: {str(e)}"}, 500
+
+
+def _decision_row(j):
+    """Validate 1 swipe {candidate_id?, job_id, action}; trả dict để insert hoặc None."""
+    if not isinstance(j, dict):
+        return None
+    job_id = str(j.get("job_id", "")).strip()
+    action = j.get("action", "")
+    if not job_id or action not in ("skip", "apply"):
+        return None
+    return {
+        "candidate_id": j.get("candidate_id"),  # có thể None
+        "job_id": job_id,
+        "action": action,
+        "created_at": datetime.utcnow(),
+    }
+
+
+@api.post('/api/decisions')
 def api_decisions():
     """Lưu hành động quẹt: {candidate_id?, job_id, action: 'skip'|'apply'}"""
     try:
-        j = request.get_json() or {}
-        job_id = str(j.get("job_id", "")).strip()
-        action = j.get("action", "")
-        if not job_id or action not in ("skip", "apply"):
+        row = _decision_row(request.get_json() or {})
+        if row is None:
             return {"error": "Thiếu job_id/action"}, 400
-        
-        cand_id = j.get("candidate_id")  # có thể None
-        rec = SwipeDecision(candidate_id=cand_id, job_id=job_id, action=action)
+
+        if DECISION_WRITE_BEHIND:
+            try:
+                decision_writer.submit(row)
+            except QueueFull:
+                return {"error": "Hệ thống đang bận, thử lại sau"}, 503, {"Retry-After": "1"}
+            return {"ok": True, "queued": True}, 202
+
+        rec = SwipeDecision(**row)
         db.session.add(rec)
         db.session.commit()
         return {"ok": True, "id": rec.id}
@@ -277,7 +588,76 @@ def api_decisions():
         return {"error": f"Lỗi lưu decision: {str(e)}"}, 500
 
 
+@api.post('/api/decisions/bulk')
+def api_decisions_bulk():
+    """Lưu nhiều swipe trong 1 transaction: {decisions: [{candidate_id?, job_id, action}, ...]}"""
+    j = request.get_json(silent=True) or {}
+    items = j.get("decisions") if isinstance(j, dict) else j
+    if not isinstance(items, list) or not items:
+        return {"error": "Thiếu decisions"}, 400
+    if len(items) > MAX_BULK_DECISIONS:
+        return {"error": f"Tối đa {MAX_BULK_DECISIONS} decisions / request"}, 400
+
+    rows = []
+    for i, item in enumerate(items):
+        row = _decision_row(item)
+        if row is None:
+            return {"error": f"decisions[{i}]: thiếu job_id/action"}, 400
+        rows.append(row)
+    try:
+        insert_decisions(rows)
+        return {"ok": True, "count": len(rows)}
+    except Exception as e:
+        db.session.rollback()
+        return {"error": f"Lỗi lưu decision: {str(e)}"}, 500
+
+
+@api.get('/api/health')
+def health():
+    """Kiểm tra sống cho load balancer / warm-up: DB trả lời được và feed đã nạp"""
+    db.session.execute(db.select(1))
+    return {"status": "ok", "jobs": len(get_jobs_source())}
+
+
+def preload_shared_state():
+    """Dựng feed/kho job + TF-IDF index 1 lần; gọi ở master trước khi fork để
+    các worker dùng chung bộ nhớ (copy-on-write) thay vì mỗi process tự nạp."""
+    get_ranker()  # kéo theo get_jobs_source()
+
+
+WARMUP_PATHS = ('/api/health', '/api/jobs?limit=1')
+
+
+def warm_up(app):
+    """Gọi thử vài endpoint qua test client; raise nếu có endpoint không trả 200."""
+    with app.test_client() as c:
+        for path in WARMUP_PATHS:
+            r = c.get(path)
+            if r.status_code != 200:
+                raise RuntimeError(f'Warm-up {path} -> {r.status_code}: {r.get_data(as_text=True)[:200]}')
+
+
+def create_app(config=None, preload=False):
+    """App factory (`flask --app app run`, serve.py). preload=True nạp sẵn feed/index
+    và warm-up trước khi trả app."""
+    app = Flask(__name__, static_url_path='', static_folder='.')
+    # upload lớn nhất là bulk import; werkzeug trả 413 khi body vượt (kể cả chunked)
+    app.config['MAX_CONTENT_LENGTH'] = BULK_MAX_REQUEST_BYTES
+    app.config.update(config or {})
+    app.json = FastJSONProvider(app)
+    CORS(app)
+    if compressor is not None:
+        compressor.init_app(app)
+    init_db(app)
+    decision_writer.init_app(app)
+    app.register_blueprint(api)
+    if preload:
+        preload_shared_state()
+        warm_up(app)
+    return app
+
+
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    create_app().run(host='127.0.0.1', port=5000, debug=True)
 
 
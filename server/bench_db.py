@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite: cấu hình mặc định vs SQLITE_PRAGMAS + index composite của db.py
+Usage: python bench_db.py [--seconds 5] [--writers 2] [--readers 4] [--rows 50000]
+"""
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+from db import SQLITE_PRAGMAS, MIGRATIONS, apply_sqlite_pragmas
+
+SCHEMA = '''
+CREATE TABLE swipe_decision (
+    id INTEGER PRIMARY KEY, candidate_id INTEGER, job_id VARCHAR(80),
+    action VARCHAR(10), created_at DATETIME
+);
+CREATE INDEX ix_swipe_decision_job_id ON swipe_decision (job_id);
+'''
+
+
+def _connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    apply_sqlite_pragmas(conn, pragmas)
+    return conn
+
+
+def _setup(path, pragmas, rows, tuned):
+    conn = _connect(path, pragmas)
+    conn.executescript(SCHEMA)
+    rnd = random.Random(0)
+    conn.executemany(
+        'INSERT INTO swipe_decision (candidate_id, job_id, action, created_at) VALUES (?, ?, ?, datetime())',
+        [(rnd.randrange(2000), str(rnd.randrange(100000)), rnd.choice(('skip', 'apply'))) for _ in range(rows)],
+    )
+    if tuned:
+        for version, statements in MIGRATIONS:
+            if version == 1:  # chỉ migration index của swipe_decision
+                for sql in statements:
+                    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def run(label, pragmas, tuned, seconds, writers, readers, rows):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    os.remove(path)
+    _setup(path, pragmas, rows, tuned)
+
+    stop = time.monotonic() + seconds
+    counts = {'write': 0, 'read': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def writer(seed):
+        conn = _connect(path, pragmas)
+        rnd = random.Random(seed)
+        n = 0
+        while time.monotonic() < stop:
+            try:
+                conn.execute(
+                    'INSERT INTO swipe_decision (candidate_id, job_id, action, created_at) VALUES (?, ?, ?, datetime())',
+                    (rnd.randrange(2000), str(rnd.randrange(100000)), 'skip'),
+                )
+                conn.commit()  # 1 commit / swipe như /api/decisions
+                n += 1
+            except sqlite3.OperationalError:
+                with lock:
+                    counts['errors'] += 1
+        with lock:
+            counts['write'] += n
+
+    def reader(seed):
+        conn = _connect(path, pragmas)
+        rnd = random.Random(seed)
+        n = 0
+        while time.monotonic() < stop:
+            try:
+                conn.execute('SELECT job_id FROM swipe_decision WHERE candidate_id = ?',
+                             (rnd.randrange(2000),)).fetchall()
+                n += 1
+            except sqlite3.OperationalError:
+                with lock:
+                    counts['errors'] += 1
+        with lock:
+            counts['read'] += n
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(100 + i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    print(f"{label:<10} writes/s={counts['write'] / seconds:>9.0f}  "
+          f"reads/s={counts['read'] / seconds:>9.0f}  errors={counts['errors']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description='SQLite read/write throughput benchmark')
+    ap.add_argument('--seconds', type=float, default=5)
+    ap.add_argument('--writers', type=int, default=2)
+    ap.add_argument('--readers', type=int, default=4)
+    ap.add_argument('--rows', type=int, default=50000)
+    args = ap.parse_args()
+
+    run('default', {'busy_timeout': 30000}, False, args.seconds, args.writers, args.readers, args.rows)
+    run('tuned', SQLITE_PRAGMAS, True, args.seconds, args.writers, args.readers, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark parser CV/JD trên 1 thư mục file mẫu (PDF/DOCX/TXT)
+Usage: python bench_parsers.py [folder] [--kind resume|jd] [--repeat 20]
+"""
+import time
+import argparse
+from pathlib import Path
+
+from utils import parse_resume, parse_jd
+
+EXTS = {
+    'resume': {'.pdf', '.doc', '.docx'},
+    'jd': {'.pdf', '.doc', '.docx', '.txt'},
+}
+
+
+def _best_ms(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def _read_text(mod, data, ext):
+    if ext == '.pdf':
+        return mod._read_pdf(data)[0]
+    if ext in ('.doc', '.docx'):
+        return mod._read_docx(data)[0]
+    return parse_jd._read_txt(data)[0]
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Resume/JD parser benchmark')
+    ap.add_argument('folder', nargs='?', default=str(Path(__file__).parent / 'test'))
+    ap.add_argument('--kind', choices=sorted(EXTS), default='resume')
+    ap.add_argument('--repeat', type=int, default=20)
+    args = ap.parse_args()
+
+    mod = parse_resume if args.kind == 'resume' else parse_jd
+    parse = mod.extract_profile if args.kind == 'resume' else mod.parse_jd
+    files = sorted(p for p in Path(args.folder).iterdir() if p.suffix.lower() in EXTS[args.kind])
+    if not files:
+        raise SystemExit(f'Không có file {"/".join(sorted(EXTS[args.kind]))} trong {args.folder}')
+
+    print(f"{'file':<40} {'KB':>7} {'read ms':>9} {'sections ms':>12} {'total ms':>9}")
+    totals = [0.0, 0.0, 0.0]
+    for path in files:
+        data = path.read_bytes()
+        ext = path.suffix.lower()
+        text = _read_text(mod, data, ext)
+        row = [
+            _best_ms(lambda: _read_text(mod, data, ext), args.repeat),
+            _best_ms(lambda: mod.split_sections(text), args.repeat),
+            _best_ms(lambda: parse(data, path.name), args.repeat),
+        ]
+        totals = [a + b for a, b in zip(totals, row)]
+        print(f"{path.name[:40]:<40} {len(data) / 1024:>7.0f} {row[0]:>9.2f} {row[1]:>12.3f} {row[2]:>9.2f}")
+    print(f"{'TOTAL (' + str(len(files)) + ' files)':<40} {'':>7} {totals[0]:>9.2f} {totals[1]:>12.3f} {totals[2]:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
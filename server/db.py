@@ -1,13 +1,124 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
 
+def norm_tag(value) -> str:
+    """Dạng chuẩn để so khớp tag (value_norm). Dùng cả trong migration qua hàm SQL
+    norm_tag(): lower() của SQLite chỉ hạ chữ ASCII, tag tiếng Việt sẽ lệch."""
+    return str(value).strip().lower()
+
+# Áp cho mỗi connection SQLite mới; ghi đè qua app.config['SQLITE_PRAGMAS']
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',          # reader không chặn writer
+    'synchronous': 'NORMAL',        # an toàn với WAL, bớt fsync mỗi commit
+    'busy_timeout': 5000,           # ms chờ lock thay vì lỗi "database is locked"
+    'cache_size': -64000,           # ~64MB page cache / connection
+    'mmap_size': 268435456,         # 256MB đọc qua mmap
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+# Cột list lưu JSON text (JSONList)
+LIST_COLUMNS = (
+    ('job_posting', ('responsibilities', 'requirements', 'skills', 'languages')),
+    ('candidate', ('languages',)),
+)
+
+# (user_version, câu lệnh) — chạy tuần tự 1 lần cho DB cũ; create_all không thêm index cho bảng có sẵn
+MIGRATIONS = [
+    (1, [
+        'CREATE INDEX IF NOT EXISTS ix_swipe_decision_candidate_job ON swipe_decision (candidate_id, job_id)',
+        'CREATE INDEX IF NOT EXISTS ix_swipe_decision_job_action ON swipe_decision (job_id, action)',
+        # đã có prefix trong ix_swipe_decision_candidate_job
+        'DROP INDEX IF EXISTS ix_swipe_decision_candidate_id',
+    ]),
+    # Tách skills/languages (JSON text) sang bảng tag có index
+    (2, [
+        "INSERT INTO job_tag (job_id, kind, value, value_norm, position) "
+        "SELECT j.id, 'skill', e.value, norm_tag(e.value), e.key "
+        "FROM job_posting j, json_each(j.skills) e "
+        "WHERE json_valid(j.skills) AND json_type(j.skills) = 'array' AND norm_tag(e.value) <> ''",
+        "INSERT INTO job_tag (job_id, kind, value, value_norm, position) "
+        "SELECT j.id, 'language', e.value, norm_tag(e.value), 1000 + e.key "
+        "FROM job_posting j, json_each(j.languages) e "
+        "WHERE json_valid(j.languages) AND json_type(j.languages) = 'array' AND norm_tag(e.value) <> ''",
+        "INSERT INTO candidate_tag (candidate_id, kind, value, value_norm, position) "
+        "SELECT c.id, 'language', e.value, norm_tag(e.value), e.key "
+        "FROM candidate c, json_each(c.languages) e "
+        "WHERE json_valid(c.languages) AND json_type(c.languages) = 'array' AND norm_tag(e.value) <> ''",
+        "INSERT INTO candidate_tag (candidate_id, kind, value, value_norm, position) "
+        "SELECT id, 'skill', skill1, norm_tag(skill1), 1000 FROM candidate WHERE norm_tag(coalesce(skill1, '')) <> ''",
+        "INSERT INTO candidate_tag (candidate_id, kind, value, value_norm, position) "
+        "SELECT id, 'skill', skill2, norm_tag(skill2), 1001 FROM candidate WHERE norm_tag(coalesce(skill2, '')) <> ''",
+    ]),
+    # value_norm theo Python (Unicode) cho DB đã chạy migration 2 bản cũ (lower() ASCII);
+    # list cũ không phải mảng JSON -> mảng 1 phần tử (không bỏ dữ liệu), NULL/rỗng -> '[]',
+    # để đường đọc ghép nguyên text mà không phải json.loads; rồi bù tag cho các dòng vừa đổi
+    (3, [
+        "UPDATE job_tag SET value_norm = norm_tag(value) WHERE value_norm <> norm_tag(value)",
+        "UPDATE candidate_tag SET value_norm = norm_tag(value) WHERE value_norm <> norm_tag(value)",
+    ] + [
+        sql.format(table=table, col=col)
+        for table, cols in LIST_COLUMNS
+        for col in cols
+        for sql in (
+            "UPDATE {table} SET {col} = '[]' WHERE {col} IS NULL OR trim({col}) = ''",
+            # JSON hợp lệ nhưng không phải mảng ("Python", 3, {...}) -> [giá trị]
+            "UPDATE {table} SET {col} = json_array(json({col})) "
+            "WHERE json_valid({col}) AND json_type({col}) <> 'array'",
+            # text thường ("Python, Java") -> ["Python, Java"]
+            "UPDATE {table} SET {col} = json_array({col}) WHERE NOT json_valid({col})",
+        )
+    ] + [
+        f"INSERT INTO {tag} ({fk}, kind, value, value_norm, position) "
+        f"SELECT t.id, '{kind}', e.value, norm_tag(e.value), {offset} + e.key "
+        f"FROM {table} t, json_each(t.{col}) e "
+        f"WHERE norm_tag(e.value) <> '' AND NOT EXISTS "
+        f"(SELECT 1 FROM {tag} g WHERE g.{fk} = t.id AND g.kind = '{kind}')"
+        for tag, fk, table, col, kind, offset in (
+            ('job_tag', 'job_id', 'job_posting', 'skills', 'skill', 0),
+            ('job_tag', 'job_id', 'job_posting', 'languages', 'language', 1000),
+            ('candidate_tag', 'candidate_id', 'candidate', 'languages', 'language', 0),
+        )
+    ]),
+]
+
+
+def apply_sqlite_pragmas(dbapi_conn, pragmas=None):
+    cur = dbapi_conn.cursor()
+    for k, v in (SQLITE_PRAGMAS if pragmas is None else pragmas).items():
+        cur.execute(f'PRAGMA {k}={v}')
+    cur.close()
+
+
+def run_migrations(conn):
+    """Áp các migration có version > PRAGMA user_version."""
+    current = conn.exec_driver_sql('PRAGMA user_version').scalar() or 0
+    conn.connection.driver_connection.create_function('norm_tag', 1, norm_tag, deterministic=True)
+    for version, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        for sql in statements:
+            conn.exec_driver_sql(sql)
+        conn.exec_driver_sql(f'PRAGMA user_version={version}')
+        current = version
+    return current
+
+
 def init_db(app):
     app.config.setdefault('SQLALCHEMY_DATABASE_URI', 'sqlite:///app.db')
     app.config.setdefault('SQLALCHEMY_TRACK_MODIFICATIONS', False)
+    pragmas = app.config.get('SQLITE_PRAGMAS', SQLITE_PRAGMAS)
     db.init_app(app)
+    import models  # noqa: F401  (đăng ký bảng trước create_all/migration)
     with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', lambda c, _r: apply_sqlite_pragmas(c, pragmas))
+            engine.dispose()  # connection đã mở trước listener sẽ được tạo lại
         db.create_all()
-
-
+        if engine.dialect.name == 'sqlite':
+            with engine.begin() as conn:
+                run_migrations(conn)
@@ -40,8 +40,8 @@ def main():
                 f.seek(0)  # Reset file pointer
                 profile = extract_profile(f, args.file_path)
                 for key, value in profile.items():
-                    if key == 'avatar_data_url':
-                        print(f"{key}: [AVATAR DATA]")
+                    if key == 'avatar_url':
+                        print(f"{key}: [AVATAR] {value}")
                     else:
                         print(f"{key}: {value}")
             else:
@@ -49,8 +49,8 @@ def main():
                 profile = extract_profile(f, args.file_path)
                 print("=== EXTRACTED PROFILE ===")
                 for key, value in profile.items():
-                    if key == 'avatar_data_url':
-                        print(f"{key}: [AVATAR DATA]")
+                    if key == 'avatar_url':
+                        print(f"{key}: [AVATAR] {value}")
                     else:
                         print(f"{key}: {value}")
                         
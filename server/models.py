@@ -1,12 +1,90 @@
+import json
 from datetime import datetime
-from db import db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.types import TypeDecorator
+from db import db, norm_tag
+from utils.avatar import thumb_path
+
+
+def as_list(value) -> list:
+    """Giá trị cột list từ client: list/tuple giữ nguyên, 1 chuỗi -> [chuỗi], None -> []."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    raise TypeError(f'Expected a list or a string, got {type(value).__name__}')
+
+
+class JSONList(TypeDecorator):
+    """List lưu dạng JSON text (giữ nguyên format cột cũ). Chỉ decode khi load ORM
+    object (đường ghi); API đọc dùng select_json/row_json, không json.loads."""
+    impl = db.Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(as_list(value), ensure_ascii=False)
+
+    def process_result_value(self, value, dialect):
+        if not value:
+            return []
+        try:
+            v = json.loads(value)
+        except ValueError:
+            return []
+        return v if isinstance(v, list) else []
+
+
+def _raw_json(attr, name):
+    """Cột JSONList đọc nguyên text (luôn là mảng JSON: JSONList ghi, migration 3 dọn dữ liệu cũ)."""
+    return db.type_coerce(attr, db.Text).label(name)
+
+
+def _str(value) -> str:
+    return json.dumps(value or '', ensure_ascii=False)
+
+
+def _json_object(items) -> str:
+    return '{' + ','.join(f'"{k}":{v}' for k, v in items) + '}'
+
+
+class JobTag(db.Model):
+    """Skill/ngôn ngữ của JobPosting, 1 dòng / giá trị để truy vấn qua index."""
+    __table_args__ = (
+        db.Index('ix_job_tag_kind_value', 'kind', 'value_norm', 'job_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_posting.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(16), nullable=False)     # 'skill' | 'language'
+    value = db.Column(db.String(255), nullable=False)
+    value_norm = db.Column(db.String(255), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CandidateTag(db.Model):
+    """Skill/ngôn ngữ của Candidate, 1 dòng / giá trị để truy vấn qua index."""
+    __table_args__ = (
+        db.Index('ix_candidate_tag_kind_value', 'kind', 'value_norm', 'candidate_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidate.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(16), nullable=False)     # 'skill' | 'language'
+    value = db.Column(db.String(255), nullable=False)
+    value_norm = db.Column(db.String(255), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
 
 
 class Candidate(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120))
     degree = db.Column(db.String(255))
-    languages = db.Column(db.Text)  # JSON string
+    languages = db.Column(JSONList)  # JSON string list (+ candidate_tag)
     exp1 = db.Column(db.String(255))
     exp2 = db.Column(db.String(255))
     skill1 = db.Column(db.String(120))
@@ -15,18 +93,57 @@ class Candidate(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    TAG_FIELDS = ('languages', 'skill1', 'skill2')
+    TAG_MODEL = CandidateTag
+
+    def tag_rows(self):
+        # position khớp migration 2: languages theo thứ tự, skill1/skill2 = 1000/1001
+        tags = [('language', i, v) for i, v in enumerate(as_list(self.languages))]
+        tags += [('skill', 1000 + i, v) for i, v in enumerate((self.skill1, self.skill2)) if v]
+        return [{'candidate_id': self.id, 'kind': k, 'value': str(v), 'value_norm': norm_tag(v), 'position': i}
+                for k, i, v in tags if str(v).strip()]
+
+    @classmethod
+    def tag_ids(cls, kind, value):
+        """SELECT id ứng viên có skill/ngôn ngữ `value` (không phân biệt hoa thường)."""
+        return db.select(CandidateTag.candidate_id).where(
+            CandidateTag.kind == kind, CandidateTag.value_norm == norm_tag(value))
+
+    @classmethod
+    def with_tag(cls, kind, value):
+        return cls.query.filter(cls.id.in_(cls.tag_ids(kind, value)))
+
+    @classmethod
+    def select_json(cls):
+        """Các cột cho row_json: list lấy nguyên text JSON, không dựng ORM object."""
+        return db.select(cls.id, cls.name, cls.degree, _raw_json(cls.languages, 'languages'),
+                         cls.exp1, cls.exp2, cls.skill1, cls.skill2, cls.avatar_path)
+
+    @staticmethod
+    def row_json(row) -> str:
+        """JSON giống to_dict() nhưng ghép thẳng text list từ DB (không json.loads)."""
+        avatar = row.avatar_path
+        return _json_object([
+            ('id', row.id), ('name', _str(row.name)), ('degree', _str(row.degree)),
+            ('languages', row.languages or '[]'),
+            ('exp1', _str(row.exp1)), ('exp2', _str(row.exp2)),
+            ('skill1', _str(row.skill1)), ('skill2', _str(row.skill2)),
+            ('avatar_url', _str("/" + avatar if avatar else '')),
+            ('avatar_thumb_url', _str("/" + thumb_path(avatar) if avatar else '')),
+        ])
+
     def to_dict(self):
-        import json
         return {
             'id': self.id,
             'name': self.name or '',
             'degree': self.degree or '',
-            'languages': (json.loads(self.languages) if self.languages else []),
+            'languages': self.languages or [],
             'exp1': self.exp1 or '',
             'exp2': self.exp2 or '',
             'skill1': self.skill1 or '',
             'skill2': self.skill2 or '',
-            'avatar_url': ("/" + self.avatar_path) if self.avatar_path else ''
+            'avatar_url': ("/" + self.avatar_path) if self.avatar_path else '',
+            'avatar_thumb_url': ("/" + thumb_path(self.avatar_path)) if self.avatar_path else '',
         }
 
 
@@ -36,34 +153,102 @@ class JobPosting(db.Model):
     title = db.Column(db.String(160))
     description = db.Column(db.Text)             # JD gộp cuối
     summary = db.Column(db.Text)
-    responsibilities = db.Column(db.Text)        # JSON string list
-    requirements = db.Column(db.Text)            # JSON string list
-    skills = db.Column(db.Text)                  # JSON string list
+    responsibilities = db.Column(JSONList)       # JSON string list
+    requirements = db.Column(JSONList)           # JSON string list
+    skills = db.Column(JSONList)                 # JSON string list (+ job_tag)
     location = db.Column(db.String(160))
     employment_type = db.Column(db.String(60))
     salary = db.Column(db.String(120))
-    languages = db.Column(db.Text)               # JSON string list
+    languages = db.Column(JSONList)              # JSON string list (+ job_tag)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    TAG_FIELDS = ('skills', 'languages')
+    TAG_MODEL = JobTag
+
+    def tag_rows(self):
+        # position khớp migration 2: skills theo thứ tự, languages từ 1000
+        tags = [('skill', i, v) for i, v in enumerate(as_list(self.skills))]
+        tags += [('language', 1000 + i, v) for i, v in enumerate(as_list(self.languages))]
+        return [{'job_id': self.id, 'kind': k, 'value': str(v), 'value_norm': norm_tag(v), 'position': i}
+                for k, i, v in tags if str(v).strip()]
+
+    @classmethod
+    def tag_ids(cls, kind, value):
+        """SELECT id job yêu cầu skill/ngôn ngữ `value` (không phân biệt hoa thường)."""
+        return db.select(JobTag.job_id).where(
+            JobTag.kind == kind, JobTag.value_norm == norm_tag(value))
+
+    @classmethod
+    def with_tag(cls, kind, value):
+        return cls.query.filter(cls.id.in_(cls.tag_ids(kind, value)))
+
+    @classmethod
+    def select_json(cls):
+        """Các cột cho row_json: list lấy nguyên text JSON, không dựng ORM object."""
+        return db.select(
+            cls.id, cls.company, cls.title, cls.description, cls.summary,
+            *(_raw_json(getattr(cls, f), f) for f in ('responsibilities', 'requirements', 'skills', 'languages')),
+            cls.location, cls.employment_type, cls.salary)
+
+    @staticmethod
+    def row_json(row) -> str:
+        """JSON giống to_dict() nhưng ghép thẳng text list từ DB (không json.loads)."""
+        return _json_object([
+            ('id', row.id), ('company', _str(row.company)), ('title', _str(row.title)),
+            ('description', _str(row.description)), ('summary', _str(row.summary)),
+            ('responsibilities', row.responsibilities or '[]'), ('requirements', row.requirements or '[]'),
+            ('skills', row.skills or '[]'), ('location', _str(row.location)),
+            ('employment_type', _str(row.employment_type)), ('salary', _str(row.salary)),
+            ('languages', row.languages or '[]'),
+        ])
+
     def to_dict(self):
-        import json
-        j = lambda s: (json.loads(s) if s else [])
         return {
           "id": self.id, "company": self.company or "", "title": self.title or "",
           "description": self.description or "", "summary": self.summary or "",
-          "responsibilities": j(self.responsibilities),
-          "requirements": j(self.requirements), "skills": j(self.skills),
+          "responsibilities": self.responsibilities or [],
+          "requirements": self.requirements or [], "skills": self.skills or [],
           "location": self.location or "", "employment_type": self.employment_type or "",
-          "salary": self.salary or "", "languages": j(self.languages)
+          "salary": self.salary or "", "languages": self.languages or []
         }
 
 
+@event.listens_for(Session, 'after_flush')
+def _sync_tags(session, flush_context):
+    """Ghi lại bảng tag khi skills/languages của job/ứng viên đổi (sau flush nên đã có id)."""
+    stale, rows = {}, {}
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, (JobPosting, Candidate)):
+            continue
+        tag = obj.TAG_MODEL
+        if obj not in session.new:
+            state = inspect(obj)
+            if not any(state.attrs[f].history.has_changes() for f in obj.TAG_FIELDS):
+                continue
+            stale.setdefault(tag, []).append(obj.id)  # row mới thì chưa có tag cũ để xoá
+        rows.setdefault(tag, []).extend(obj.tag_rows())
+    if not stale and not rows:
+        return
+    # 1 DELETE + 1 INSERT executemany mỗi bảng tag, kể cả khi flush cả lô (bulk import)
+    conn = session.connection()
+    for tag, ids in stale.items():
+        fk = tag.job_id if tag is JobTag else tag.candidate_id
+        conn.execute(db.delete(tag).where(fk.in_(ids)))
+    for tag, batch in rows.items():
+        if batch:
+            conn.execute(db.insert(tag), batch)
+
+
 class SwipeDecision(db.Model):
+    # feed cá nhân: WHERE candidate_id=? -> job_id; thống kê: theo job_id, action
+    __table_args__ = (
+        db.Index('ix_swipe_decision_candidate_job', 'candidate_id', 'job_id'),
+        db.Index('ix_swipe_decision_job_action', 'job_id', 'action'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     candidate_id = db.Column(db.Integer, nullable=True)
     job_id = db.Column(db.String(80), index=True)
     action = db.Column(db.String(10))  # 'skip' | 'apply'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-
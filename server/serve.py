@@ -0,0 +1,78 @@
+"""Chạy server production bằng gunicorn (Linux/macOS): WEB_WORKERS process x WEB_THREADS thread.
+
+App được tạo ở master với preload=True (feed, kho job, TF-IDF index đã nạp và đã
+warm-up) rồi mới fork worker, nên các worker dùng chung bộ nhớ đó.
+
+    python serve.py            # 0.0.0.0:5000
+    HOST=127.0.0.1 PORT=8000 WEB_WORKERS=4 WEB_THREADS=8 python serve.py
+"""
+import gc
+import os
+import logging
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app
+from db import db
+
+logger = logging.getLogger('serve')
+
+
+def default_workers():
+    return min(2 * (os.cpu_count() or 1) + 1, 8)
+
+
+def _post_fork(server, worker):
+    # connection SQLAlchemy mở ở master không được dùng chung giữa các process
+    with server.app.application.app_context():
+        db.engine.dispose(close=False)
+
+
+def _when_ready(server):
+    server.log.info('Ready: %s worker(s) x %s thread(s) on %s',
+                    server.cfg.workers, server.cfg.threads, ','.join(server.cfg.bind))
+
+
+def gunicorn_options():
+    return {
+        'bind': f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}",
+        'workers': int(os.getenv('WEB_WORKERS', default_workers())),
+        'threads': int(os.getenv('WEB_THREADS', '4')),
+        'worker_class': 'gthread',
+        'timeout': int(os.getenv('WEB_TIMEOUT', '60')),
+        'graceful_timeout': 30,
+        'keepalive': 5,
+        'max_requests': int(os.getenv('WEB_MAX_REQUESTS', '0')),
+        'max_requests_jitter': 50,
+        'preload_app': True,
+        'accesslog': os.getenv('ACCESS_LOG') or None,
+        'post_fork': _post_fork,
+        'when_ready': _when_ready,
+    }
+
+
+class Server(BaseApplication):
+    def __init__(self, application, options=None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    app = create_app(preload=True)  # raise nếu warm-up lỗi -> không báo Ready
+    gc.freeze()  # object đã nạp không bị GC chạm tới -> trang nhớ không bị copy sau fork
+    logger.info('Preloaded shared state, starting gunicorn')
+    Server(app, gunicorn_options()).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import os
+os.environ.setdefault('PARSE_CACHE_DB', '')
+
+from app import create_app, decision_writer
+
+
+def test_create_app_preloads_and_warms_up(tmp_path):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}'}, preload=True)
+    assert decision_writer.app is app
+    c = app.test_client()
+    r = c.get('/api/health')
+    assert r.status_code == 200 and r.get_json()['status'] == 'ok'
+    assert c.get('/api/jobs?limit=1').status_code == 200
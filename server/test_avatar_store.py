@@ -0,0 +1,75 @@
+import io
+import os
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+from utils.avatar_store import AvatarProcessor, InvalidImage, AVATAR_SIZES, variant_name, store_image
+from utils.avatar import placeholder_svg, placeholder_url, thumb_path
+
+
+def _upload(fmt='PNG', size=(900, 600), name='me.png'):
+    buf = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buf, fmt)
+    buf.seek(0)
+    return FileStorage(stream=buf, filename=name)
+
+
+def test_upload_makes_square_thumbnails(tmp_path):
+    proc = AvatarProcessor(str(tmp_path), workers=1)
+    name = proc.save_upload(_upload())
+    assert proc.ensure(name)
+    stem = name.split('.')[0]
+    for key, px in AVATAR_SIZES.items():
+        with Image.open(tmp_path / variant_name(stem, key)) as img:
+            assert img.size == (px, px)
+    proc.shutdown()
+    assert not any(p.suffix == '.upload' for p in tmp_path.iterdir())
+    assert thumb_path(f'uploads/avatars/{name}') == f'uploads/avatars/{variant_name(stem, "sm")}'
+
+
+def test_rejects_non_images(tmp_path):
+    proc = AvatarProcessor(str(tmp_path))
+    bogus = FileStorage(stream=io.BytesIO(b'not an image'), filename='x.png')
+    with pytest.raises(InvalidImage):
+        proc.save_upload(bogus)
+    with pytest.raises(InvalidImage):
+        proc.save_upload(_upload(name='x.gif'))
+    assert os.listdir(tmp_path) == []
+
+
+def test_remove_deletes_all_variants(tmp_path):
+    proc = AvatarProcessor(str(tmp_path), workers=1)
+    name = proc.save_upload(_upload('JPEG', name='me.jpg'))
+    proc.remove(f'uploads/avatars/{name}')
+    proc.shutdown()
+    assert os.listdir(tmp_path) == []
+
+
+def test_ensure_resizes_orphan_upload_in_pool(tmp_path):
+    import threading
+    # file gốc do process khác upload: không có future trong process này
+    (tmp_path / 'abc.upload').write_bytes(_upload().stream.read())
+    proc = AvatarProcessor(str(tmp_path), workers=1)
+    threads = []
+    process = proc._process
+    proc._process = lambda stem: (threads.append(threading.current_thread().name), process(stem))
+    assert proc.ensure(variant_name('abc'))
+    assert threads and threads[0].startswith('avatar')
+    assert not proc.is_pending(variant_name('abc'))
+    proc.shutdown()
+
+
+def test_store_image_is_content_addressed(tmp_path):
+    data = _upload().stream.read()
+    name = store_image(data, str(tmp_path))
+    assert store_image(data, str(tmp_path)) == name
+    assert len(os.listdir(tmp_path)) == len(AVATAR_SIZES)
+    with Image.open(tmp_path / name) as img:
+        assert img.size == (AVATAR_SIZES['md'], AVATAR_SIZES['md'])
+    assert store_image(b'not an image', str(tmp_path)) is None
+
+
+def test_placeholder():
+    assert placeholder_url('nguyễn văn') == '/api/avatars/placeholder/NV.svg'
+    assert placeholder_svg('NV') is placeholder_svg('NV')
+    assert b'&lt;' in placeholder_svg('<')
@@ -0,0 +1,61 @@
+import io
+import zipfile
+import pytest
+from werkzeug.datastructures import FileStorage
+from utils import bulk_import
+from utils.bulk_import import collect_files, BulkImportError
+from utils.parse_jobs import ParseJobQueue
+
+JD = b"Company: Acme\nJob Title: Backend Engineer\nRequirements:\n- Python\n- SQL\n"
+
+
+def _zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _fs(name, data):
+    return FileStorage(io.BytesIO(data), filename=name)
+
+
+def test_collect_files_expands_zip_and_rejects():
+    archive = _zip({'jds/a.txt': JD, 'jds/b.xls': b'x', '__MACOSX/jds/._a.txt': b'', 'jds/.DS_Store': b''})
+    files, rejected = collect_files([_fs('batch.zip', archive), _fs('c.txt', JD), _fs('bad.zip', b'nope')])
+    assert [name for name, _ in files] == ['jds/a.txt', 'c.txt']
+    assert [name for name, _ in rejected] == ['jds/b.xls', 'bad.zip']
+
+
+def test_collect_files_limits(monkeypatch):
+    monkeypatch.setattr(bulk_import, 'MAX_FILE_BYTES', 10)
+    files, rejected = collect_files([_fs('big.txt', b'x' * 11), _fs('ok.txt', b'x' * 10)])
+    assert [n for n, _ in files] == ['ok.txt'] and rejected[0][0] == 'big.txt'
+
+    monkeypatch.setattr(bulk_import, 'MAX_TOTAL_BYTES', 100)
+    with pytest.raises(BulkImportError):  # zip quá lớn bị chặn trước khi mở
+        collect_files([_fs('big.zip', _zip({'a.txt': b'x' * 10}) + b'\0' * 100)])
+
+    monkeypatch.setattr(bulk_import, 'MAX_FILES', 2)
+    with pytest.raises(BulkImportError):
+        collect_files([_fs(f'{i}.txt', b'x') for i in range(3)])
+
+
+def test_parse_many_streams_results():
+    q = ParseJobQueue(max_workers=2)
+    results = {name: (result, error) for name, result, error in
+               q.parse_many('jd', [('a.txt', JD), ('b.xls', b'x'), ('c.txt', JD)])}
+    q.shutdown()
+    assert results['a.txt'][0]['title'] and results['c.txt'][1] is None
+    assert results['b.xls'][0] is None and 'Unsupported' in results['b.xls'][1]
+
+
+def test_parse_many_respects_max_pending():
+    q = ParseJobQueue(max_workers=1, max_pending=2)
+    seen = []
+    for name, result, error in q.parse_many('jd', [(f'{i}.txt', JD) for i in range(5)], window=4):
+        seen.append(q._pending())
+        assert error is None
+    q.shutdown()
+    assert len(seen) == 5 and max(seen) <= 2 and q._pending() == 0
@@ -0,0 +1,54 @@
+import gzip
+import pytest
+from flask import Flask
+from utils import compression
+from utils.compression import Compressor
+from utils.http_cache import ResponseCache, conditional_json, FEED_CACHE_CONTROL
+
+BODY = '{"jobs": [' + ','.join(['{"title": "Backend Engineer"}'] * 100) + ']}'
+
+
+def _app(compressor, calls):
+    app = Flask(__name__)
+    compressor.init_app(app)
+
+    @app.get('/page')
+    def page():
+        calls.append(1)
+        return conditional_json('v1', lambda: BODY, cache_control=FEED_CACHE_CONTROL)
+
+    @app.get('/small')
+    def small():
+        return {'ok': True}
+    return app
+
+
+def test_gzip_negotiation_threshold_and_etag():
+    c = _app(Compressor(min_size=100), []).test_client()
+    r = c.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert r.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in r.headers['Vary']
+    assert gzip.decompress(r.data).decode() == BODY
+    assert r.headers['ETag'] == 'W/"v1"'
+    assert c.get('/page', headers={'Accept-Encoding': 'gzip', 'If-None-Match': r.headers['ETag']}).status_code == 304
+
+    assert 'Content-Encoding' not in c.get('/page').headers  # client không gửi Accept-Encoding
+    assert 'Content-Encoding' not in c.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in c.get('/page', headers={'Accept-Encoding': 'gzip;q=0'}).headers
+
+
+def test_compressed_feed_page_is_cached():
+    cache = ResponseCache()
+    c = _app(Compressor(min_size=100, cache=cache), []).test_client()
+    first = c.get('/page', headers={'Accept-Encoding': 'gzip'}).data
+    assert c.get('/page', headers={'Accept-Encoding': 'gzip'}).data == first
+    assert cache.hits == 1 and len(cache) == 1
+
+
+@pytest.mark.skipif(compression.brotli is None, reason='brotli not installed')
+def test_brotli_preferred():
+    c = _app(Compressor(min_size=100), []).test_client()
+    r = c.get('/page', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert r.headers['Content-Encoding'] == 'br'
+    assert compression.brotli.decompress(r.data).decode() == BODY
+    r = c.get('/page', headers={'Accept-Encoding': 'gzip, br;q=0.5'})
+    assert r.headers['Content-Encoding'] == 'gzip'
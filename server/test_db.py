@@ -0,0 +1,98 @@
+import json
+import sqlite3
+from flask import Flask
+from db import init_db, db, MIGRATIONS
+
+
+def test_init_db_tunes_sqlite_and_migrates_legacy_db(tmp_path):
+    path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE swipe_decision (id INTEGER PRIMARY KEY, candidate_id INTEGER,
+            job_id VARCHAR(80), action VARCHAR(10), created_at DATETIME);
+        CREATE INDEX ix_swipe_decision_job_id ON swipe_decision (job_id);
+    ''')
+    conn.close()
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    init_db(app)
+    with app.app_context():
+        c = db.session.connection()
+        assert c.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+        assert c.exec_driver_sql('PRAGMA user_version').scalar() == MIGRATIONS[-1][0]
+        plan = c.exec_driver_sql(
+            'EXPLAIN QUERY PLAN SELECT job_id FROM swipe_decision WHERE candidate_id = 1').fetchall()
+        assert 'ix_swipe_decision_candidate_job' in plan[0][-1]
+
+
+def test_migration_backfills_tags_and_queries_use_them(tmp_path):
+    path = tmp_path / 'legacy.db'
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE job_posting (id INTEGER PRIMARY KEY, company VARCHAR(160), title VARCHAR(160),
+            description TEXT, summary TEXT, responsibilities TEXT, requirements TEXT, skills TEXT,
+            location VARCHAR(160), employment_type VARCHAR(60), salary VARCHAR(120), languages TEXT,
+            created_at DATETIME, updated_at DATETIME);
+        INSERT INTO job_posting (id, title, skills, languages, requirements)
+            VALUES (1, 'Dev', '["Python", "Docker"]', '["English", "TIẾNG VIỆT"]', '["3y"]'), (2, 'PM', '', NULL, 'oops'),
+                   (3, 'QA', '"Python"', 'English, French', NULL);
+    ''')
+    conn.close()
+
+    from models import JobPosting
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    init_db(app)
+    with app.app_context():
+        assert [j.id for j in JobPosting.with_tag('skill', ' PYTHON ')] == [1, 3]
+        assert [j.id for j in JobPosting.with_tag('language', 'english')] == [1]
+        # migration chuẩn hoá bằng Python nên khớp cả chữ hoa tiếng Việt
+        assert [j.id for j in JobPosting.with_tag('language', 'tiếng việt')] == [1]
+        # đường đọc ghép nguyên text JSON từ DB, kết quả giống to_dict()
+        for jid in (1, 2, 3):
+            row = db.session.execute(JobPosting.select_json().where(JobPosting.id == jid)).one()
+            assert json.loads(JobPosting.row_json(row)) == db.session.get(JobPosting, jid).to_dict()
+        job = db.session.get(JobPosting, 1)
+        assert job.to_dict()['requirements'] == ['3y']
+        assert db.session.get(JobPosting, 2).to_dict()['skills'] == []
+        # dữ liệu cũ không phải mảng JSON được giữ lại thành mảng 1 phần tử
+        assert db.session.get(JobPosting, 2).to_dict()['requirements'] == ['oops']
+        legacy = db.session.get(JobPosting, 3).to_dict()
+        assert legacy['skills'] == ['Python'] and legacy['languages'] == ['English, French']
+        assert legacy['requirements'] == []
+        assert [j.id for j in JobPosting.with_tag('language', 'english, french')] == [3]
+
+        job.skills = ['Go']
+        db.session.commit()
+        assert [j.id for j in JobPosting.with_tag('skill', 'python')] == [3]
+        assert [j.id for j in JobPosting.with_tag('skill', 'go')] == [1]
+
+        # flush cả lô (bulk import): tag của mọi job mới đều được ghi
+        db.session.add_all([JobPosting(title='A', skills=['Rust']), JobPosting(title='B', skills=['rust', 'Go'])])
+        db.session.commit()
+        assert JobPosting.with_tag('skill', 'rust').count() == 2
+        assert JobPosting.with_tag('skill', 'go').count() == 2
+
+        from models import Candidate
+        cand = Candidate(name='Lan', languages=['Tiếng Anh'], skill1='SQL', avatar_path='uploads/avatars/a.webp')
+        db.session.add(cand)
+        db.session.commit()
+        row = db.session.execute(Candidate.select_json().where(Candidate.id == cand.id)).one()
+        assert json.loads(Candidate.row_json(row)) == cand.to_dict()
+        assert [c.id for c in Candidate.with_tag('language', 'TIẾNG ANH')] == [cand.id]
+
+
+def test_string_list_payload_is_one_tag(tmp_path):
+    from app import create_app
+    from models import JobPosting
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}'})
+    c = app.test_client()
+    r = c.post('/api/jobs', json={'title': 'Dev', 'skills': 'Python, Java', 'languages': ['English']})
+    assert r.status_code == 201
+    job_id = r.get_json()['id']
+    assert c.get(f'/api/jobs/{job_id}').get_json()['skills'] == ['Python, Java']
+    with app.app_context():
+        assert [j.id for j in JobPosting.with_tag('skill', 'python, java')] == [job_id]
+        assert JobPosting.with_tag('skill', 'p').count() == 0
+    assert c.post('/api/jobs', json={'title': 'Dev', 'skills': {'a': 1}}).status_code == 500
@@ -0,0 +1,37 @@
+from datetime import datetime
+import pytest
+from flask import Flask
+from db import init_db
+from models import SwipeDecision
+from utils.decision_queue import DecisionWriter, QueueFull
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'q.db'}"
+    init_db(app)
+    return app
+
+
+def _row(i):
+    return {"candidate_id": 1, "job_id": str(i), "action": "skip", "created_at": datetime.utcnow()}
+
+
+def test_writer_flushes_batches_on_close(tmp_path):
+    app = _app(tmp_path)
+    w = DecisionWriter(app, batch_size=3, flush_interval=5)
+    for i in range(7):
+        w.submit(_row(i))
+    w.close()
+    with app.app_context():
+        assert SwipeDecision.query.count() == 7
+    assert w.flushed == 7 and w.dropped == 0
+
+
+def test_writer_back_pressure(tmp_path):
+    app = _app(tmp_path)
+    w = DecisionWriter(app, max_queue=1, put_timeout=0.01)
+    w._ensure_started = lambda: None  # không có consumer -> queue đầy ngay
+    w.submit(_row(0))
+    with pytest.raises(QueueFull):
+        w.submit(_row(1))
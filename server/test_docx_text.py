@@ -0,0 +1,36 @@
+import io
+from docx import Document
+from docx.shared import Inches
+from PIL import Image
+from utils.docx_text import read_docx
+
+
+def _docx(with_picture=True):
+    d = Document()
+    d.sections[0].header.paragraphs[0].text = 'Header'
+    d.sections[0].footer.paragraphs[0].text = 'Footer'
+    d.add_paragraph('Nguyễn Văn A')
+    p = d.add_paragraph('Python\tSQL')
+    p.add_run().add_break()
+    p.add_run('Docker')
+    if with_picture:
+        img = io.BytesIO()
+        Image.new('RGB', (4, 4), 'red').save(img, 'PNG')
+        img.seek(0)
+        d.add_picture(img, width=Inches(1))
+    buf = io.BytesIO()
+    d.save(buf)
+    return buf.getvalue()
+
+
+def test_text_in_header_body_footer_order():
+    text, avatar = read_docx(_docx())
+    assert text == 'Header\n\nNguyễn Văn A\n\nPython\tSQL\nDocker\n\n\n\nFooter'
+    assert avatar.startswith(b'\x89PNG')
+
+
+def test_no_image():
+    _, avatar = read_docx(_docx(with_picture=False))
+    assert avatar is None
+    _, avatar = read_docx(_docx(), with_image=False)
+    assert avatar is None
@@ -0,0 +1,52 @@
+from datetime import datetime
+from flask import Flask
+from utils.http_cache import ResponseCache, conditional_json, etag_for
+
+STAMP = datetime(2024, 5, 1, 12, 0, 0, 123456)
+
+
+def _app(cache, calls):
+    app = Flask(__name__)
+
+    @app.get('/item')
+    def item():
+        def build():
+            calls.append(1)
+            return '{"id": 1}'
+        return conditional_json(etag_for('item', 1, STAMP.isoformat()), build,
+                                last_modified=STAMP, cache=cache, key=('item', 1))
+    return app
+
+
+def test_etag_304_and_cache():
+    cache, calls = ResponseCache(), []
+    c = _app(cache, calls).test_client()
+
+    r = c.get('/item')
+    assert r.status_code == 200 and r.get_json() == {'id': 1}
+    assert r.headers['Cache-Control'] == 'private, no-cache'
+    etag, last_modified = r.headers['ETag'], r.headers['Last-Modified']
+
+    r = c.get('/item', headers={'If-None-Match': etag})
+    assert r.status_code == 304 and r.data == b'' and r.headers['ETag'] == etag
+
+    # Last-Modified bị cắt xuống giây: stamp .123456 có thể là bản sửa sau lần trả đó -> 200
+    assert c.get('/item', headers={'If-Modified-Since': last_modified}).status_code == 200
+    r = c.get('/item', headers={'If-Modified-Since': 'Wed, 01 May 2024 12:00:01 GMT'})
+    assert r.status_code == 304
+
+    # body thứ 2 lấy từ cache, không build lại
+    assert c.get('/item', headers={'If-None-Match': '"other"'}).status_code == 200
+    assert len(calls) == 1 and cache.hits == 2
+
+    cache.invalidate(('item', 1))
+    assert c.get('/item').status_code == 200 and len(calls) == 2
+
+
+def test_cache_ignores_stale_etag_and_evicts():
+    cache = ResponseCache(max_entries=2)
+    cache.put('a', 'v1', 'A')
+    assert cache.get('a', 'v2') is None and cache.get('a', 'v1') == 'A'
+    cache.put('b', 'v1', 'B')
+    cache.put('c', 'v1', 'C')
+    assert len(cache) == 2 and cache.get('a', 'v1') is None
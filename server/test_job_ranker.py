@@ -0,0 +1,54 @@
+from utils.job_ranker import JobRanker, candidate_profile_text
+
+
+def _ranker():
+    ids = ["1", "2", "3", "4"]
+    texts = [
+        "Product Manager\nroadmap stakeholders agile",
+        "Backend Engineer\nJava Spring MySQL",
+        "Data Scientist\nPython SQL machine learning",
+        "UX Designer\nFigma prototyping research",
+    ]
+    return JobRanker(ids, texts, cache_size=2)
+
+
+def test_ranks_by_profile_and_skips_swiped():
+    r = _ranker()
+    profile = candidate_profile_text({"skill1": "Python", "skill2": "machine learning"})
+    positions, nxt = r.page((1, None), profile, set(), 0, 2)
+    assert positions[0] == 2
+    assert nxt == 2
+
+    positions, _ = r.page((1, None), profile, {"3"}, 0, 4)
+    assert 2 not in positions and len(positions) == 3
+
+
+def test_empty_profile_keeps_feed_order_and_cache_is_bounded():
+    r = _ranker()
+    assert r.page((1, None), "", set(), 0, 10) == ([0, 1, 2, 3], None)
+    for cid in range(5):
+        r.scores((cid, None), "java")
+    assert len(r._scores) == 2
+
+
+def test_top_k_matches_full_stable_sort():
+    import numpy as np
+    r = _ranker()
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, 200).astype(np.float32)  # nhiều job đồng điểm
+    r.size = len(scores)
+    full = np.argsort(-scores, kind="stable")
+    for k in (1, 7, 50, 199, 200):
+        assert list(r.top(scores, k)) == list(full[:k])
+
+
+def test_from_source_streams_truncated_texts():
+    class Source:
+        def iter_ranking_texts(self, max_chars=None):
+            for i, text in enumerate(["python " * 10, "java " * 10]):
+                yield str(i), text[:max_chars]
+
+    r = JobRanker.from_source(Source(), max_chars=12)
+    assert r.size == 2 and r.position == {"0": 0, "1": 1}
+    positions, _ = r.page((1, None), "java", set(), 0, 1)
+    assert positions == [1]
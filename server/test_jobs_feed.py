@@ -0,0 +1,66 @@
+import json
+import pandas as pd
+from utils.jobs_feed import JobFeed, job_row_to_dict
+
+
+def _df():
+    return pd.DataFrame([
+        {"job_id": str(i), "company_name": f"Co {i}", "job_title": f"Dev {i}", "skills": "Python"}
+        for i in range(5)
+    ])
+
+
+def test_feed_page_matches_row_conversion():
+    df = _df()
+    feed = JobFeed.from_df(df)
+    page = json.loads(feed.page_json(1, 2))
+    assert page["items"] == [job_row_to_dict(df.iloc[i].to_dict()) for i in (1, 2)]
+    assert page["nextOffset"] == 3
+
+
+def test_feed_last_page_has_no_next_offset():
+    feed = JobFeed.from_df(_df())
+    assert json.loads(feed.page_json(4, 20))["nextOffset"] is None
+    assert json.loads(feed.page_json(10, 5)) == {"items": [], "nextOffset": None, "nextCursor": None}
+
+
+def test_load_jobs_df_reuses_snapshot(tmp_path):
+    from utils.jobs_feed import load_jobs_df
+
+    csv = tmp_path / "jobs.csv"
+    csv.write_text("Job Id,Company Name,Job Title,Work Type,Latitude\n1,Acme,Dev,Remote,10.5\n2,,QA,Remote,\n")
+    snap_dir = tmp_path / "snap"
+    df = load_jobs_df(csv, snap_dir)
+    assert "latitude" not in df.columns
+    assert str(df["work_type"].dtype) == "category"
+    assert df.loc[1, "company_name"] == ""
+    snaps = [p for p in snap_dir.iterdir() if p.name.startswith("jobs-v")]
+    assert len(snaps) == 1
+
+    # Cùng nội dung -> đọc snapshot; đổi nội dung -> snapshot mới thay snapshot cũ
+    assert load_jobs_df(csv, snap_dir).equals(df)
+    csv.write_text("Job Id,Company Name,Job Title\n7,Other,PM\n")
+    assert load_jobs_df(csv, snap_dir)["company_name"].tolist() == ["Other"]
+    assert [p for p in snap_dir.iterdir() if p.name.startswith("jobs-v")] != snaps
+
+
+def test_feed_keeps_only_fragments():
+    feed = JobFeed.from_df(_df())
+    assert not hasattr(feed, "cards") and len(feed) == 5
+    assert next(feed.iter_ranking_texts(3)) == ("0", "Dev 0\nKỹ ")
+
+
+def test_snapshots_of_different_csvs_coexist(tmp_path):
+    from utils.jobs_feed import load_jobs_df
+
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    a.write_text("Job Id,Job Title\n1,Dev\n")
+    b.write_text("Job Id,Job Title\n2,QA\n")
+    snap_dir = tmp_path / "snap"
+    load_jobs_df(a, snap_dir)
+    load_jobs_df(b, snap_dir)
+    snaps = sorted(p.name for p in snap_dir.iterdir() if p.name.startswith("jobs-v"))
+    metas = [p for p in snap_dir.iterdir() if p.name.startswith("jobs_snapshot")]
+    assert len(snaps) == 2 and len(metas) == 2
+    load_jobs_df(a, snap_dir)
+    assert sorted(p.name for p in snap_dir.iterdir() if p.name.startswith("jobs-v")) == snaps
@@ -0,0 +1,23 @@
+import json
+from utils.jobs_feed import JobFeed, load_jobs_df
+from utils.jobs_store import JobStore, import_csv, fts_query
+
+
+def test_store_pages_match_in_memory_feed(tmp_path):
+    db = tmp_path / "jobs.db"
+    n = import_csv(db_path=db)
+    store = JobStore(db)
+    feed = JobFeed.from_df(load_jobs_df())
+    assert n == len(store) == len(feed)
+    for offset in (0, 2, n - 1, n + 3):
+        assert json.loads(store.page_json(offset, 2)) == json.loads(feed.page_json(offset, 2))
+
+
+def test_store_search(tmp_path):
+    db = tmp_path / "jobs.db"
+    import_csv(db_path=db)
+    store = JobStore(db)
+    titles = [c["title"] for c in json.loads(store.search_json("pyth", limit=10))["items"]]
+    assert "Data Scientist" in titles
+    assert json.loads(store.search_json('"; DROP TABLE jobs', limit=10))["items"] == []
+    assert fts_query('c++ "x"') == '"c"* "x"*'
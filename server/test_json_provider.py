@@ -0,0 +1,21 @@
+from datetime import datetime
+from decimal import Decimal
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import FastJSONProvider
+
+
+def test_fast_provider_matches_default():
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    app.json = fast = FastJSONProvider(app)
+    obj = {'b': 1, 'a': [1.5, None, True], 'when': datetime(2024, 5, 1, 12, 0), 'price': Decimal('9.5'),
+           'name': 'Nguyễn'}
+    assert fast.loads(fast.dumps(obj)) == default.loads(default.dumps(obj))
+    assert list(fast.loads(fast.dumps({'b': 1, 'a': 2}))) == ['a', 'b']
+    assert fast.dumps({'big': 2 ** 70}) == default.dumps({'big': 2 ** 70})  # orjson không hỗ trợ -> json chuẩn
+
+    with app.test_request_context():
+        r = jsonify(obj)
+        assert r.mimetype == 'application/json' and r.data.endswith(b'\n')
+        assert fast.loads(r.data)['when'] == 'Wed, 01 May 2024 12:00:00 GMT'
@@ -0,0 +1,44 @@
+import time
+from utils.parse_cache import ParseCache, cache_key
+from utils.parse_jobs import ParseJobQueue
+
+JD = b"Job Title: Backend Engineer\nRequirements:\n- Python and SQL experience\n"
+
+
+def test_get_or_parse_hits_and_stats(tmp_path):
+    cache = ParseCache(tmp_path / 'c.db')
+    calls = []
+
+    def parse(data, filename):
+        calls.append(filename)
+        return {'title': data.decode()[:5]}
+
+    assert cache.get_or_parse('jd', JD, 'a.txt', parse) == {'title': 'Job T'}
+    assert cache.get_or_parse('jd', JD, 'renamed.txt', parse) == {'title': 'Job T'}
+    assert calls == ['a.txt']
+    # cùng nội dung nhưng đuôi khác -> parser khác -> key khác
+    assert cache_key('jd', JD, 'a.txt') != cache_key('jd', JD, 'a.pdf')
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+    assert stats['entries'] == 1
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ParseCache(tmp_path / 'c.db', max_bytes=400, touch_interval=0)
+    for i in range(3):
+        cache.put(f'jd:1:.txt:{i}', {'body': 'x' * 100})
+        time.sleep(0.01)
+    cache.get('jd:1:.txt:0')  # 0 vừa được dùng -> 1 bị xoá trước
+    time.sleep(0.01)
+    cache.put('jd:1:.txt:3', {'body': 'x' * 100})
+    assert cache.get('jd:1:.txt:1') is None
+    assert cache.get('jd:1:.txt:0') is not None and cache.get('jd:1:.txt:3') is not None
+
+
+def test_queue_serves_repeat_upload_from_cache(tmp_path):
+    cache = ParseCache(tmp_path / 'c.db')
+    q = ParseJobQueue(max_workers=1, cache=cache)
+    cache.put(cache_key('jd', JD, 'jd.txt'), {'title': 'cached'})
+    job = q.get(q.submit('jd', JD, 'jd.txt'))
+    assert job['status'] == 'done' and job['cached'] and job['result'] == {'title': 'cached'}
+    assert q._pool is None  # không cần khởi động process pool
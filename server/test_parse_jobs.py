@@ -0,0 +1,113 @@
+import os
+import time
+import signal
+
+import pytest
+
+from utils.parse_jobs import ParseJobQueue, ParseJobStore, PARSERS, QueueFull
+
+
+def _slow(data, filename):
+    time.sleep(5)
+
+
+def _stuck(data, filename):
+    # mô phỏng job kẹt trong C code: SIGALRM không cắt được
+    signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(1.5)
+
+
+def _crash(data, filename):
+    os._exit(1)
+
+
+def _wait(q, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = q.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('job did not finish')
+
+
+def test_parse_job_done():
+    q = ParseJobQueue(max_workers=1)
+    jd = b"Company: Acme\nJob Title: Backend Engineer\nRequirements:\n- Python\n- SQL\n"
+    job = _wait(q, q.submit('jd', jd, 'jd.txt'))
+    q.shutdown()
+    assert job['status'] == 'done' and job['kind'] == 'jd'
+    assert 'title' in job['result']
+
+
+def test_parse_job_failure_and_timeout():
+    q = ParseJobQueue(max_workers=1, timeout=0.5, parsers={**PARSERS, 'slow': _slow})
+    bad = _wait(q, q.submit('jd', b'x', 'jd.xls'))
+    assert bad['status'] == 'failed' and 'Unsupported' in bad['error']
+    slow = _wait(q, q.submit('slow', b'', 'x'))
+    assert slow['status'] == 'failed' and slow['error'] == 'timeout'
+    q.shutdown()
+
+
+def test_results_expire_after_ttl():
+    q = ParseJobQueue(max_workers=1, ttl=0.3)
+    job_id = q.submit('jd', b'Job Title: Dev\n', 'jd.txt')
+    assert _wait(q, job_id)['status'] == 'done'
+    time.sleep(0.4)
+    assert q.get(job_id) is None
+    q.shutdown()
+
+
+def test_broken_pool_is_recreated():
+    q = ParseJobQueue(max_workers=1, parsers={**PARSERS, 'crash': _crash})
+    assert _wait(q, q.submit('crash', b'', 'x'))['status'] == 'failed'
+    assert _wait(q, q.submit('jd', b'Job Title: Dev\n', 'jd.txt'))['status'] == 'done'
+    q.shutdown()
+
+
+def test_soft_timeout_keeps_slot_until_worker_frees():
+    q = ParseJobQueue(max_workers=1, max_pending=1, timeout=0.2,
+                      parsers={**PARSERS, 'stuck': _stuck})
+    job = _wait(q, q.submit('stuck', b'', 'x'))
+    assert job['status'] == 'failed' and job['error'] == 'timeout'
+    assert job['started_at'] >= job['created_at']
+    with pytest.raises(QueueFull):
+        q.submit('jd', b'Job Title: Dev\n', 'jd.txt')
+    time.sleep(1.5)
+    assert _wait(q, q.submit('jd', b'Job Title: Dev\n', 'jd.txt'))['status'] == 'done'
+    q.shutdown()
+
+
+def test_concurrent_submits_share_one_pool():
+    from concurrent.futures import ThreadPoolExecutor
+    q = ParseJobQueue(max_workers=1)
+    with ThreadPoolExecutor(8) as ex:
+        pools = set(ex.map(lambda _: id(q._executor()), range(32)))
+    assert len(pools) == 1
+    q.shutdown()
+
+
+def test_job_status_is_shared_between_processes(tmp_path):
+    # 2 queue cùng store = 2 worker gunicorn: POST vào worker này, GET ở worker kia
+    store = tmp_path / 'jobs.db'
+    owner = ParseJobQueue(max_workers=1, store=ParseJobStore(store))
+    other = ParseJobQueue(max_workers=1, store=ParseJobStore(store))
+    job_id = owner.submit('jd', b'Job Title: Dev\n', 'jd.txt')
+    job = _wait(other, job_id)
+    assert job['status'] == 'done' and job['kind'] == 'jd' and 'title' in job['result']
+    assert job['started_at'] >= job['created_at']
+    assert owner._jobs == {}  # kết quả không giữ thêm trong RAM
+    assert other.get('missing') is None
+    owner.shutdown()
+
+
+def test_shared_soft_timeout_from_any_process(tmp_path):
+    store = tmp_path / 'jobs.db'
+    owner = ParseJobQueue(max_workers=1, timeout=0.2, store=ParseJobStore(store),
+                          parsers={**PARSERS, 'stuck': _stuck})
+    other = ParseJobQueue(timeout=0.2, store=ParseJobStore(store))
+    job = _wait(other, owner.submit('stuck', b'', 'x'))
+    assert job['status'] == 'failed' and job['error'] == 'timeout'
+    time.sleep(1.5)
+    assert other.get(job['id'])['error'] == 'timeout'  # kết quả đến muộn không ghi đè
+    owner.shutdown()
@@ -14,6 +14,7 @@ def test_parse_sample_pdf():
     assert isinstance(data.get('experiences'), list) and len(data['experiences']) >= 1
     deg = data.get('degree','')
     assert isinstance(deg, str)
-    assert data.get('avatar_data_url','').startswith('data:image/')
+    assert data.get('avatar_url','').startswith(('/uploads/avatars/', '/api/avatars/placeholder/'))
+    assert 'avatar_data_url' not in data
 
 
@@ -0,0 +1,51 @@
+import io
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+import utils.pdf_text as pdf_text
+from utils.pdf_text import extract_pdf_text
+
+
+def _pdf(lines):
+    w = PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica'),
+    })
+    for line in lines:
+        page = w.add_blank_page(612, 792)
+        page[NameObject('/Resources')] = DictionaryObject(
+            {NameObject('/Font'): DictionaryObject({NameObject('/F1'): font})})
+        content = DecodedStreamObject()
+        content.set_data(f'BT /F1 12 Tf 72 720 Td ({line}) Tj ET'.encode('latin-1'))
+        page[NameObject('/Contents')] = w._add_object(content)
+    buf = io.BytesIO()
+    w.write(buf)
+    return buf.getvalue()
+
+
+PAGES = [f'Page {i}' for i in range(1, 13)]
+
+
+def test_page_cap_and_timing():
+    text, stats = extract_pdf_text(_pdf(PAGES), max_pages=3, workers=1)
+    assert text.split('\n') == PAGES[:3]
+    assert stats['pages_total'] == 12 and stats['pages_read'] == 3
+    assert len(stats['page_ms']) == 3 and stats['stopped_early'] is False
+
+
+def test_early_termination_reads_lookahead_page():
+    text, stats = extract_pdf_text(_pdf(PAGES), max_pages=0, workers=1,
+                                   done=lambda t: 'Page 2' in t)
+    assert text.split('\n') == PAGES[:3] and stats['stopped_early']
+
+
+def test_parallel_keeps_page_order(monkeypatch):
+    monkeypatch.setattr(pdf_text, 'PDF_PARALLEL_MIN_PAGES', 2)
+    data = _pdf(PAGES)
+    text, stats = extract_pdf_text(data, max_pages=0, workers=2)
+    assert stats['parallel'] and text.split('\n') == PAGES
+    pool = pdf_text._pool
+    text, stats = extract_pdf_text(data, max_pages=0, workers=2, done=lambda t: 'Page 4' in t)
+    assert text.split('\n') == PAGES[:5]
+    assert pdf_text._pool is pool  # pool dùng lại giữa các lần gọi, không tạo mới
@@ -0,0 +1,19 @@
+from utils.sections import HeadingMatcher
+from utils.parse_resume import split_sections, _guess_languages, _guess_skills
+
+
+def test_heading_priority_matches_pattern_order():
+    m = HeadingMatcher({'exp': r'(?i)\bexperience\b', 'skill': r'(?i)\bskills?\b'})
+    # heading "skills" đứng trước trong dòng nhưng 'exp' có ưu tiên cao hơn
+    assert m.classify('Skills and experience') == 'exp'
+    assert m.classify('SKILLS') == 'skill'
+    assert m.classify('Python, SQL') is None
+
+
+def test_resume_sections_and_keyword_scan():
+    text = 'JOHN DOE\nEducation\nBSc 2019 - 2023\nSkills\nPython, docker, JavaScript\nLanguages\nEnglish IELTS 7.0, Japanese'
+    sections = split_sections(text)
+    assert list(sections) == ['edu', 'skill', 'lang']
+    assert sections['skill'] == 'Skills\nPython, docker, JavaScript'
+    assert _guess_languages(text) == ['English IELTS 7.0', 'Japanese IELTS 7.0']
+    assert _guess_skills(text) == ['Python', 'Docker']
@@ -1,8 +1,18 @@
-import base64
+import os
+from functools import lru_cache
+from urllib.parse import quote
+from xml.sax.saxutils import escape
 
+PLACEHOLDER_URL = '/api/avatars/placeholder/{}.svg'
 
-def placeholder_avatar(name: str) -> str:
-    initials = ''.join([part[0].upper() for part in (name or 'NA').split()[:2]]) or 'NA'
+
+def initials(name: str) -> str:
+    return ''.join([part[0].upper() for part in (name or 'NA').split()[:2]]) or 'NA'
+
+
+@lru_cache(maxsize=4096)
+def placeholder_svg(initials: str) -> bytes:
+    """SVG avatar cho 1 bộ chữ cái đầu; dựng 1 lần rồi dùng lại."""
     svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256">
   <defs>
     <linearGradient id="g" x1="0" y1="0" x2="1" y2="1">
@@ -11,9 +21,22 @@ def placeholder_avatar(name: str) -> str:
     </linearGradient>
   </defs>
   <circle cx="128" cy="128" r="128" fill="url(#g)"/>
-  <text x="50%" y="55%" text-anchor="middle" font-size="88" font-family="Arial, Helvetica, sans-serif" fill="#00100f" dy=".35em">{initials}</text>
+  <text x="50%" y="55%" text-anchor="middle" font-size="88" font-family="Arial, Helvetica, sans-serif" fill="#00100f" dy=".35em">{escape(initials)}</text>
 </svg>'''
-    b64 = base64.b64encode(svg.encode('utf-8')).decode('ascii')
-    return f'data:image/svg+xml;base64,{b64}'
+    return svg.encode('utf-8')
+
+
+def placeholder_url(name: str) -> str:
+    """URL tới endpoint placeholder (cache được) thay vì nhúng SVG base64 vào JSON."""
+    return PLACEHOLDER_URL.format(quote(initials(name), safe=''))
+
 
 
+def thumb_path(avatar_path):
+    """Đường dẫn bản 'sm' của avatar; avatar cũ (chưa qua pipeline) trả nguyên."""
+    if not avatar_path:
+        return avatar_path
+    root, ext = os.path.splitext(avatar_path)
+    if ext in ('.webp', '.jpg') and '_' not in os.path.basename(root):
+        return f"{root}_sm{ext}"
+    return avatar_path
@@ -0,0 +1,200 @@
+"""Avatar upload: kiểm tra nhanh trong request, decode + cắt vuông + nén WebP/JPEG ở thread nền."""
+import io
+import os
+import uuid
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+AVATAR_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'avatars')
+AVATAR_URL_PREFIX = '/uploads/avatars/'
+ALLOWED_EXTS = {'.png', '.jpg', '.jpeg'}
+ALLOWED_FORMATS = {'PNG', 'JPEG'}
+MAX_BYTES = 5 * 1024 * 1024
+MAX_PIXELS = 40_000_000          # chặn ảnh "bom" giải nén trước khi decode
+# md: trang hồ sơ, sm: card quẹt
+AVATAR_SIZES = {'md': 512, 'sm': 128}
+# Tên file là uuid mới mỗi lần upload nên cache được vĩnh viễn
+CACHE_MAX_AGE = 365 * 24 * 3600
+
+if features.check('webp'):
+    OUTPUT_FORMAT, OUTPUT_EXT = 'WEBP', '.webp'
+else:
+    OUTPUT_FORMAT, OUTPUT_EXT = 'JPEG', '.jpg'
+
+_RAW_EXT = '.upload'
+_SAVE_OPTIONS = {'WEBP': {'method': 4}, 'JPEG': {'optimize': True, 'progressive': True}}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def variant_name(stem, size='md'):
+    return f"{stem}{OUTPUT_EXT}" if size == 'md' else f"{stem}_{size}{OUTPUT_EXT}"
+
+
+def _write_variants(img, upload_dir, stem, quality=82):
+    """Cắt vuông + nén từng kích thước AVATAR_SIZES; ghi tmp rồi os.replace."""
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+    mode = 'RGBA' if has_alpha and OUTPUT_FORMAT == 'WEBP' else 'RGB'
+    img = img.convert(mode)
+    for size_key, px in AVATAR_SIZES.items():
+        thumb = ImageOps.fit(img, (px, px), Image.LANCZOS)
+        dest = os.path.join(upload_dir, variant_name(stem, size_key))
+        tmp = f"{dest}.{uuid.uuid4().hex[:8]}.tmp"
+        thumb.save(tmp, OUTPUT_FORMAT, quality=quality, **_SAVE_OPTIONS[OUTPUT_FORMAT])
+        os.replace(tmp, dest)
+
+
+def store_image(data: bytes, upload_dir=AVATAR_DIR):
+    """Lưu ảnh (vd. ảnh trích từ CV) theo hash nội dung, đã thu nhỏ; trả tên file bản 'md'
+    hoặc None nếu không phải ảnh hợp lệ. Cùng ảnh upload lại -> cùng file, không xử lý lại."""
+    stem = hashlib.sha256(data).hexdigest()[:32]
+    name = variant_name(stem)
+    if os.path.exists(os.path.join(upload_dir, variant_name(stem, 'sm'))):
+        return name
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            w, h = img.size
+            if w * h > MAX_PIXELS:
+                return None
+            os.makedirs(upload_dir, exist_ok=True)
+            _write_variants(img, upload_dir, stem)
+    except Exception:
+        logger.warning('Could not store embedded image (%d bytes)', len(data), exc_info=True)
+        return None
+    return name
+
+
+def _stem(filename):
+    return os.path.splitext(os.path.basename(filename))[0].split('_', 1)[0]
+
+
+class AvatarProcessor:
+    """Lưu file gốc `<uuid>.upload` rồi tạo các bản AVATAR_SIZES trong pool.
+
+    Bản chưa xử lý xong được `ensure` tạo ngay khi có request tới (kể cả từ
+    process khác: file gốc vẫn còn trên đĩa)."""
+
+    def __init__(self, upload_dir, workers=2, quality=82):
+        self.upload_dir = upload_dir
+        self.quality = quality
+        self.workers = workers
+        self._pool = None
+        self._pid = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        # tạo pool lười: thread không sống qua fork (gunicorn preload)
+        if self._pool is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='avatar')
+        return self._pool
+
+    def _path(self, name):
+        return os.path.join(self.upload_dir, name)
+
+    def save_upload(self, file):
+        """Kiểm tra + lưu avatar upload (FileStorage); trả tên file bản 'md'.
+        Raise InvalidImage nếu sai định dạng/kích thước."""
+        ext = os.path.splitext(file.filename or '')[1].lower()
+        if ext not in ALLOWED_EXTS:
+            raise InvalidImage('Only .png, .jpg, .jpeg allowed')
+        file.seek(0, 2); size = file.tell(); file.seek(0)
+        if size > MAX_BYTES:
+            raise InvalidImage('Avatar must be ≤ 5MB')
+        try:
+            # chỉ đọc header, chưa decode pixel
+            with Image.open(file.stream) as img:
+                fmt, (w, h) = img.format, img.size
+        except Exception:
+            raise InvalidImage('Invalid image file')
+        if fmt not in ALLOWED_FORMATS or w * h > MAX_PIXELS:
+            raise InvalidImage('Invalid image file')
+        file.seek(0)
+
+        stem = uuid.uuid4().hex
+        file.save(self._path(stem + _RAW_EXT))
+        self._submit(stem)
+        return variant_name(stem)
+
+    def _submit(self, stem):
+        """Future xử lý `stem` trong pool; dùng chung nếu đã có job cho stem này."""
+        with self._lock:
+            fut = self._pending.get(stem)
+            if fut is None:
+                fut = self._pending[stem] = self._executor().submit(self._run, stem)
+            return fut
+
+    def _run(self, stem):
+        try:
+            self._process(stem)
+        except FileNotFoundError:
+            pass  # process khác vừa xử lý xong / avatar đã bị xoá
+        except Exception:
+            logger.exception('Avatar %s processing failed', stem)
+        finally:
+            with self._lock:
+                self._pending.pop(stem, None)
+
+    def _process(self, stem):
+        raw = self._path(stem + _RAW_EXT)
+        with Image.open(raw) as img:
+            _write_variants(img, self.upload_dir, stem, self.quality)
+        os.remove(raw)
+
+    def ensure(self, filename, timeout=10.0):
+        """Đảm bảo bản `filename` đã được tạo; True nếu file có trên đĩa.
+        Việc resize luôn chạy trong pool (kể cả file gốc do process khác upload),
+        request thread chỉ chờ tối đa `timeout` giây."""
+        path = self._path(os.path.basename(filename))
+        if os.path.exists(path):
+            return True
+        stem = _stem(filename)
+        with self._lock:
+            fut = self._pending.get(stem)
+        if fut is None and os.path.exists(self._path(stem + _RAW_EXT)):
+            fut = self._submit(stem)
+        if fut is not None:
+            try:
+                fut.result(timeout)
+            except FutureTimeout:
+                return False
+        return os.path.exists(path)
+
+    def is_pending(self, filename):
+        """Avatar còn đang chờ resize (file gốc vẫn trên đĩa)."""
+        return os.path.exists(self._path(_stem(filename) + _RAW_EXT))
+
+    def remove(self, avatar_path):
+        """Xoá (ở nền) mọi file của avatar cũ: các bản thumbnail và file gốc."""
+        if not avatar_path:
+            return
+        stem = _stem(avatar_path)
+        names = [os.path.basename(avatar_path), stem + _RAW_EXT]
+        names += [variant_name(stem, s) for s in AVATAR_SIZES]
+        self._executor().submit(self._remove, stem, names)
+
+    def _remove(self, stem, names):
+        with self._lock:
+            fut = self._pending.get(stem)
+        if fut is not None:
+            fut.result()
+        for name in set(names):
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self, wait=True):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=wait)
+            self._pool = None
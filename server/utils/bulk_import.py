@@ -0,0 +1,70 @@
+"""Gom file JD từ upload nhiều file hoặc file .zip cho /api/jobs/bulk-import."""
+import io
+import os
+import zipfile
+
+JD_EXTS = {'.pdf', '.doc', '.docx', '.txt'}
+MAX_FILES = 100
+MAX_FILE_BYTES = 10 * 1024 * 1024
+MAX_TOTAL_BYTES = 200 * 1024 * 1024   # tổng sau giải nén (chặn zip bomb)
+# cả request multipart (file/zip đã nén + header form); lớn nhất trong app -> MAX_CONTENT_LENGTH
+MAX_REQUEST_BYTES = MAX_TOTAL_BYTES + 1024 * 1024
+
+
+class BulkImportError(ValueError):
+    pass
+
+
+def _skip(name):
+    base = os.path.basename(name)
+    return not base or base.startswith('.') or name.startswith('__MACOSX/')
+
+
+def collect_files(storages):
+    """Trả (files, rejected): files = [(tên, bytes)] hợp lệ để parse,
+    rejected = [(tên, lý do)]. Raise BulkImportError khi vượt giới hạn cả lô."""
+    files, rejected = [], []
+    total = 0
+
+    def add(name, read):
+        nonlocal total
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in JD_EXTS:
+            rejected.append((name, 'Chỉ nhận PDF/DOC/DOCX/TXT'))
+            return
+        if len(files) >= MAX_FILES:
+            raise BulkImportError(f'Tối đa {MAX_FILES} file / lần import')
+        data = read()  # đọc tối đa MAX_FILE_BYTES + 1, không tin file_size trong header zip
+        if len(data) > MAX_FILE_BYTES:
+            rejected.append((name, 'File size must be ≤ 10MB'))
+            return
+        total += len(data)
+        if total > MAX_TOTAL_BYTES:
+            raise BulkImportError('Tổng dung lượng vượt giới hạn')
+        files.append((name, data))
+
+    def read_member(zf, info):
+        with zf.open(info) as fh:
+            return fh.read(MAX_FILE_BYTES + 1)
+
+    for f in storages:
+        name = f.filename or ''
+        if name.lower().endswith('.zip'):
+            # mở thẳng file upload (werkzeug đã spool ra đĩa), không đọc cả zip vào RAM
+            f.stream.seek(0, io.SEEK_END)
+            if f.stream.tell() > MAX_TOTAL_BYTES:
+                raise BulkImportError('Tổng dung lượng vượt giới hạn')
+            f.stream.seek(0)
+            try:
+                zf = zipfile.ZipFile(f.stream)
+            except zipfile.BadZipFile:
+                rejected.append((name, 'File zip không hợp lệ'))
+                continue
+            with zf:
+                for info in zf.infolist():
+                    if info.is_dir() or _skip(info.filename):
+                        continue
+                    add(info.filename, lambda: read_member(zf, info))
+        elif name:
+            add(name, lambda: f.read(MAX_FILE_BYTES + 1))
+    return files, rejected
@@ -0,0 +1,75 @@
+"""Nén gzip/brotli theo Accept-Encoding cho response text/JSON; bản nén của trang
+public có ETag (feed) được cache theo (ETag, encoding) nên chỉ nén 1 lần."""
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # tuỳ chọn: pip install brotli
+    brotli = None
+
+COMPRESSIBLE = {
+    'application/json', 'application/javascript', 'image/svg+xml',
+    'text/html', 'text/plain', 'text/css', 'text/csv',
+}
+
+
+def choose_encoding(accept):
+    """'br' | 'gzip' | None theo quality client gửi; hoà thì ưu tiên br (nhỏ hơn)."""
+    best, best_q = None, 0
+    for enc in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        q = accept[enc]
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(data: bytes, encoding, level=6) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class Compressor:
+    """`after_request` hook. Bỏ qua response stream/send_file, đã nén, khác 200,
+    không phải text hoặc nhỏ hơn `min_size` byte (nén không đáng)."""
+
+    def __init__(self, min_size=1024, cache=None, level=6, cached_level=9):
+        self.min_size = min_size
+        self.cache = cache  # ResponseCache: (etag, encoding) -> bytes đã nén
+        self.level = level
+        self.cached_level = cached_level  # nén 1 lần rồi dùng lại nên nén kỹ hơn
+
+    def init_app(self, app):
+        app.after_request(self.process)
+
+    def process(self, response):
+        if response.mimetype not in COMPRESSIBLE:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        key = (etag, encoding) if (self.cache is not None and etag and not weak
+                                   and response.cache_control.public) else None
+        data = self.cache.get(key, etag) if key else None
+        if data is None:
+            data = compress(body, encoding, self.cached_level if key else self.level)
+            if key:
+                self.cache.put(key, etag, data)
+
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # cùng tài nguyên nhưng byte khác bản gốc -> ETag yếu (If-None-Match so sánh yếu)
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,124 @@
+"""Write-behind queue cho SwipeDecision: gom nhiều swipe vào 1 transaction."""
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+
+from db import db
+from models import SwipeDecision
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class QueueFull(Exception):
+    pass
+
+
+def insert_decisions(rows):
+    """Bulk insert (executemany) các dict {candidate_id, job_id, action, created_at} trong 1 transaction."""
+    if not rows:
+        return
+    db.session.execute(db.insert(SwipeDecision), rows)
+    db.session.commit()
+
+
+class DecisionWriter:
+    """Nhận swipe từ request thread, flush xuống DB theo lô khi đủ `batch_size`
+    hoặc sau `flush_interval` giây. Queue có giới hạn: đầy thì `submit` raise
+    QueueFull (back-pressure). Thread nền khởi động lười ở lần submit đầu tiên
+    (sau fork) và được flush hết khi process thoát."""
+
+    def __init__(self, app=None, batch_size=200, flush_interval=0.5, max_queue=10000,
+                 put_timeout=0.05, max_retries=3):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self._q = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.flushed = 0
+        self.dropped = 0
+
+    def init_app(self, app):
+        self.app = app
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="decision-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def submit(self, row: dict):
+        self._ensure_started()
+        try:
+            self._q.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            raise QueueFull()
+
+    def qsize(self):
+        return self._q.qsize()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if stopping:
+                # Lấy nốt phần còn lại trong queue trước khi thoát
+                while True:
+                    try:
+                        item = self._q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            for attempt in range(1, self.max_retries + 1):
+                with self.app.app_context():
+                    try:
+                        insert_decisions(chunk)
+                        self.flushed += len(chunk)
+                        break
+                    except Exception:
+                        db.session.rollback()
+                        logger.exception("Flush %d decisions failed (attempt %d)", len(chunk), attempt)
+                time.sleep(0.1 * attempt)
+            else:
+                self.dropped += len(chunk)
+                logger.error("Dropped %d swipe decisions after %d attempts", len(chunk), self.max_retries)
+
+    def close(self, timeout=10.0):
+        """Flush mọi swipe còn trong queue rồi dừng thread nền."""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        self._q.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
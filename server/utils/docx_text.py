@@ -0,0 +1,53 @@
+"""Đọc DOCX 1 lần: mở zip OOXML, stream XML bằng iterparse lấy text, lấy ảnh đầu tiên
+thẳng từ word/media/ (thay cho docx2txt + python-docx parse 2 lần)."""
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_T, _TAB, _BR, _CR, _P = _W + 't', _W + 'tab', _W + 'br', _W + 'cr', _W + 'p'
+
+_HEADER_RE = re.compile(r'word/header[0-9]*\.xml')
+_FOOTER_RE = re.compile(r'word/footer[0-9]*\.xml')
+_IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+
+
+def _xml_text(stream, out):
+    """Text của 1 part theo quy ước docx2txt: <w:p> -> 2 dòng mới, tab/br giữ nguyên."""
+    for event, el in ET.iterparse(stream, events=('start', 'end')):
+        tag = el.tag
+        if event == 'start':
+            if tag == _P:
+                out.append('\n\n')
+            elif tag == _TAB:
+                out.append('\t')
+            elif tag in (_BR, _CR):
+                out.append('\n')
+        elif tag == _T:
+            if el.text:
+                out.append(el.text)
+        elif tag == _P:
+            el.clear()  # giải phóng đoạn đã đọc, không giữ cả cây trong RAM
+
+
+def read_docx(bytes_data: bytes, with_image=True):
+    """Trả (text, bytes ảnh đầu tiên | None)."""
+    with zipfile.ZipFile(io.BytesIO(bytes_data)) as zf:
+        names = zf.namelist()
+        parts = [n for n in names if _HEADER_RE.match(n)]
+        parts.append('word/document.xml')
+        parts += [n for n in names if _FOOTER_RE.match(n)]
+        out = []
+        for name in parts:
+            with zf.open(name) as f:
+                _xml_text(f, out)
+
+        image = None
+        if with_image:
+            for name in names:
+                ext = name[name.rfind('.'):].lower()
+                if name.startswith('word/media/') and ext in _IMAGE_EXTS:
+                    image = zf.read(name)
+                    break
+    return ''.join(out).strip(), image
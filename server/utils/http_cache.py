@@ -0,0 +1,98 @@
+"""ETag/Last-Modified cho các API đọc + cache body JSON trong process."""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import timezone
+
+from flask import Response, request
+
+# Job/ứng viên có thể bị sửa bất cứ lúc nào: cho cache nhưng luôn hỏi lại bằng ETag
+ENTITY_CACHE_CONTROL = "private, no-cache"
+# Trang feed chỉ đổi khi import lại corpus
+FEED_CACHE_CONTROL = "public, max-age=300"
+
+
+def etag_for(*parts) -> str:
+    """ETag mạnh (chưa có dấu nháy) từ các thành phần xác định phiên bản."""
+    h = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8"))
+    return h.hexdigest()[:20]
+
+
+def _http_date(dt):
+    # updated_at lưu UTC naive; Last-Modified chỉ có độ chính xác giây
+    return dt.replace(tzinfo=timezone.utc, microsecond=0) if dt else None
+
+
+def is_fresh(etag, last_modified=None) -> bool:
+    """Client đã có bản này chưa (If-None-Match ưu tiên hơn If-Modified-Since)."""
+    if request.if_none_match:
+        # so sánh yếu (RFC 9110): bản nén gzip/br trả ETag W/"..." của cùng body
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    if not (since and last_modified):
+        return False
+    # so với stamp đầy đủ micro giây: Last-Modified chỉ chính xác tới giây nên sửa
+    # trong cùng giây với lần trả trước vẫn phải ra 200, không phải 304
+    return last_modified.replace(tzinfo=timezone.utc) <= since
+
+
+def _headers(resp, etag, last_modified, cache_control):
+    resp.set_etag(etag)
+    if last_modified:
+        resp.last_modified = _http_date(last_modified)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+def conditional_json(etag, build, last_modified=None, cache_control=ENTITY_CACHE_CONTROL,
+                     cache=None, key=None):
+    """304 nếu client còn bản mới nhất; nếu không thì body JSON (lấy từ `cache`
+    khi cùng ETag, chỉ gọi `build()` khi cache miss)."""
+    if is_fresh(etag, last_modified):
+        return _headers(Response(status=304), etag, last_modified, cache_control)
+    body = cache.get(key, etag) if cache is not None else None
+    if body is None:
+        body = build()
+        if cache is not None:
+            cache.put(key, etag, body)
+    return _headers(Response(body, mimetype="application/json"), etag, last_modified, cache_control)
+
+
+class ResponseCache:
+    """LRU nhỏ key -> (etag, body). Entry chỉ được dùng khi ETag còn khớp nên
+    không bao giờ trả dữ liệu cũ; `invalidate` để giải phóng sớm khi update."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, etag, body):
+        with self._lock:
+            self._data[key] = (etag, body)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,102 @@
+"""Xếp hạng feed theo độ tương đồng hồ sơ ứng viên <-> nội dung job (TF-IDF, tính sẵn)."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def candidate_profile_text(cand: dict) -> str:
+    """Gộp các trường hồ sơ (Candidate.to_dict) thành 1 đoạn văn để so khớp."""
+    parts = [cand.get("degree"), cand.get("exp1"), cand.get("exp2"),
+             cand.get("skill1"), cand.get("skill2"), " ".join(cand.get("languages") or [])]
+    return "\n".join(p for p in parts if p)
+
+
+# Chỉ lấy phần đầu mô tả để dựng index: đủ từ khoá, không giữ cả văn bản trong RAM
+MAX_TEXT_CHARS = 2000
+
+
+class JobRanker:
+    """Ma trận TF-IDF của toàn bộ job dựng 1 lần; điểm của mỗi ứng viên được cache
+    (LRU) theo key (candidate_id, updated_at). Mỗi trang chỉ chọn top-k bằng
+    argpartition thay vì sort cả corpus."""
+
+    def __init__(self, job_ids, texts, cache_size=256):
+        self.vectorizer = TfidfVectorizer(
+            stop_words="english", sublinear_tf=True, max_features=50000, dtype=np.float32,
+        )
+        try:
+            self.matrix = self.vectorizer.fit_transform(texts)
+        except ValueError:  # corpus rỗng / chỉ toàn stop words
+            self.matrix = None
+        # sau fit: `texts` có thể là generator điền dần `job_ids`
+        self.size = len(job_ids)
+        self.position = {str(j): i for i, j in enumerate(job_ids)}
+        self.cache_size = cache_size
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_source(cls, source, max_chars=MAX_TEXT_CHARS, **kw):
+        """Dựng index từ generator của source: TfidfVectorizer đọc từng text 1 lần,
+        chỉ giữ lại danh sách id và ma trận sparse."""
+        ids = []
+
+        def texts():
+            for job_id, text in source.iter_ranking_texts(max_chars):
+                ids.append(job_id)
+                yield text
+
+        return cls(ids, texts(), **kw)
+
+    def scores(self, key, profile_text):
+        """Điểm khớp của mọi job với hồ sơ (float32); None = giữ thứ tự feed."""
+        with self._lock:
+            if key in self._scores:
+                self._scores.move_to_end(key)
+                return self._scores[key]
+
+        if self.matrix is None or not profile_text.strip():
+            scores = None
+        else:
+            vec = self.vectorizer.transform([profile_text])
+            scores = (self.matrix @ vec.T).toarray().ravel().astype(np.float32)
+
+        with self._lock:
+            self._scores[key] = scores
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+        return scores
+
+    def top(self, scores, k) -> np.ndarray:
+        """k vị trí đầu theo (điểm giảm dần, vị trí CSV) — đúng bằng prefix của sort
+        stable toàn bộ, nhưng chỉ sort các job có điểm >= điểm thứ k."""
+        if scores is None:
+            return np.arange(min(k, self.size), dtype=np.int32)
+        if k >= self.size:
+            return np.argsort(-scores, kind="stable").astype(np.int32)
+        neg = -scores
+        kth = np.partition(neg, k - 1)[k - 1]
+        cand = np.flatnonzero(neg <= kth)  # gồm cả các job đồng điểm ở biên
+        return cand[np.argsort(neg[cand], kind="stable")][:k].astype(np.int32)
+
+    def page(self, key, profile_text, swiped_job_ids, offset, limit):
+        """Trả (positions, next_offset); offset tính trên thứ tự đã xếp hạng."""
+        scores = self.scores(key, profile_text)
+        skip = {self.position[j] for j in swiped_job_ids if j in self.position}
+        start = max(0, offset)
+        k = start + limit + len(skip)
+        while True:
+            order = self.top(scores, min(k, self.size))
+            out = []
+            i = start
+            while i < len(order) and len(out) < limit:
+                p = int(order[i])
+                i += 1
+                if p not in skip:
+                    out.append(p)
+            if len(out) >= limit or len(order) >= self.size:
+                break
+            k *= 2  # bị job đã quẹt chiếm chỗ: lấy cửa sổ rộng hơn
+        return out, (i if i < self.size else None)
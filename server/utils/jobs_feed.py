@@ -1,3 +1,7 @@
+import os
+import json
+import hashlib
+import tempfile
 import pandas as pd
 from pathlib import Path
 
@@ -27,6 +31,24 @@ COL_MAP = {
     "company profile": "company_profile",
 }
 
+# Chỉ các cột feed/matcher dùng tới; cột ít giá trị khác nhau đọc thành category
+FEED_COLUMNS = {
+    "job_id", "id", "company_name", "job_title", "role", "location", "country",
+    "work_type", "salary_range", "experience", "skills", "responsibilities",
+    "benefits", "job_description", "company_profile", "company_size", "preference",
+}
+CATEGORICAL_COLUMNS = {"work_type", "country", "company_size", "preference"}
+
+# Đổi khi FEED_COLUMNS/dtype đổi để snapshot cũ tự mất hiệu lực
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "instance" / "cache"
+
+try:
+    import pyarrow  # noqa: F401
+    _SNAPSHOT_EXT = "parquet"
+except ImportError:
+    _SNAPSHOT_EXT = "pkl"
+
 def _find_csv():
     # ưu tiên server/../database/job_descriptions.csv, fallback server/database/...
     here = Path(__file__).resolve().parent
@@ -39,17 +61,89 @@ def _find_csv():
             return p
     raise FileNotFoundError("Không tìm thấy database/job_descriptions.csv")
 
-def load_jobs_df():
-    path = _find_csv()
-    df = pd.read_csv(path)
-    # chuẩn hoá tên cột
-    new_cols = {}
-    for c in df.columns:
-        k = c.strip().lower()
-        new_cols[c] = COL_MAP.get(k, k.replace(" ", "_"))
-    df = df.rename(columns=new_cols)
-    # fill NaN
-    df = df.fillna("")
+def _column_key(c):
+    k = c.strip().lower()
+    return COL_MAP.get(k, k.replace(" ", "_"))
+
+def normalize_columns(df):
+    """Chuẩn hoá tên cột CSV về snake_case theo COL_MAP."""
+    return df.rename(columns={c: _column_key(c) for c in df.columns})
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _parse_csv(path):
+    header = pd.read_csv(path, nrows=0).columns
+    keep = [c for c in header if _column_key(c) in FEED_COLUMNS]
+    dtype = {c: ("category" if _column_key(c) in CATEGORICAL_COLUMNS else str)
+             for c in keep if _column_key(c) not in ("job_id", "id")}
+    # na_filter=False: ô trống đọc thẳng thành "" nên không cần fillna (tránh copy cả DataFrame)
+    df = pd.read_csv(path, usecols=keep, dtype=dtype, na_filter=False)
+    return normalize_columns(df)
+
+def _path_key(path):
+    """Khoá theo đường dẫn CSV: mỗi file CSV có meta/snapshot riêng, không xoá của nhau."""
+    return hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+
+def _csv_digest(path, snapshot_dir):
+    """Hash nội dung CSV; chỉ tính lại khi mtime/size đổi so với lần trước."""
+    st = path.stat()
+    meta_path = snapshot_dir / f"jobs_snapshot-{_path_key(path)}.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta["mtime_ns"] == st.st_mtime_ns and meta["size"] == st.st_size:
+            return meta["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+    digest = _sha256(path)
+    _atomic_write(meta_path, lambda p: Path(p).write_text(json.dumps(
+        {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest})))
+    return digest
+
+def _atomic_write(dest, write):
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def load_jobs_df(path=None, snapshot_dir=None):
+    """Đọc CSV job; lần parse đầu ghi snapshot cột (parquet, hoặc pickle nếu thiếu pyarrow)
+    theo hash nội dung CSV, các lần load sau đọc thẳng snapshot."""
+    path = Path(path) if path else _find_csv()
+    snapshot_dir = Path(snapshot_dir) if snapshot_dir else SNAPSHOT_DIR
+    try:
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        digest = _csv_digest(path, snapshot_dir)
+    except OSError:
+        return _parse_csv(path)
+
+    path_key = _path_key(path)
+    snap = snapshot_dir / f"jobs-v{SNAPSHOT_VERSION}-{path_key}-{digest[:16]}.{_SNAPSHOT_EXT}"
+    if snap.exists():
+        try:
+            return pd.read_parquet(snap) if _SNAPSHOT_EXT == "parquet" else pd.read_pickle(snap)
+        except Exception:
+            pass
+
+    df = _parse_csv(path)
+    try:
+        if _SNAPSHOT_EXT == "parquet":
+            _atomic_write(snap, lambda p: df.to_parquet(p, index=False))
+        else:
+            _atomic_write(snap, lambda p: df.to_pickle(p))
+        for old in snapshot_dir.glob(f"jobs-v*-{path_key}-*"):
+            if old != snap:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
     return df
 
 def job_row_to_dict(row) -> dict:
@@ -81,3 +175,50 @@ def job_row_to_dict(row) -> dict:
         "title": title,
         "description": desc,
     }
+
+
+def card_fragment(card) -> str:
+    """Serialize 1 card thành JSON fragment (dùng chung cho feed in-memory và SQLite)."""
+    return json.dumps(card, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def page_body(fragments, next_offset) -> str:
+    """Body JSON của 1 trang: {"items": [...], "nextOffset": n|null, "nextCursor": n|null}."""
+    nxt = json.dumps(next_offset)
+    return '{"items":[%s],"nextOffset":%s,"nextCursor":%s}' % (",".join(fragments), nxt, nxt)
+
+
+class JobFeed:
+    """Feed đã dựng sẵn lúc load: mỗi job chỉ giữ 1 đoạn JSON đã serialize (không giữ
+    thêm card dict). Phân trang chỉ còn là slice + join chuỗi, không tạo Series/dict theo request.
+    """
+
+    def __init__(self, cards):
+        self.fragments = [card_fragment(c) for c in cards]
+        # Phiên bản corpus (hash nội dung) cho ETag của /api/jobs
+        h = hashlib.sha1()
+        for f in self.fragments:
+            h.update(f.encode("utf-8"))
+        self.version = h.hexdigest()[:16]
+
+    @classmethod
+    def from_df(cls, df):
+        return cls(job_row_to_dict(r) for r in df.to_dict("records"))
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def iter_ranking_texts(self, max_chars=None):
+        # chỉ chạy khi dựng TF-IDF index: decode lại từng fragment thay vì giữ bản dict thứ hai
+        for f in self.fragments:
+            c = json.loads(f)
+            yield str(c["id"]), f'{c["title"]}\n{c["description"][:max_chars]}'
+
+    def fragments_at(self, positions):
+        return [self.fragments[p] for p in positions]
+
+    def page_json(self, offset, limit) -> str:
+        total = len(self.fragments)
+        offset = max(0, offset)
+        end = min(offset + limit, total)
+        return page_body(self.fragments[offset:end], end if end < total else None)
@@ -0,0 +1,152 @@
+"""Kho job trên SQLite: bảng `jobs` + chỉ mục FTS5, thay cho việc giữ cả CSV trong RAM.
+
+Import 1 lần:  python -m utils.jobs_store [--csv path] [--db path]
+"""
+import os
+import re
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from utils.jobs_feed import (
+    _find_csv, normalize_columns, job_row_to_dict, card_fragment, page_body,
+)
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "instance" / "jobs.db"
+
+# `id` là vị trí 1..N trong feed: trang sau `offset` chính là `id > offset`,
+# nên offset cũ và keyset cursor dùng chung một truy vấn theo primary key.
+SCHEMA = """
+CREATE TABLE jobs (
+    id          INTEGER PRIMARY KEY,
+    job_id      TEXT NOT NULL,
+    company     TEXT NOT NULL DEFAULT '',
+    title       TEXT NOT NULL DEFAULT '',
+    skills      TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    card        TEXT NOT NULL
+);
+CREATE INDEX ix_jobs_job_id ON jobs(job_id);
+CREATE VIRTUAL TABLE jobs_fts USING fts5(
+    title, skills, description, company,
+    content='jobs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def import_csv(csv_path=None, db_path=None, chunksize=50_000) -> int:
+    """Đọc CSV theo chunk vào file DB tạm rồi os.replace sang `db_path`. Trả về số job."""
+    csv_path = Path(csv_path) if csv_path else _find_csv()
+    db_path = Path(db_path) if db_path else DEFAULT_DB
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(SCHEMA)
+        n = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            chunk = normalize_columns(chunk).fillna("")
+            rows = []
+            for r in chunk.to_dict("records"):
+                n += 1
+                card = job_row_to_dict(r)
+                rows.append((
+                    n, str(card["id"]), card["company"], card["title"],
+                    str(r.get("skills") or ""), str(r.get("job_description") or ""),
+                    card_fragment(card),
+                ))
+            conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+        conn.commit()
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    return n
+
+
+def fts_query(q: str) -> str:
+    """Chuyển chuỗi người dùng thành truy vấn FTS5 an toàn: mọi từ đều phải có, khớp tiền tố."""
+    return " ".join('"%s"*' % t for t in _TOKEN_RE.findall(q or ""))
+
+
+class JobStore:
+    """Đọc feed/search từ DB đã import; mỗi thread giữ 1 connection read-only."""
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB
+        self._local = threading.local()
+        self.total = self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]
+        # import_csv thay file bằng os.replace nên mtime/size đổi mỗi lần import
+        st = self.db_path.stat()
+        self.version = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():  # không dùng lại connection qua fork
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __len__(self):
+        return self.total
+
+    def page_json(self, offset, limit) -> str:
+        rows = self._conn().execute(
+            "SELECT id, card FROM jobs WHERE id > ? ORDER BY id LIMIT ?",
+            (max(0, offset), limit),
+        ).fetchall()
+        last = rows[-1][0] if rows else None
+        return page_body([r[1] for r in rows], last if last is not None and last < self.total else None)
+
+    def iter_ranking_texts(self, max_chars=None):
+        # cắt mô tả ngay trong SQLite: không kéo cả description vào Python
+        cur = self._conn().execute(
+            "SELECT job_id, title, skills, substr(description, 1, ?) FROM jobs ORDER BY id",
+            (max_chars or 1 << 30,))
+        for job_id, title, skills, desc in cur:
+            yield job_id, f"{title}\n{skills}\n{desc}"
+
+    def fragments_at(self, positions):
+        """Card JSON theo vị trí feed (0-based), giữ đúng thứ tự `positions`."""
+        if not positions:
+            return []
+        ids = [p + 1 for p in positions]
+        rows = dict(self._conn().execute(
+            "SELECT id, card FROM jobs WHERE id IN (%s)" % ",".join("?" * len(ids)), ids,
+        ).fetchall())
+        return [rows[i] for i in ids if i in rows]
+
+    def search_json(self, q, limit=20, offset=0) -> str:
+        match = fts_query(q)
+        rows = []
+        if match:
+            rows = self._conn().execute(
+                "SELECT j.card FROM jobs_fts f JOIN jobs j ON j.id = f.rowid "
+                "WHERE jobs_fts MATCH ? ORDER BY f.rank LIMIT ? OFFSET ?",
+                (match, limit + 1, max(0, offset)),
+            ).fetchall()
+        more = len(rows) > limit
+        return page_body([r[0] for r in rows[:limit]], offset + limit if more else None)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Import job_descriptions.csv vào SQLite + FTS5")
+    ap.add_argument("--csv", default=None)
+    ap.add_argument("--db", default=str(DEFAULT_DB))
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    args = ap.parse_args()
+    count = import_csv(args.csv, args.db, args.chunksize)
+    print(f"Imported {count} jobs into {args.db}")
@@ -0,0 +1,133 @@
+"""Cache kết quả parse CV/JD trong SQLite theo hash nội dung file + PARSER_VERSION, LRU theo dung lượng."""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+from utils import parse_resume, parse_jd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "instance" / "parse_cache.db"
+PARSER_VERSIONS = {'resume': parse_resume.PARSER_VERSION, 'jd': parse_jd.PARSER_VERSION}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_parse_cache_last_used ON parse_cache (last_used);
+"""
+
+
+def cache_key(kind, data: bytes, filename) -> str:
+    """sha256(nội dung) + loại parser + đuôi file (quyết định cách đọc) + version parser."""
+    ext = os.path.splitext(filename or '')[1].lower()
+    h = hashlib.sha256(data).hexdigest()
+    return f"{kind}:{PARSER_VERSIONS[kind]}:{ext}:{h}"
+
+
+class ParseCache:
+    """Lỗi SQLite không bao giờ làm hỏng request: get trả None, put bỏ qua."""
+
+    def __init__(self, db_path=None, max_bytes=200 * 1024 * 1024, touch_interval=60.0):
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():  # không dùng lại connection qua fork
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        try:
+            row = self._conn().execute(
+                "SELECT result, last_used FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[1] > self.touch_interval:
+                # cập nhật LRU thưa thớt, tránh 1 lần ghi cho mỗi lần hit
+                self._conn().execute("UPDATE parse_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            logger.exception("Parse cache read failed")
+            row = None
+        self._count(row is not None)
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key, result):
+        body = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, kind, result, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, key.split(':', 1)[0], body, len(body.encode('utf-8')), now, now),
+            )
+            self._evict(conn)
+        except sqlite3.Error:
+            logger.exception("Parse cache write failed")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # xoá entry ít dùng gần đây nhất tới khi còn ~90% giới hạn
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM parse_cache ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM parse_cache WHERE key = ?", doomed)
+
+    def get_or_parse(self, kind, data: bytes, filename, parse):
+        key = cache_key(kind, data, filename)
+        result = self.get(key)
+        if result is None:
+            result = parse(data, filename)
+            self.put(key, result)
+        return result
+
+    def stats(self):
+        try:
+            entries, size = self._conn().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+        }
@@ -1,39 +1,23 @@
-import io
 import re
-import base64
-from pypdf import PdfReader
-import docx2txt
-from docx import Document
+from utils.pdf_text import extract_pdf_text
+from utils.docx_text import read_docx
+from utils.sections import HeadingMatcher
+
+
+# Tăng khi đổi logic parse để kết quả trong parse_cache cũ tự mất hiệu lực
+PARSER_VERSION = 1
 
 
 def _read_pdf(bytes_data: bytes):
-    """Read PDF file and extract text"""
-    text_parts = []
-    reader = PdfReader(io.BytesIO(bytes_data))
-    for page in reader.pages:
-        try:
-            text_parts.append(page.extract_text() or '')
-        except Exception:
-            pass
-    return '\n'.join(text_parts), None
+    """Read PDF file and extract text (page-capped, stops once every section is found)"""
+    text, _stats = extract_pdf_text(
+        bytes_data, done=lambda t: len(split_sections(t)) == len(JD_SECTION_PATTERNS))
+    return text, None
 
 
 def _read_docx(bytes_data: bytes):
     """Read DOCX file and extract text"""
-    buf = io.BytesIO(bytes_data)
-    text = docx2txt.process(buf)
-    buf.seek(0)
-    avatar = None
-    try:
-        document = Document(buf)
-        for rel in document.part.related_parts.values():
-            blob = getattr(rel, '_blob', None)
-            if blob:
-                avatar = 'data:image/png;base64,' + base64.b64encode(blob).decode('ascii')
-                break
-    except Exception:
-        pass
-    return text or '', avatar
+    return read_docx(bytes_data, with_image=False)
 
 
 def _read_txt(bytes_data: bytes):
@@ -49,56 +33,27 @@ def _read_txt(bytes_data: bytes):
             return '', None
 
 
+# Common section patterns for job descriptions
+JD_SECTION_PATTERNS = {
+    'company': re.compile(r'(?i)\b(company|about us|about company|tên công ty|công ty)\b'),
+    'title': re.compile(r'(?i)\b(job title|title|position|vị trí|chức danh)\b'),
+    'summary': re.compile(r'(?i)\b(summary|about the role|mô tả công việc|tổng quan)\b'),
+    'responsibilities': re.compile(r'(?i)\b(responsibilities|what you will do|your impact|nhiệm vụ|trách nhiệm)\b'),
+    'requirements': re.compile(r'(?i)\b(requirements|qualifications|you are|bạn cần|yêu cầu)\b'),
+    'skills': re.compile(r'(?i)\b(skills|tech stack|kỹ năng|công nghệ)\b'),
+    'location': re.compile(r'(?i)\b(location|địa điểm|nơi làm việc)\b'),
+    'employment_type': re.compile(r'(?i)\b(employment type|hình thức|loại công việc)\b'),
+    'salary': re.compile(r'(?i)\b(salary|compensation|lương|thu nhập)\b'),
+    'languages': re.compile(r'(?i)\b(languages|ngoại ngữ|tiếng)\b')
+}
+
+
+_HEADINGS = HeadingMatcher(JD_SECTION_PATTERNS)
+
+
 def split_sections(text):
     """Split text into sections based on common headings"""
-    sections = {}
-    
-    # Common section patterns for job descriptions
-    patterns = {
-        'company': re.compile(r'(?i)\b(company|about us|about company|tên công ty|công ty)\b'),
-        'title': re.compile(r'(?i)\b(job title|title|position|vị trí|chức danh)\b'),
-        'summary': re.compile(r'(?i)\b(summary|about the role|mô tả công việc|tổng quan)\b'),
-        'responsibilities': re.compile(r'(?i)\b(responsibilities|what you will do|your impact|nhiệm vụ|trách nhiệm)\b'),
-        'requirements': re.compile(r'(?i)\b(requirements|qualifications|you are|bạn cần|yêu cầu)\b'),
-        'skills': re.compile(r'(?i)\b(skills|tech stack|kỹ năng|công nghệ)\b'),
-        'location': re.compile(r'(?i)\b(location|địa điểm|nơi làm việc)\b'),
-        'employment_type': re.compile(r'(?i)\b(employment type|hình thức|loại công việc)\b'),
-        'salary': re.compile(r'(?i)\b(salary|compensation|lương|thu nhập)\b'),
-        'languages': re.compile(r'(?i)\b(languages|ngoại ngữ|tiếng)\b')
-    }
-    
-    lines = text.split('\n')
-    current_section = None
-    current_content = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if line matches any section heading
-        matched_section = None
-        for section, pattern in patterns.items():
-            if pattern.search(line):
-                matched_section = section
-                break
-        
-        if matched_section:
-            # Save previous section
-            if current_section and current_content:
-                sections[current_section] = '\n'.join(current_content).strip()
-            
-            # Start new section
-            current_section = matched_section
-            current_content = [line]
-        elif current_section:
-            current_content.append(line)
-    
-    # Save last section
-    if current_section and current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
-    
-    return sections
+    return _HEADINGS.split(text)
 
 
 def _guess_company(text, sections):
@@ -147,17 +102,22 @@ def _guess_title(text, sections):
     return ""
 
 
+_LIST_HEADING = re.compile(r'(?i)\b(responsibilities|requirements|skills|qualifications|nhiệm vụ|trách nhiệm|yêu cầu|kỹ năng)\b')
+_BULLET_SPLIT = re.compile(r'(?:\n|\r|^)[\-\–\•\*]\s*')
+_MULTI_SPACE = re.compile(r'\s{2,}')
+
+
 def _extract_list_items(text, max_items=10):
     """Extract list items from text, limiting to max_items"""
     if not text:
         return []
     
     # Remove the heading
-    body = re.sub(r'(?i)\b(responsibilities|requirements|skills|qualifications|nhiệm vụ|trách nhiệm|yêu cầu|kỹ năng)\b', '', text, 1)
+    body = _LIST_HEADING.sub('', text, count=1)
     
     # Split by bullet points
-    items = re.split(r'(?:\n|\r|^)[\-\–\•\*]\s*', body)
-    items = [re.sub(r'\s{2,}', ' ', i).strip(" -–•*") for i in items if len(i.strip()) > 5]
+    items = _BULLET_SPLIT.split(body)
+    items = [_MULTI_SPACE.sub(' ', i).strip(" -–•*") for i in items if len(i.strip()) > 5]
     
     # Fallback: split by lines if no bullet points found
     if len(items) <= 1:
@@ -0,0 +1,366 @@
+"""Hàng đợi parse CV/JD bất đồng bộ: POST nhận job id, process pool parse, GET lấy kết quả."""
+import os
+import json
+import time
+import uuid
+import signal
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.parse_resume import extract_profile
+from utils.parse_jd import parse_jd
+from utils.parse_cache import cache_key, DEFAULT_DB
+
+logger = logging.getLogger(__name__)
+
+PARSERS = {'resume': extract_profile, 'jd': parse_jd}
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ParseTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout()
+
+
+def _busy(job):
+    """Future còn chạy trong pool (job lấy từ cache không có future)."""
+    fut = job.get('future')
+    return fut is not None and not fut.done()
+
+
+class ParseJobStore:
+    """Trạng thái + kết quả job parse trong SQLite (mặc định cùng file với parse cache),
+    để worker gunicorn nào cũng trả lời được GET cho job do worker khác nhận."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS parse_job (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        cached INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS ix_parse_job_finished_at ON parse_job (finished_at);
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or DEFAULT_DB)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():  # không dùng lại connection qua fork
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, job):
+        result = job.get('result')
+        self._conn().execute(
+            'INSERT INTO parse_job (id, kind, status, result, cached, created_at, finished_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (job['id'], job['kind'], job['status'],
+             json.dumps(result, ensure_ascii=False) if result is not None else None,
+             int(bool(job.get('cached'))), job['created_at'], job['finished_at']))
+
+    def mark_running(self, job_id):
+        self._conn().execute(
+            "UPDATE parse_job SET status = 'running', started_at = ? WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id))
+
+    def finish(self, job_id, status, result=None, error=None):
+        """Ghi kết quả nếu job chưa kết thúc (vd. chưa bị đánh dấu timeout); True nếu đã ghi."""
+        cur = self._conn().execute(
+            "UPDATE parse_job SET status = ?, result = ?, error = ?, finished_at = ? "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+             error, time.time(), job_id))
+        return cur.rowcount > 0
+
+    def get(self, job_id):
+        row = self._conn().execute(
+            'SELECT id, kind, status, result, error, cached, created_at, started_at, finished_at '
+            'FROM parse_job WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(('id', 'kind', 'status', 'result', 'error', 'cached',
+                        'created_at', 'started_at', 'finished_at'), row))
+        if job['result'] is None:
+            del job['result']
+        else:
+            job['result'] = json.loads(job['result'])
+        if job['error'] is None:
+            del job['error']
+        if job['cached']:
+            job['cached'] = True
+        else:
+            del job['cached']
+        return job
+
+    def sweep(self, ttl):
+        self._conn().execute(
+            'DELETE FROM parse_job WHERE finished_at IS NOT NULL AND finished_at < ?', (time.time() - ttl,))
+
+
+_child_stores = {}
+
+
+def _run_parser(fn, data, filename, timeout, job_id=None, store_path=None):
+    """Chạy trong process con; SIGALRM cắt job quá `timeout` (nếu OS hỗ trợ).
+    Có `job_id` thì tự ghi started_at vào ParseJobStore khi bắt đầu chạy."""
+    if job_id and store_path:
+        try:
+            if store_path not in _child_stores:
+                _child_stores[store_path] = ParseJobStore(store_path)
+            _child_stores[store_path].mark_running(job_id)
+        except sqlite3.Error:
+            logger.exception('Cannot mark parse job %s running', job_id)
+    use_alarm = timeout and hasattr(signal, 'setitimer')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(data, filename)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ParseJobQueue:
+    """Giới hạn `max_workers` process parse song song và `max_pending` job chưa xong (trong
+    process này); kết quả giữ `ttl` giây sau khi hoàn tất, trong `store` (ParseJobStore,
+    dùng chung giữa các process) nếu có, không thì trong RAM của process."""
+
+    def __init__(self, max_workers=2, max_pending=32, timeout=30.0, ttl=600.0, parsers=None, cache=None,
+                 store=None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.ttl = ttl
+        self.parsers = parsers or PARSERS
+        self.cache = cache  # ParseCache: file đã parse thì job xong ngay, không vào pool
+        self.store = store
+        self._jobs = {}
+        self._bulk = 0  # file của parse_many đang chiếm chỗ trong max_pending
+        self._lock = threading.RLock()  # submit() giữ lock khi gọi _submit()
+        self._pool = None
+        self._pid = None
+
+    def _executor(self):
+        # tạo pool lười, sau fork của WSGI server; forkserver (nếu có) để không fork
+        # thẳng từ worker web đang chạy nhiều thread
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                ctx = multiprocessing.get_context('forkserver') if 'forkserver' in methods else None
+                self._pid = os.getpid()
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+            return self._pool
+
+    def _submit(self, *args):
+        with self._lock:
+            pool = self._executor()
+            try:
+                return pool.submit(*args)
+            except BrokenProcessPool:
+                # process con chết (OOM, segfault trong lib C): bỏ pool hỏng, tạo pool mới
+                logger.warning('Parse pool broken, recreating')
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                return self._executor().submit(*args)
+
+    def _pending(self):
+        # job timeout mềm vẫn chiếm worker tới khi future xong (cancel không dừng được job đang chạy)
+        return self._bulk + sum(1 for j in self._jobs.values() if _busy(j))
+
+    def submit(self, kind, data: bytes, filename) -> str:
+        fn = self.parsers[kind]
+        key = cache_key(kind, data, filename) if self.cache is not None and kind in PARSERS else None
+        cached = self.cache.get(key) if key else None
+        with self._lock:
+            self._sweep()
+            if self._pending() >= self.max_pending:
+                raise QueueFull()
+            job_id = uuid.uuid4().hex
+            job = {'id': job_id, 'kind': kind, 'status': 'queued',
+                   'created_at': time.time(), 'started_at': None, 'finished_at': None}
+            if cached is not None:
+                job.update(status='done', result=cached, cached=True, finished_at=time.time())
+                self._save(job)
+                return job_id
+            self._save(job)
+            store_path = self.store.db_path if self.store is not None else None
+            job['future'] = self._submit(_run_parser, fn, data, filename, self.timeout, job_id, store_path)
+        job['future'].add_done_callback(lambda fut: self._finish(job, fut, key))
+        return job_id
+
+    def _save(self, job):
+        if self.store is not None:
+            self.store.sweep(self.ttl)
+            self.store.create(job)
+            if job['status'] != 'queued':
+                return  # job xong ngay (cache), không cần giữ trong RAM
+        self._jobs[job['id']] = job
+
+    def _reserve(self, timeout):
+        """Giữ 1 chỗ trong max_pending cho 1 file của parse_many; chờ tối đa `timeout` giây."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._sweep()
+                if self._pending() < self.max_pending:
+                    self._bulk += 1
+                    return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def _release(self, fut=None):
+        with self._lock:
+            self._bulk -= 1
+
+    def _outcome(self, fut, key):
+        try:
+            result = fut.result()
+        except ParseTimeout:
+            return None, 'timeout'
+        except Exception as e:
+            return None, str(e) or e.__class__.__name__
+        if key:
+            self.cache.put(key, result)
+        return result, None
+
+    def parse_many(self, kind, files, window=None):
+        """Parse nhiều file (name, bytes) trên cùng pool; yield (name, result, error) theo
+        thứ tự file xong (file có trong cache ra trước). Mỗi lúc chỉ tối đa `window` file
+        trong pool và mỗi file chiếm 1 chỗ của max_pending như job thường; hết chỗ thì
+        chờ (tối đa 2 x timeout) rồi báo 'queue full' cho file đó."""
+        fn = self.parsers[kind]
+        use_cache = self.cache is not None and kind in PARSERS
+        window = window or self.max_workers * 2
+        wait_slot = self.timeout * 2 if self.timeout else 60.0
+        todo = []
+        for name, data in files:
+            key = cache_key(kind, data, name) if use_cache else None
+            result = self.cache.get(key) if key else None
+            if result is not None:
+                yield name, result, None
+            else:
+                todo.append((name, data, key))
+
+        futures, i = {}, 0
+        while i < len(todo) or futures:
+            while i < len(todo) and len(futures) < window:
+                name, data, key = todo[i]
+                # còn file đang parse thì không chờ chỗ trống, lấy kết quả trước đã
+                if not self._reserve(0 if futures else wait_slot):
+                    if futures:
+                        break
+                    i += 1
+                    yield name, None, 'queue full'
+                    continue
+                i += 1
+                try:
+                    fut = self._submit(_run_parser, fn, data, name, self.timeout)
+                except Exception:
+                    self._release()
+                    raise
+                fut.add_done_callback(self._release)
+                futures[fut] = (name, key)
+            if futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name, key = futures.pop(fut)
+                    yield (name, *self._outcome(fut, key))
+
+    def _finish(self, job, fut, key=None):
+        with self._lock:
+            if job['status'] not in ('queued', 'running'):
+                return  # đã bị đánh dấu timeout
+            try:
+                job['result'] = fut.result()
+                job['status'] = 'done'
+            except ParseTimeout:
+                job.update(status='failed', error='timeout')
+            except Exception as e:
+                logger.warning('Parse job %s failed: %s', job['id'], e)
+                job.update(status='failed', error=str(e))
+            job['finished_at'] = time.time()
+            if self.store is not None:
+                self._jobs.pop(job['id'], None)  # kết quả đọc từ store, RAM chỉ giữ job đang chạy
+        if self.store is not None:
+            try:
+                self.store.finish(job['id'], job['status'], job.get('result'), job.get('error'))
+            except sqlite3.Error:
+                logger.exception('Cannot store parse job %s', job['id'])
+        if key and job['status'] == 'done':
+            self.cache.put(key, job['result'])
+
+    def get(self, job_id):
+        """Trạng thái job dạng dict (không kèm Future); None nếu không có/đã hết hạn."""
+        if self.store is not None:
+            return self._get_stored(job_id)
+        with self._lock:
+            self._sweep()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == 'queued' and job['future'].running():
+                job.update(status='running', started_at=time.time())
+            # hết hạn mềm khi OS không có SIGALRM (hoặc job kẹt trong C code);
+            # tính từ lúc job bắt đầu chạy, không tính thời gian xếp hàng
+            if (job['status'] == 'running' and self.timeout
+                    and time.time() - job['started_at'] > self.timeout * 2):
+                job.update(status='failed', error='timeout', finished_at=time.time())
+            return {k: v for k, v in job.items() if k != 'future'}
+
+    def _get_stored(self, job_id):
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        now = time.time()
+        # hết hạn mềm như get() trong RAM, nhưng worker nào poll cũng đánh dấu được;
+        # job 'queued' quá ttl: process nhận job đã chết (restart worker) trước khi chạy
+        if ((job['status'] == 'running' and self.timeout and job['started_at']
+             and now - job['started_at'] > self.timeout * 2)
+                or (job['status'] == 'queued' and now - job['created_at'] > self.ttl)):
+            if self.store.finish(job_id, 'failed', error='timeout'):
+                job.update(status='failed', error='timeout', finished_at=now)
+            else:
+                job = self.store.get(job_id)  # vừa xong ở process khác
+        return job
+
+    def _sweep(self):
+        now = time.time()
+        expired = [k for k, j in self._jobs.items()
+                   if j['finished_at'] is not None and now - j['finished_at'] > self.ttl
+                   and not _busy(j)]
+        for k in expired:
+            del self._jobs[k]
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                return
+            pool, self._pool = self._pool, None
+        # chờ ngoài lock: callback _finish/_release của job đang chạy cũng cần lock
+        pool.shutdown(wait=wait, cancel_futures=True)
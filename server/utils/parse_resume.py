@@ -1,57 +1,35 @@
-import io
 import re
-import base64
-from pypdf import PdfReader
-import docx2txt
-from docx import Document
-
-
-def _placeholder_avatar(name: str) -> str:
-    initials = ''.join([p[0].upper() for p in (name or 'NA').split()[:2]]) or 'NA'
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256">
-  <defs>
-    <linearGradient id="g" x1="0" y1="0" x2="1" y2="1">
-      <stop offset="0%" stop-color="#14b8a6"/>
-      <stop offset="100%" stop-color="#22d3ee"/>
-    </linearGradient>
-  </defs>
-  <circle cx="128" cy="128" r="128" fill="url(#g)"/>
-  <text x="50%" y="55%" text-anchor="middle" font-size="88" font-family="Arial,Helvetica,sans-serif" fill="#00100f" dy=".35em">{initials}</text>
-</svg>'''
-    return 'data:image/svg+xml;base64,' + base64.b64encode(svg.encode('utf-8')).decode('ascii')
+from utils.pdf_text import extract_pdf_text
+from utils.docx_text import read_docx
+from utils.sections import HeadingMatcher
+from utils.avatar import placeholder_url
+from utils.avatar_store import store_image, AVATAR_URL_PREFIX
+
+
+# Tăng khi đổi logic parse để kết quả trong parse_cache cũ tự mất hiệu lực
+PARSER_VERSION = 2
+
+
+# Đủ các section này thì extract_profile không cần đọc thêm trang
+RESUME_SECTIONS = {'edu', 'ach', 'exp', 'skill', 'lang'}
 
 
 def _read_pdf(bytes_data: bytes):
-    text_parts = []
-    reader = PdfReader(io.BytesIO(bytes_data))
-    for page in reader.pages:
-        try:
-            text_parts.append(page.extract_text() or '')
-        except Exception:
-            pass
+    text, _stats = extract_pdf_text(
+        bytes_data, done=lambda t: RESUME_SECTIONS <= split_sections(t).keys())
     # pypdf XObject parsing is heavy; skip extracting image for stability
-    return '\n'.join(text_parts), None
+    return text, None
 
 
 def _read_docx(bytes_data: bytes):
-    buf = io.BytesIO(bytes_data)
-    text = docx2txt.process(buf)
-    buf.seek(0)
-    avatar = None
-    try:
-        document = Document(buf)
-        for rel in document.part.related_parts.values():
-            blob = getattr(rel, '_blob', None)
-            if blob:
-                avatar = 'data:image/png;base64,' + base64.b64encode(blob).decode('ascii')
-                break
-    except Exception:
-        pass
-    return text or '', avatar
+    return read_docx(bytes_data)
 
 
 YEAR = r'(19|20)\d{2}'
 YEAR_RANGE = re.compile(rf'(?i)\b{YEAR}\b.*?\b({YEAR}\b|present|ongoing|hiện tại)')
+_ONGOING = re.compile(r'(?i)present|ongoing|hiện tại')
+_BULLET_SPLIT = re.compile(r'(?:\n|\r|^)[\-\–\•\*]\s*')
+_MULTI_SPACE = re.compile(r'\s{2,}')
 
 
 def _guess_name(lines):
@@ -66,51 +44,21 @@ def _guess_name(lines):
     return ''
 
 
+# Heading CV theo thứ tự ưu tiên; gộp thành 1 regex trong HeadingMatcher
+SECTION_PATTERNS = {
+    'edu': r'(?i)\b(education|học vấn|bằng cấp|trình độ)\b',
+    'ach': r'(?i)\bkey achievements?\b|\bachievements?\b|\bthành tựu\b',
+    'exp': r'(?i)\b(experience|kinh nghiệm|làm việc)\b',
+    'skill': r'(?i)\b(skills?|kỹ năng|năng lực)\b',
+    'lang': r'(?i)\b(languages?|ngoại ngữ|tiếng)\b',
+}
+_HEADINGS = HeadingMatcher(SECTION_PATTERNS)
+_ACH_HEADING = re.compile(SECTION_PATTERNS['ach'])
+
+
 def split_sections(text):
     """Split text into sections based on common headings"""
-    sections = {}
-    
-    # Common section patterns
-    patterns = {
-        'edu': re.compile(r'(?i)\b(education|học vấn|bằng cấp|trình độ)\b'),
-        'ach': re.compile(r'(?i)\bkey achievements?\b|\bachievements?\b|\bthành tựu\b'),
-        'exp': re.compile(r'(?i)\b(experience|kinh nghiệm|làm việc)\b'),
-        'skill': re.compile(r'(?i)\b(skills?|kỹ năng|năng lực)\b'),
-        'lang': re.compile(r'(?i)\b(languages?|ngoại ngữ|tiếng)\b')
-    }
-    
-    lines = text.split('\n')
-    current_section = None
-    current_content = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if line matches any section heading
-        matched_section = None
-        for section, pattern in patterns.items():
-            if pattern.search(line):
-                matched_section = section
-                break
-        
-        if matched_section:
-            # Save previous section
-            if current_section and current_content:
-                sections[current_section] = '\n'.join(current_content).strip()
-            
-            # Start new section
-            current_section = matched_section
-            current_content = [line]
-        elif current_section:
-            current_content.append(line)
-    
-    # Save last section
-    if current_section and current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
-    
-    return sections
+    return _HEADINGS.split(text)
 
 
 def extract_education_recent(edu_text):
@@ -132,7 +80,7 @@ def extract_education_recent(edu_text):
         end_year_str = match.group(2)
         
         # Handle "present", "ongoing", "hiện tại"
-        if re.search(r'(?i)present|ongoing|hiện tại', end_year_str):
+        if _ONGOING.search(end_year_str):
             end_year = 9999  # Consider ongoing as most recent
         else:
             end_year = int(end_year_str) if end_year_str.isdigit() else start_year
@@ -173,11 +121,11 @@ def extract_achievements(ach_text):
         return []
     
     # Remove the heading
-    body = re.sub(r'(?i)\bkey achievements?\b|\bachievements?\b|\bthành tựu\b', '', ach_text, 1)
+    body = _ACH_HEADING.sub('', ach_text, count=1)
     
     # Split by bullet points
-    items = re.split(r'(?:\n|\r|^)[\-\–\•\*]\s*', body)
-    items = [re.sub(r'\s{2,}', ' ', i).strip(" -–•*") for i in items if len(i.strip()) > 3]
+    items = _BULLET_SPLIT.split(body)
+    items = [_MULTI_SPACE.sub(' ', i).strip(" -–•*") for i in items if len(i.strip()) > 3]
     
     # Fallback: split by lines if no bullet points found
     if len(items) <= 1:
@@ -194,13 +142,42 @@ def extract_achievements(ach_text):
     return out
 
 
-def _guess_languages(text):
-    langs = []
-    for lang in ['English','Vietnamese','Japanese','Korean','Chinese','French','German']:
-        if re.search(lang, text, re.I):
-            level = re.search(r'(?i)A1|A2|B1|B2|C1|C2|IELTS\s*\d(?:\.\d)?|TOEIC\s*\d+|Native', text)
-            langs.append(f"{lang} {level.group(0) if level else ''}".strip())
-    return langs
+LANGUAGES = ['English', 'Vietnamese', 'Japanese', 'Korean', 'Chinese', 'French', 'German']
+LANGUAGE_LEVEL = r'A1|A2|B1|B2|C1|C2|IELTS\s*\d(?:\.\d)?|TOEIC\s*\d+|Native'
+SKILLS = ['React', 'Angular', 'Vue', 'Node.js', 'Python', 'Java', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'ML', 'NLP']
+# 1 lần quét toàn văn bản cho cả ngôn ngữ, trình độ và skill
+_KEYWORDS = re.compile(
+    '(?P<lang>' + '|'.join(map(re.escape, LANGUAGES)) + ')'
+    '|(?P<level>' + LANGUAGE_LEVEL + ')'
+    '|\\b(?P<skill>' + '|'.join(map(re.escape, SKILLS)) + ')\\b',
+    re.I,
+)
+_LANG_KEY = {l.lower(): l for l in LANGUAGES}
+_SKILL_KEY = {k.lower(): k for k in SKILLS}
+
+
+def _scan_keywords(text):
+    """(ngôn ngữ, trình độ đầu tiên, skill) tìm thấy trong text, sau 1 lần finditer."""
+    langs, skills, level = set(), set(), None
+    for m in _KEYWORDS.finditer(text):
+        kind = m.lastgroup
+        if kind == 'lang':
+            langs.add(_LANG_KEY[m.group(kind).lower()])
+        elif kind == 'skill':
+            skills.add(_SKILL_KEY[m.group(kind).lower()])
+        elif level is None:
+            level = m.group(kind)
+    return langs, level, skills
+
+
+def _guess_languages(text, scan=None):
+    langs, level, _ = scan or _scan_keywords(text)
+    return [f"{lang} {level or ''}".strip() for lang in LANGUAGES if lang in langs]
+
+
+def _guess_skills(text, scan=None):
+    _, _, skills = scan or _scan_keywords(text)
+    return [k for k in SKILLS if k in skills][:6]
 
 
 def _guess_experiences(lines):
@@ -216,18 +193,13 @@ def _guess_experiences(lines):
     return items
 
 
-def _guess_skills(text):
-    dictionary = ['React','Angular','Vue','Node.js','Python','Java','SQL','AWS','Docker','Kubernetes','ML','NLP']
-    return [k for k in dictionary if re.search(rf'\b{re.escape(k)}\b', text, re.I)][:6]
-
-
 def extract_profile(file_stream, filename):
     b = file_stream.read() if hasattr(file_stream, 'read') else file_stream
     ext = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
     if ext == 'pdf':
-        text, avatar = _read_pdf(b)
+        text, image = _read_pdf(b)
     elif ext in ('doc','docx'):
-        text, avatar = _read_docx(b)
+        text, image = _read_docx(b)
     else:
         raise ValueError('Unsupported file type')
 
@@ -238,13 +210,15 @@ def extract_profile(file_stream, filename):
     
     name = _guess_name(lines)
     degree = extract_education_recent(sections.get("edu", ""))
-    languages = _guess_languages(text)
+    scan = _scan_keywords(text)
+    languages = _guess_languages(text, scan)
     experiences = _guess_experiences(lines)
-    skills = _guess_skills(text)
+    skills = _guess_skills(text, scan)
     achievements = extract_achievements(sections.get("ach", ""))
     
-    if not avatar:
-        avatar = _placeholder_avatar(name or 'User')
+    # ảnh lưu thành file (hash nội dung, đã thu nhỏ) -> trả URL thay vì base64 trong JSON
+    stored = store_image(image) if image else None
+    avatar_url = AVATAR_URL_PREFIX + stored if stored else placeholder_url(name or 'User')
     
     return {
         'name': name,
@@ -253,7 +227,7 @@ def extract_profile(file_stream, filename):
         'experiences': experiences,
         'skills': skills,
         'achievements': achievements,
-        'avatar_data_url': avatar,
+        'avatar_url': avatar_url,
     }
 
 
@@ -0,0 +1,128 @@
+"""Trích text PDF dùng chung cho parse_resume/parse_jd: giới hạn số trang, dừng sớm
+khi đã đủ section, đo thời gian từng trang; PDF dài có thể đọc song song (PDF_WORKERS > 1)."""
+import io
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '10'))
+# Từ số trang này trở lên mới chia cho nhiều process (mỗi process parse lại PDF có giá)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '6'))
+# Mặc định đọc tuần tự; > 1 thì dùng 1 pool sống lâu cho mỗi process web
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', '1'))
+PDF_SLOW_PAGE_MS = float(os.getenv('PDF_SLOW_PAGE_MS', '1000'))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _page_text(page):
+    t0 = time.perf_counter()
+    try:
+        text = page.extract_text() or ''
+    except Exception:
+        text = ''
+    return text, (time.perf_counter() - t0) * 1000.0
+
+
+def _read_pages(data, start, stop):
+    reader = PdfReader(io.BytesIO(data))
+    return [_page_text(reader.pages[i]) for i in range(start, stop)]
+
+
+def _in_worker_process():
+    # đã ở trong process con (vd. ParseJobQueue) thì không tạo thêm pool
+    return multiprocessing.parent_process() is not None
+
+
+def _executor(workers):
+    """Pool tạo lười, 1 lần cho mỗi pid (sau fork của WSGI server). Dùng forkserver
+    nếu có để không fork từ worker web đang chạy nhiều thread."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context('forkserver') if 'forkserver' in methods else None
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def extract_pdf_text(data: bytes, max_pages=None, done=None, lookahead=1, workers=None):
+    """Trả (text, stats). `done(text)` -> True khi đã đủ section cần thiết: đọc thêm
+    `lookahead` trang (phần đuôi của section cuối) rồi dừng.
+
+    stats = {pages_total, pages_read, page_ms: [...], stopped_early, parallel}"""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    workers = PDF_WORKERS if workers is None else workers
+    reader = PdfReader(io.BytesIO(data))
+    total = len(reader.pages)
+    n = min(total, max_pages) if max_pages > 0 else total
+    parallel = workers > 1 and n >= PDF_PARALLEL_MIN_PAGES and not _in_worker_process()
+
+    parts, page_ms = [], []
+    stop_at = None
+
+    def take(text, ms):
+        nonlocal stop_at
+        parts.append(text)
+        page_ms.append(round(ms, 1))
+        if stop_at is None and done is not None and done('\n'.join(parts)):
+            stop_at = len(parts) + lookahead
+        return stop_at is not None and len(parts) >= stop_at
+
+    if parallel:
+        # mỗi task 1 dải trang liên tiếp; dừng sớm thì huỷ các dải chưa chạy, không chờ pool
+        step = -(-n // workers)
+        futures = []
+        try:
+            futures = [_executor(workers).submit(_read_pages, data, i, min(i + step, n))
+                       for i in range(0, n, step)]
+            for fut in futures:  # ghép theo thứ tự trang
+                if any(take(*page) for page in fut.result()):
+                    break
+        except BrokenProcessPool:
+            logger.warning('PDF pool broken, reading sequentially')
+            _reset_pool()
+            parts.clear()
+            page_ms.clear()
+            stop_at = None
+            parallel = False
+        finally:
+            for f in futures:
+                f.cancel()
+    if not parallel:
+        for i in range(n):
+            if take(*_page_text(reader.pages[i])):
+                break
+
+    stats = {
+        'pages_total': total,
+        'pages_read': len(parts),
+        'page_ms': page_ms,
+        'stopped_early': len(parts) < n,
+        'parallel': parallel,
+    }
+    slow = [(i + 1, ms) for i, ms in enumerate(page_ms) if ms >= PDF_SLOW_PAGE_MS]
+    if slow:
+        logger.warning('Slow PDF pages (page, ms): %s; stats=%s', slow, stats)
+    else:
+        logger.debug('PDF text extracted: %s', stats)
+    return '\n'.join(parts), stats
@@ -0,0 +1,43 @@
+"""Tách section theo heading bằng 1 regex gộp (named group) thay vì thử từng regex/dòng."""
+import re
+
+
+class HeadingMatcher:
+    """`patterns`: {section: regex} theo thứ tự ưu tiên (dòng khớp nhiều heading
+    thì lấy section đứng trước, giống vòng for cũ)."""
+
+    def __init__(self, patterns):
+        self.names = list(patterns)
+        sources = [p.pattern if hasattr(p, 'pattern') else p for p in patterns.values()]
+        sources = [re.sub(r'^\(\?i\)', '', s) for s in sources]
+        # 1 lần quét: dòng có chứa heading nào không (phần lớn dòng là nội dung -> dừng ở đây)
+        self._any = re.compile('|'.join(f'(?:{s})' for s in sources), re.I)
+        # chỉ với dòng khớp: nhánh lookahead đầu tiên thành công = section ưu tiên cao nhất
+        self._first = re.compile(
+            '|'.join(f'(?=.*?(?P<{n}>{s}))' for n, s in zip(self.names, sources)), re.I | re.S)
+
+    def classify(self, line):
+        """Tên section nếu `line` chứa heading, ngược lại None."""
+        if not self._any.search(line):
+            return None
+        return self._first.match(line).lastgroup
+
+    def split(self, text):
+        sections = {}
+        current_section = None
+        current_content = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            matched_section = self.classify(line)
+            if matched_section:
+                if current_section and current_content:
+                    sections[current_section] = '\n'.join(current_content).strip()
+                current_section = matched_section
+                current_content = [line]
+            elif current_section:
+                current_content.append(line)
+        if current_section and current_content:
+            sections[current_section] = '\n'.join(current_content).strip()
+        return sections
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useProfile } from '../store/profile'
+import { API_BASE } from '../lib/config'
 
 function Pill({ children }) {
   return (
@@ -62,8 +63,8 @@ export default function CandidateReview() {
           {/* Avatar */}
           <div className="mx-auto mb-4 h-20 w-20 rounded-full bg-white/90 text-black 
                           grid place-items-center text-2xl font-bold ring-4 ring-white/30">
-            {data.avatar_data_url ? (
-              <img src={data.avatar_data_url} className="h-20 w-20 rounded-full object-cover" alt="avatar" />
+            {data.avatar_url ? (
+              <img src={API_BASE + data.avatar_url} className="h-20 w-20 rounded-full object-cover" alt="avatar" />
             ) : (
               (data.name?.slice(0,1) ?? 'U').toUpperCase()
             )}